@@ -6,18 +6,49 @@ import uvicorn
 
 cwd = os.getcwd()
 sys.path.append(cwd)
-mode = sys.argv[1]
+# Worker processes of "--run-api" import this module too, but mustn't run it.
+if __name__ == "__main__":
+    mode = sys.argv[1]
 
-if mode == "--init-db":
-    from py_mirror.app.storage.pg.data_source import DataSource
+    if mode == "--init-db":
+        from py_mirror.app.storage.pg.data_source import DataSource
 
-    asyncio.run(DataSource().init_db())
-elif mode == "--run-api":
-    from dotenv import dotenv_values
-    from py_mirror.app.api.main import get_api
+        asyncio.run(DataSource().init_db())
+    elif mode == "--import-models":
+        from py_mirror.app.service.import_service import ImportService
 
-    env_vars = {**dotenv_values(".env"), **os.environ}
-    api = get_api()
-    uvicorn.run(api, host="localhost", port=int(str(env_vars.get("HTTP_PORT"))))
-else:
-    sys.exit(f"Invalid mode {mode}")  # Exit status is "1", meaning failure.
+        failed = asyncio.run(ImportService().import_file(sys.argv[2]))
+        sys.exit(1 if failed else 0)
+    elif mode == "--run-api":
+        from dotenv import dotenv_values
+
+        from py_mirror.app.storage.connection_budget import get_worker_connections
+
+        env_vars = {**dotenv_values(".env"), **os.environ}
+
+        try:
+            # Fails upon startup, rather than upon the first connection of each worker.
+            for budget_name in (
+                "POSTGRES_CONNECTION_BUDGET",
+                "REDIS_CONNECTION_BUDGET",
+            ):
+                get_worker_connections(env_vars, budget_name)
+        except ValueError as ex:
+            sys.exit(str(ex))
+
+        # Worker processes share the listening socket, each one runs its own event loop.
+        # SIGHUP restarts the workers one by one, in-flight requests are completed first.
+        uvicorn.run(
+            "py_mirror.app.api.main:get_api",
+            factory=True,
+            host=str(env_vars.get("HTTP_HOST") or "localhost"),
+            port=int(str(env_vars.get("HTTP_PORT"))),
+            workers=int(str(env_vars.get("HTTP_WORKERS") or 1)),
+            loop="uvloop",
+            http="httptools",
+            timeout_graceful_shutdown=int(
+                str(env_vars.get("HTTP_GRACEFUL_SHUTDOWN_SECONDS") or 30)
+            ),
+        )
+    else:
+        sys.exit(f"Invalid mode {mode}")  # Exit status is "1", meaning failure.
@@ -1,59 +1,257 @@
+import time
 import logging
+from typing import Any
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse
-from fastapi.encoders import jsonable_encoder
+from pydantic import ValidationError
+from fastapi import APIRouter, Request
 
-from py_mirror.app.types import ModelDto, RequestDto, ResponseDto
+from py_mirror.app.api.responses import (
+    DuplexStreamingResponse,
+    ORJSONResponse,
+    render_response_dto,
+    render_validation_result,
+)
+from py_mirror.app.metrics import RESPONSE_ENCODING_DURATION
+from py_mirror.app.types import (
+    ModelDto,
+    ModelPatchDto,
+    RequestDto,
+    ModelVersionDto,
+)
+from py_mirror.app.storage.redis.serializer import GROUPS
 from py_mirror.app.service.model_service import ModelService
+from py_mirror.app.service.model_cache import ModelCache
 from py_mirror.app.service.request_service import RequestService
+from py_mirror.app.service.stream_service import StreamService
+from py_mirror.app.service.import_service import ImportService
+from py_mirror.app.service.outbox_service import OutboxService
+from py_mirror.app.service.validation_result_service import ValidationResultService
+from py_mirror.app.service.anomaly_stats_service import AnomalyStatsService
 
 api_router = APIRouter(prefix="/api", tags=["request-model"])
 
+# Constant bodies are serialized once.
+POST_REQUEST_ERROR_BODY = render_response_dto(None, "POST /api/request Error occurred")
+POST_REQUESTS_BATCH_ERROR_BODY = render_response_dto(
+    None, "POST /api/requests/batch Error occurred"
+)
+POST_MODEL_ERROR_BODY = render_response_dto(None, "POST /api/model Error occurred")
+PATCH_MODEL_ERROR_BODY = render_response_dto(None, "PATCH /api/model Error occurred")
+GET_STATS_ERROR_BODY = render_response_dto(None, "GET /api/stats Error occurred")
+
 
 @api_router.post("/request")
-async def post_request(request_dto: RequestDto) -> JSONResponse:
+async def post_request(
+    request_dto: RequestDto, min_version: int | None = None
+) -> ORJSONResponse:
     try:
         model_service = ModelService()
-        model_dto = await model_service.get_model(request_dto.path, request_dto.method)
+        # "min_version" is the one, returned by "POST /api/model".
+        model_dto = await model_service.get_model(
+            request_dto.path,
+            request_dto.method,
+            min_version,
+            [group for group in GROUPS if getattr(request_dto, group)],
+        )
 
         if not model_dto:
-            msg = f"Model not found for path:method '{request_dto.path}:{request_dto.method}'"
-            raise HTTPException(
-                status_code=404,
-                detail=jsonable_encoder(ResponseDto(data=None, error=msg)),
+            # Including the keys, rejected by the Bloom filter or the negative cache.
+            msg = f"Model not found for path:method '{request_dto.path}:{request_dto.method.value}'"
+            return ORJSONResponse(
+                status_code=404, content=render_response_dto(None, msg)
             )
 
         request_service = RequestService()
-        validation_response = request_service.validate_request(request_dto, model_dto)
-        return JSONResponse(
-            status_code=201,
-            content=jsonable_encoder(ResponseDto(data=validation_response, error=None)),
+        validation_result = request_service.validate_request(request_dto, model_dto)
+        # Queued rather than written, so PG is never awaited by the request.
+        await ValidationResultService().record(
+            request_dto, model_dto, validation_result
+        )
+        started_at = time.perf_counter()
+        response = ORJSONResponse(
+            status_code=201, content=render_validation_result(validation_result)
         )
+        RESPONSE_ENCODING_DURATION.observe(time.perf_counter() - started_at)
+        return response
     except Exception as ex:
         logging.error(msg=repr(ex))
-        return JSONResponse(
-            status_code=500,
-            content=jsonable_encoder(
-                ResponseDto(data=None, error="POST /api/request Error occurred")
-            ),
+        return ORJSONResponse(status_code=500, content=POST_REQUEST_ERROR_BODY)
+
+
+@api_router.post("/requests/batch")
+async def post_requests_batch(
+    raw_request_dtos: list[dict[str, Any]],
+) -> ORJSONResponse:
+    try:
+        # Items are validated one by one, so a single malformed item doesn't fail the batch.
+        request_dtos: list[RequestDto | None] = []
+        # Serialized ResponseDto shapes, encoded at once.
+        responses: list[dict[str, Any] | None] = []
+
+        for raw_request_dto in raw_request_dtos:
+            try:
+                request_dtos.append(RequestDto(**raw_request_dto))
+                responses.append(None)
+            except ValidationError as ex:
+                request_dtos.append(None)
+                responses.append(
+                    {
+                        "data": None,
+                        "error": ex.errors(
+                            include_url=False,
+                            include_context=False,
+                            include_input=False,
+                        ),
+                    }
+                )
+
+        # Requests are grouped by "path:method", each distinct model is fetched once.
+        model_service = ModelService()
+        models = await model_service.get_models(
+            [(dto.path, dto.method) for dto in request_dtos if dto]
         )
+        request_service = RequestService()
+        # Indexes of the requests, which have a model, and are validated as a batch.
+        indexes: list[int] = []
+        requests_models: list[tuple[RequestDto, ModelDto]] = []
+
+        for i, request_dto in enumerate(request_dtos):
+            if not request_dto:
+                continue
+
+            model_dto = models[
+                model_service.get_key(request_dto.path, request_dto.method)
+            ]
+
+            if not model_dto:
+                msg = f"Model not found for path:method '{request_dto.path}:{request_dto.method.value}'"
+                responses[i] = {"data": None, "error": msg}
+                continue
+
+            indexes.append(i)
+            requests_models.append((request_dto, model_dto))
+
+        try:
+            validation_results = request_service.validate_requests(requests_models)
+
+            for i, validation_result in zip(indexes, validation_results):
+                responses[i] = {"data": validation_result.to_dict(), "error": None}
+        except Exception as ex:
+            logging.error(msg=repr(ex))
+
+            # One by one, so only the failing items are reported as such.
+            for i, (request_dto, model_dto) in zip(indexes, requests_models):
+                try:
+                    validation_result = request_service.validate_request(
+                        request_dto, model_dto
+                    )
+                    responses[i] = {"data": validation_result.to_dict(), "error": None}
+                except Exception as ex:
+                    logging.error(msg=repr(ex))
+                    responses[i] = {"data": None, "error": "Validation error occurred"}
+
+        return ORJSONResponse(
+            status_code=201, content=render_response_dto(responses, None)
+        )
+    except Exception as ex:
+        logging.error(msg=repr(ex))
+        return ORJSONResponse(status_code=500, content=POST_REQUESTS_BATCH_ERROR_BODY)
+
+
+@api_router.post("/requests/stream")
+async def post_requests_stream(request: Request) -> DuplexStreamingResponse:
+    # Neither the request body, nor the response is buffered.
+    # Each NDJSON line of RequestDto results in a NDJSON line of ResponseDto.
+    return DuplexStreamingResponse(
+        StreamService().validate_stream(request.stream()),
+        status_code=200,
+        media_type="application/x-ndjson",
+    )
 
 
 @api_router.post("/model")
-async def post_model(model_dto: ModelDto) -> JSONResponse:
+async def post_model(model_dto: ModelDto) -> ORJSONResponse:
     try:
         service = ModelService()
-        await service.save_model(model_dto)
-        return JSONResponse(
-            status_code=201,
-            content=jsonable_encoder(ResponseDto(data="Ok", error=None)),
+        version = await service.save_model(model_dto)
+        # Propagate to Redis right away, rather than upon the next outbox poll.
+        OutboxService().notify()
+        model_version_dto = ModelVersionDto(
+            path=model_dto.path, method=model_dto.method, version=version
+        )
+        return ORJSONResponse(
+            status_code=201, content=render_response_dto(model_version_dto, None)
+        )
+    except Exception as ex:
+        logging.error(msg=repr(ex))
+        return ORJSONResponse(status_code=500, content=POST_MODEL_ERROR_BODY)
+
+
+@api_router.patch("/model")
+async def patch_model(model_patch_dto: ModelPatchDto) -> ORJSONResponse:
+    try:
+        version = await ModelService().patch_model(model_patch_dto)
+
+        if version is None:
+            msg = f"Model not found for path:method '{model_patch_dto.path}:{model_patch_dto.method.value}'"
+            return ORJSONResponse(
+                status_code=404, content=render_response_dto(None, msg)
+            )
+
+        OutboxService().notify()
+        model_version_dto = ModelVersionDto(
+            path=model_patch_dto.path, method=model_patch_dto.method, version=version
+        )
+        return ORJSONResponse(
+            status_code=200, content=render_response_dto(model_version_dto, None)
+        )
+    except ValueError as ex:
+        # The operations don't apply, e.g. a field is added twice.
+        return ORJSONResponse(
+            status_code=409, content=render_response_dto(None, str(ex))
         )
     except Exception as ex:
         logging.error(msg=repr(ex))
-        return JSONResponse(
-            status_code=500,
-            content=jsonable_encoder(
-                ResponseDto(data=None, error="POST /api/model Error occurred")
+        return ORJSONResponse(status_code=500, content=PATCH_MODEL_ERROR_BODY)
+
+
+@api_router.post("/models/bulk")
+async def post_models_bulk(request: Request) -> DuplexStreamingResponse:
+    # Body is either NDJSON, or a JSON array of ModelDto.
+    # Progress, including per-row failures, is reported as NDJSON of ResponseDto.
+    return DuplexStreamingResponse(
+        ImportService().import_stream(request.stream()),
+        status_code=200,
+        media_type="application/x-ndjson",
+    )
+
+
+@api_router.get("/model/cache")
+async def get_model_cache_stats() -> ORJSONResponse:
+    return ORJSONResponse(
+        status_code=200, content=render_response_dto(ModelCache().stats(), None)
+    )
+
+
+@api_router.get("/stats")
+async def get_anomaly_stats(
+    window_seconds: int = 3600, path: str | None = None, method: str | None = None
+) -> ORJSONResponse:
+    """Anomaly counts of all the workers, see AnomalyStatsService."""
+    try:
+        anomaly_stats_service = AnomalyStatsService()
+        anomalies = await anomaly_stats_service.get_stats(window_seconds, path, method)
+        return ORJSONResponse(
+            status_code=200,
+            content=render_response_dto(
+                {
+                    "window_seconds": window_seconds,
+                    "bucket_seconds": anomaly_stats_service.bucket_seconds,
+                    "anomalies": anomalies,
+                },
+                None,
             ),
         )
+    except Exception as ex:
+        logging.error(msg=repr(ex))
+        return ORJSONResponse(status_code=500, content=GET_STATS_ERROR_BODY)
@@ -0,0 +1,51 @@
+from pstats import SortKey
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse, PlainTextResponse
+from fastapi.encoders import jsonable_encoder
+
+from py_mirror.app.types import ResponseDto, ProfilingSettingsDto
+from py_mirror.app.api.profiling import Profiler
+
+# Included only if PROFILING_ENABLED, see "get_api".
+debug_router = APIRouter(prefix="/debug", tags=["debug"])
+
+
+@debug_router.get("/profile")
+async def get_profile(
+    sort: SortKey = SortKey.CUMULATIVE, limit: int = 50
+) -> PlainTextResponse:
+    # Unknown sort keys are rejected with 422, rather than failing "pstats".
+    return PlainTextResponse(content=Profiler().report(sort, limit))
+
+
+@debug_router.put("/profile")
+async def put_profile(settings_dto: ProfilingSettingsDto) -> JSONResponse:
+    profiler = Profiler()
+    profiler.server_timing = settings_dto.server_timing
+    profiler.sample_rate = settings_dto.sample_rate
+    return JSONResponse(
+        status_code=200,
+        content=jsonable_encoder(ResponseDto(data=settings_dto, error=None)),
+    )
+
+
+@debug_router.post("/profile/dump")
+async def post_profile_dump() -> JSONResponse:
+    output_path = Profiler().dump()
+    return JSONResponse(
+        status_code=200 if output_path else 404,
+        content=jsonable_encoder(
+            ResponseDto(
+                data=output_path, error=None if output_path else "No samples yet"
+            )
+        ),
+    )
+
+
+@debug_router.delete("/profile")
+async def delete_profile() -> JSONResponse:
+    Profiler().reset()
+    return JSONResponse(
+        status_code=200, content=jsonable_encoder(ResponseDto(data="Ok", error=None))
+    )
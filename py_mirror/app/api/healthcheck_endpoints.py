@@ -5,6 +5,7 @@ from fastapi.responses import JSONResponse
 from fastapi.encoders import jsonable_encoder
 
 from py_mirror.app.types import ResponseDto, ReadinessResponseDto
+from py_mirror.app.service.warmup_service import WarmupService
 from py_mirror.app.storage.pg.data_source import DataSource as PgDataSource
 from py_mirror.app.storage.redis.data_source import DataSource as RedisDataSource
 
@@ -20,6 +21,22 @@ async def liveness() -> JSONResponse:
 
 @healthcheck_router.get("/readiness")
 async def readiness() -> JSONResponse:
+    warmup_service = WarmupService()
+
+    if not warmup_service.done:
+        return JSONResponse(
+            status_code=503,
+            content=jsonable_encoder(
+                ReadinessResponseDto(
+                    pg=None,
+                    redis=None,
+                    error=f"Models warm-up failed: {warmup_service.error}"
+                    if warmup_service.error
+                    else "Models warm-up is in progress",
+                )
+            ),
+        )
+
     try:
         redis_response, pg_response = await asyncio.gather(
             RedisDataSource().ping(),
@@ -1,11 +1,94 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import FastAPI
 
 from py_mirror.app.api.api_endpoints import api_router
 from py_mirror.app.api.healthcheck_endpoints import healthcheck_router
+from py_mirror.app.api.metrics_endpoints import metrics_router
+from py_mirror.app.api.debug_endpoints import debug_router
+from py_mirror.app.api.profiling import Profiler, ProfilingMiddleware
+from py_mirror.app.service.model_cache import ModelCache
+from py_mirror.app.service.model_service import ModelService
+from py_mirror.app.service.warmup_service import WarmupService
+from py_mirror.app.service.outbox_service import OutboxService
+from py_mirror.app.service.validation_result_service import ValidationResultService
+from py_mirror.app.service.anomaly_stats_service import AnomalyStatsService
+from py_mirror.app.storage.pg.data_source import DataSource as PgDataSource
+from py_mirror.app.storage.redis.data_source import DataSource as RedisDataSource
+
+
+@asynccontextmanager
+async def lifespan(api: FastAPI) -> AsyncIterator[None]:
+    # Model indexes are built upon subscription, and updated with each saved model.
+    ModelCache().listeners.append(ModelService().update_model_indexes)
+    # Keeps the in-process model cache consistent with models saved by other workers.
+    invalidation_listener = asyncio.create_task(
+        ModelCache().listen_for_invalidations(RedisDataSource().client)
+    )
+
+    # Propagates saved models to Redis.
+    outbox_drainer = asyncio.create_task(OutboxService().run())
+    warmup_service = WarmupService()
+    # The API serves requests during the warm-up, but isn't ready, see readiness.
+    warm_up = (
+        asyncio.create_task(warmup_service.warm_up())
+        if warmup_service.enabled
+        else None
+    )
+    validation_result_service = ValidationResultService()
+    # Persists the validation results, written behind the requests.
+    validation_result_writer = (
+        asyncio.create_task(validation_result_service.run())
+        if validation_result_service.enabled
+        else None
+    )
+    anomaly_stats_service = AnomalyStatsService()
+    # Flushes the anomaly counts of this worker to Redis.
+    anomaly_stats_flusher = (
+        asyncio.create_task(anomaly_stats_service.run())
+        if anomaly_stats_service.enabled
+        else None
+    )
+
+    yield
+
+    if anomaly_stats_flusher:
+        anomaly_stats_flusher.cancel()
+        await asyncio.gather(anomaly_stats_flusher, return_exceptions=True)
+        await asyncio.gather(anomaly_stats_service.flush(), return_exceptions=True)
+
+    if validation_result_writer:
+        validation_result_writer.cancel()
+        await asyncio.gather(validation_result_writer, return_exceptions=True)
+        # The buffered results aren't lost upon a graceful shutdown.
+        await validation_result_service.flush()
+
+    if warm_up:
+        warm_up.cancel()
+
+    outbox_drainer.cancel()
+    invalidation_listener.cancel()
+    ModelCache().listeners.clear()
+    # Last, once nothing uses PG anymore.
+    await asyncio.gather(
+        outbox_drainer, *filter(None, [warm_up]), return_exceptions=True
+    )
+    await PgDataSource().dispose()
 
 
 def get_api() -> FastAPI:
-    api = FastAPI(title="Mirror API", version="0.1.0", docs_url="/docs")
+    api = FastAPI(
+        title="Mirror API", version="0.1.0", docs_url="/docs", lifespan=lifespan
+    )
     api.include_router(api_router)
     api.include_router(healthcheck_router)
+    api.include_router(metrics_router)
+
+    if Profiler().enabled:
+        # Otherwise, there is no overhead at all.
+        api.add_middleware(ProfilingMiddleware)
+        api.include_router(debug_router)
+
     return api
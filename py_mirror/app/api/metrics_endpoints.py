@@ -0,0 +1,75 @@
+from typing import Any
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from py_mirror.app.metrics import metrics, Gauge
+from py_mirror.app.service.model_cache import ModelCache
+from py_mirror.app.service.validation_result_service import ValidationResultService
+from py_mirror.app.storage.pg.data_source import DataSource as PgDataSource
+from py_mirror.app.storage.redis.data_source import DataSource as RedisDataSource
+
+metrics_router = APIRouter(tags=["metrics"])
+
+
+def sample_pg_pool(attribute: str) -> float | None:
+    # Engine of the running event loop, i.e. the one serving the requests.
+    sample = getattr(PgDataSource().async_engine.pool, attribute, None)
+    return float(sample()) if sample else None
+
+
+def sample_redis_pool(attribute: str) -> float:
+    pool: Any = RedisDataSource().client.connection_pool
+    # redis-py has no public API for the pool usage.
+    return float(len(getattr(pool, attribute)))
+
+
+def register_cache_counter(name: str, help: str, attribute: str) -> None:
+    # Maintained by ModelCache itself, hence sampled.
+    gauge = Gauge(name, lambda: getattr(ModelCache(), attribute))
+    metrics.register("counter", help, gauge)
+
+
+register_cache_counter(
+    "py_mirror_model_cache_hits_total", "In-process model cache hits", "hits"
+)
+register_cache_counter(
+    "py_mirror_model_cache_misses_total", "In-process model cache misses", "misses"
+)
+register_cache_counter(
+    "py_mirror_model_cache_coalesced_total",
+    "Model cache misses, which awaited a fetch of another request",
+    "coalesced",
+)
+metrics.gauge(
+    "py_mirror_pg_pool_checked_out",
+    "SQLAlchemy pool connections in use",
+    lambda: sample_pg_pool("checkedout"),
+)
+metrics.gauge(
+    "py_mirror_pg_pool_overflow",
+    "SQLAlchemy pool connections beyond the pool size",
+    lambda: sample_pg_pool("overflow"),
+)
+metrics.gauge(
+    "py_mirror_redis_pool_checked_out",
+    "redis-py pool connections in use",
+    lambda: sample_redis_pool("_in_use_connections"),
+)
+metrics.gauge(
+    "py_mirror_redis_pool_available",
+    "redis-py pool idle connections",
+    lambda: sample_redis_pool("_available_connections"),
+)
+metrics.gauge(
+    "py_mirror_validation_results_queue_length",
+    "Validation results, waiting to be written to PG",
+    lambda: float(ValidationResultService().queue_length()),
+)
+
+
+@metrics_router.get("/metrics")
+async def get_metrics() -> PlainTextResponse:
+    return PlainTextResponse(
+        content=metrics.render(), media_type="text/plain; version=0.0.4"
+    )
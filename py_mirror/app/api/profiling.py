@@ -0,0 +1,144 @@
+import io
+import os
+import time
+import pstats
+import cProfile
+from typing import Any
+
+from dotenv import dotenv_values
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from py_mirror.app.metrics import SERVER_TIMINGS
+
+
+class Profiler:
+    """
+    Opt-in, see PROFILING_ENABLED. Once enabled, both the "Server-Timing" header
+    and the sampling can be switched on and off at runtime, see "PUT /debug/profile".
+    """
+
+    _instance: "Profiler" = None  # type: ignore
+
+    def __new__(cls) -> "Profiler":
+        if not cls._instance:
+            cls._instance = super().__new__(cls)
+
+        return cls._instance
+
+    def __init__(self) -> None:
+        if hasattr(self, "enabled"):
+            return
+
+        env_vars: dict[str, str | Any] = {**dotenv_values(".env"), **os.environ}
+        self.enabled: bool = str(env_vars.get("PROFILING_ENABLED", "false")) == "true"
+        self.server_timing: bool = (
+            str(env_vars.get("PROFILING_SERVER_TIMING", "true")) == "true"
+        )
+        # Profile 1-in-N requests, 0 disables the sampling.
+        self.sample_rate: int = int(str(env_vars.get("PROFILING_SAMPLE_RATE", 0)))
+        self.output_path: str = str(env_vars.get("PROFILING_OUTPUT", "profile.pstats"))
+
+        self.requests = 0
+        self.samples = 0
+        # Only a single profiler can be active per thread.
+        self.active = False
+        # Aggregated profiles of all the samples.
+        self.stats: pstats.Stats | None = None
+
+    def start_sample(self) -> cProfile.Profile | None:
+        if not self.sample_rate:
+            return None
+
+        self.requests += 1
+
+        if self.requests % self.sample_rate or self.active:
+            return None
+
+        profile = cProfile.Profile()
+
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiling tool is active.
+            return None
+
+        self.active = True
+        return profile
+
+    def stop_sample(self, profile: cProfile.Profile) -> None:
+        profile.disable()
+        self.active = False
+        self.samples += 1
+
+        if self.stats is None:
+            self.stats = pstats.Stats(profile)
+        else:
+            self.stats.add(profile)
+
+    def report(self, sort: pstats.SortKey, limit: int) -> str:
+        if self.stats is None:
+            return "No samples yet\n"
+
+        stream = io.StringIO()
+        self.stats.stream = stream  # type: ignore
+        self.stats.sort_stats(sort).print_stats(limit)
+        return f"Samples: {self.samples}\n{stream.getvalue()}"
+
+    def dump(self) -> str | None:
+        """Writes the aggregated profile, readable by "pstats" or "snakeviz"."""
+        if self.stats is None:
+            return None
+
+        self.stats.dump_stats(self.output_path)
+        return self.output_path
+
+    def reset(self) -> None:
+        self.requests = 0
+        self.samples = 0
+        self.stats = None
+
+
+class ProfilingMiddleware:
+    """
+    Pure ASGI middleware, hence streamed responses aren't buffered.
+    Note, the profiler is per thread, so a sample includes concurrently running requests too.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.profiler = Profiler()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started_at = time.perf_counter()
+        timings: dict[str, float] | None = {} if self.profiler.server_timing else None
+        token = SERVER_TIMINGS.set(timings)
+        profile = self.profiler.start_sample()
+
+        async def send_with_server_timing(message: Message) -> None:
+            if timings is not None and message["type"] == "http.response.start":
+                timings["total"] = time.perf_counter() - started_at
+                header = ", ".join(
+                    f"{stage};dur={duration * 1000:.3f}"
+                    for stage, duration in timings.items()
+                )
+                message = {
+                    **message,
+                    "headers": [
+                        *message.get("headers", []),
+                        (b"server-timing", header.encode()),
+                    ],
+                }
+
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_server_timing)
+        finally:
+            SERVER_TIMINGS.reset(token)
+
+            if profile:
+                self.profiler.stop_sample(profile)
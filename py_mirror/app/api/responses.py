@@ -0,0 +1,57 @@
+from typing import Any
+
+import orjson
+from pydantic import BaseModel
+from starlette.types import Receive, Scope, Send
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from py_mirror.app.runtime_types import ValidationResult
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse, which body iterator consumes the request body simultaneously.
+    The default one drains "receive" while waiting for a disconnect,
+    hence it would race with the body iterator over the request body chunks.
+    A disconnect surfaces as ClientDisconnect from "request.stream()" instead.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+
+        if self.background is not None:
+            await self.background()
+
+
+def to_json_default(obj: Any) -> Any:
+    # Anything orjson doesn't encode natively, e.g. DTOs.
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def render_response_dto(data: Any, error: Any) -> bytes:
+    """Serialized ResponseDto, without building it, nor walking it via "jsonable_encoder"."""
+    return orjson.dumps({"data": data, "error": error}, default=to_json_default)
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse, encoded by orjson. Pre-serialized bodies are sent as is."""
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+
+        return orjson.dumps(content, default=to_json_default)
+
+
+# The dominant outcome of "POST /api/request", serialized once.
+NOT_ABNORMAL_BODY = render_response_dto(ValidationResult().to_dict(), None)
+
+
+def render_validation_result(validation_result: ValidationResult) -> bytes:
+    if not validation_result.is_abnormal:
+        return NOT_ABNORMAL_BODY
+
+    return render_response_dto(validation_result.to_dict(), None)
@@ -0,0 +1,224 @@
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable
+
+from py_mirror.app.types import AbnormalityType
+
+# In-process metrics, exposed in the Prometheus text format, see "GET /metrics".
+# Recording is a plain increment of a preallocated slot - no locks, no allocations.
+# It's safe, since the event loop never preempts a coroutine in between.
+
+# Stage durations of the current request, reported via the "Server-Timing" header.
+# None, unless enabled, see ProfilingMiddleware.
+SERVER_TIMINGS: ContextVar[dict[str, float] | None] = ContextVar(
+    "SERVER_TIMINGS", default=None
+)
+
+# Upper bounds (seconds) of the latency buckets, from 50us to 2.5s.
+LATENCY_BUCKETS: tuple[float, ...] = (
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+)
+
+
+def format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+
+    return "{" + ",".join(f'{name}="{value}"' for name, value in labels.items()) + "}"
+
+
+class Counter:
+    __slots__ = ("name", "labels", "value")
+
+    def __init__(self, name: str, labels: dict[str, str] | None = None) -> None:
+        self.name = name
+        self.labels = format_labels(labels or {})
+        self.value = 0
+
+    def inc(self, amount: int = 1) -> None:
+        self.value += amount
+
+    def render(self) -> list[str]:
+        return [f"{self.name}{self.labels} {self.value}"]
+
+
+class Histogram:
+    __slots__ = ("name", "labels", "buckets", "counts", "sum", "stage")
+
+    def __init__(
+        self,
+        name: str,
+        labels: dict[str, str] | None = None,
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.labels = labels or {}
+        self.buckets = buckets
+        # Non-cumulative, the last one is "+Inf". Accumulated upon rendering only.
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.stage = self.labels.get("stage")
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+        if self.stage and (timings := SERVER_TIMINGS.get()) is not None:
+            timings[self.stage] = timings.get(self.stage, 0.0) + value
+
+    def render(self) -> list[str]:
+        lines = []
+        cumulative_count = 0
+
+        for upper_bound, count in zip((*self.buckets, "+Inf"), self.counts):
+            cumulative_count += count
+            labels = format_labels({**self.labels, "le": str(upper_bound)})
+            lines.append(f"{self.name}_bucket{labels} {cumulative_count}")
+
+        labels = format_labels(self.labels)
+        lines.append(f"{self.name}_sum{labels} {self.sum}")
+        lines.append(f"{self.name}_count{labels} {cumulative_count}")
+        return lines
+
+
+class Gauge:
+    """Sampled upon rendering, e.g. sizes of connection pools."""
+
+    __slots__ = ("name", "labels", "sample")
+
+    def __init__(
+        self,
+        name: str,
+        sample: Callable[[], float | None],
+        labels: dict[str, str] | None = None,
+    ) -> None:
+        self.name = name
+        self.labels = format_labels(labels or {})
+        self.sample = sample
+
+    def render(self) -> list[str]:
+        value = self.sample()
+        # Not applicable, e.g. "overflow" of a NullPool.
+        return [] if value is None else [f"{self.name}{self.labels} {value}"]
+
+
+Metric = Counter | Histogram | Gauge
+
+
+class Metrics:
+    _instance: "Metrics" = None  # type: ignore
+
+    def __new__(cls) -> "Metrics":
+        if not cls._instance:
+            cls._instance = super().__new__(cls)
+
+        return cls._instance
+
+    def __init__(self) -> None:
+        if hasattr(self, "families"):
+            return
+
+        # Metric name to its type, description and labeled metrics.
+        self.families: dict[str, tuple[str, str, list[Metric]]] = {}
+
+    def register(self, type: str, help: str, metric: Metric) -> Metric:
+        self.families.setdefault(metric.name, (type, help, []))[2].append(metric)
+        return metric
+
+    def counter(self, name: str, help: str, **labels: str) -> Counter:
+        counter = Counter(name, labels)
+        self.register("counter", help, counter)
+        return counter
+
+    def histogram(self, name: str, help: str, **labels: str) -> Histogram:
+        histogram = Histogram(name, labels)
+        self.register("histogram", help, histogram)
+        return histogram
+
+    def gauge(
+        self, name: str, help: str, sample: Callable[[], float | None], **labels: str
+    ) -> Gauge:
+        gauge = Gauge(name, sample, labels)
+        self.register("gauge", help, gauge)
+        return gauge
+
+    def render(self) -> str:
+        lines = []
+
+        for name, (type, help, metrics) in self.families.items():
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {type}")
+
+            for metric in metrics:
+                lines.extend(metric.render())
+
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
+
+STAGE_DURATION = "py_mirror_stage_duration_seconds"
+STAGE_DURATION_HELP = "Duration of the POST /api/request stages"
+REDIS_GET_DURATION = metrics.histogram(
+    STAGE_DURATION, STAGE_DURATION_HELP, stage="redis_get"
+)
+PG_FALLBACK_DURATION = metrics.histogram(
+    STAGE_DURATION, STAGE_DURATION_HELP, stage="pg_fallback"
+)
+MODEL_PARSE_DURATION = metrics.histogram(
+    STAGE_DURATION, STAGE_DURATION_HELP, stage="model_parse"
+)
+VALIDATION_DURATION = metrics.histogram(
+    STAGE_DURATION, STAGE_DURATION_HELP, stage="validation"
+)
+RESPONSE_ENCODING_DURATION = metrics.histogram(
+    STAGE_DURATION, STAGE_DURATION_HELP, stage="response_encoding"
+)
+
+MODEL_LOOKUPS = "py_mirror_model_lookups_total"
+MODEL_LOOKUPS_HELP = "Model lookups per storage, which missed the in-process cache"
+REDIS_HITS = metrics.counter(
+    MODEL_LOOKUPS, MODEL_LOOKUPS_HELP, source="redis", result="hit"
+)
+REDIS_MISSES = metrics.counter(
+    MODEL_LOOKUPS, MODEL_LOOKUPS_HELP, source="redis", result="miss"
+)
+PG_HITS = metrics.counter(MODEL_LOOKUPS, MODEL_LOOKUPS_HELP, source="pg", result="hit")
+PG_MISSES = metrics.counter(
+    MODEL_LOOKUPS, MODEL_LOOKUPS_HELP, source="pg", result="miss"
+)
+
+ANOMALIES: dict[AbnormalityType, Counter] = {
+    type: metrics.counter(
+        "py_mirror_anomalies_total", "Detected anomalies per type", type=type.value
+    )
+    for type in AbnormalityType
+}
+
+VALIDATION_RESULTS = "py_mirror_validation_results_total"
+VALIDATION_RESULTS_HELP = "Validation results, persisted by the write-behind queue"
+VALIDATION_RESULTS_WRITTEN = metrics.counter(
+    VALIDATION_RESULTS, VALIDATION_RESULTS_HELP, result="written"
+)
+# The queue was full.
+VALIDATION_RESULTS_DROPPED = metrics.counter(
+    VALIDATION_RESULTS, VALIDATION_RESULTS_HELP, result="dropped"
+)
+# The batch couldn't be written to PG.
+VALIDATION_RESULTS_FAILED = metrics.counter(
+    VALIDATION_RESULTS, VALIDATION_RESULTS_HELP, result="failed"
+)
@@ -0,0 +1,38 @@
+from dataclasses import dataclass, field
+from typing import Any, NamedTuple
+
+from py_mirror.app.types import AbnormalityType, ValidationResponseDto
+
+# Lightweight counterparts of the DTOs, used on the validation hot path.
+# Pydantic DTOs are built from them only at the API boundary, see "to_dto",
+# or not at all, when responses are encoded straight to bytes, see "to_dict".
+
+
+class Anomaly(NamedTuple):
+    """Immutable, hence anomalies, known upfront, are shared by the validation plan."""
+
+    type: AbnormalityType
+    description: str
+
+
+@dataclass(slots=True)
+class ValidationResult:
+    is_abnormal: bool = False
+    abnormal_fields: dict[str, list[Anomaly]] = field(default_factory=dict)
+
+    def to_dto(self) -> ValidationResponseDto:
+        # Validated by pydantic-core straight from the attributes.
+        return ValidationResponseDto.model_validate(self, from_attributes=True)
+
+    def to_dict(self) -> dict[str, Any]:
+        # Same shape as the serialized ValidationResponseDto.
+        return {
+            "is_abnormal": self.is_abnormal,
+            "abnormal_fields": {
+                name: [
+                    {"type": anomaly.type, "description": anomaly.description}
+                    for anomaly in anomalies
+                ]
+                for name, anomalies in self.abnormal_fields.items()
+            },
+        }
@@ -0,0 +1,183 @@
+import os
+import time
+import asyncio
+import logging
+from typing import Any
+
+import orjson
+import redis.asyncio as redis
+from dotenv import dotenv_values
+
+from py_mirror.app.types import ModelDto, HttpMethod
+from py_mirror.app.runtime_types import ValidationResult
+from py_mirror.app.storage.redis.data_source import DataSource as RedisDataSource
+
+# Prefix of the per-bucket hashes, suffixed by the bucket start, as a Unix timestamp.
+# Fields are JSON arrays of [path, method, "group:field", type], values are the counts.
+ANOMALY_STATS_PREFIX = "py_mirror:anomaly_stats:"
+
+# Bucket start, path, method, "group:field" and type of the anomaly.
+AnomalyKey = tuple[int, str, str, str, str]
+
+
+class AnomalyStatsService:
+    """
+    Anomaly counts per model path, method, field and type, in time buckets.
+    Counted in-process, by RequestService, and added to the Redis hash of the bucket
+    by a single pipeline of HINCRBY per ANOMALY_STATS_FLUSH_INTERVAL_SECONDS,
+    rather than a Redis write per request. Hence, the buckets are shared by all the workers.
+    Runs for the lifetime of the worker, see the API lifespan.
+    """
+
+    _instance: "AnomalyStatsService" = None  # type: ignore
+
+    def __new__(cls) -> "AnomalyStatsService":
+        if not cls._instance:
+            cls._instance = super().__new__(cls)
+
+        return cls._instance
+
+    def __init__(self) -> None:
+        if hasattr(self, "enabled"):
+            return
+
+        env_vars: dict[str, str | Any] = {**dotenv_values(".env"), **os.environ}
+        self.enabled: bool = (
+            str(env_vars.get("ANOMALY_STATS_ENABLED", "false")) == "true"
+        )
+        self.bucket_seconds: int = int(
+            str(env_vars.get("ANOMALY_STATS_BUCKET_SECONDS", 60))
+        )
+        self.flush_interval: float = float(
+            str(env_vars.get("ANOMALY_STATS_FLUSH_INTERVAL_SECONDS", 5))
+        )
+        # Buckets expire in Redis, so it's also the longest window available.
+        self.retention_seconds: int = int(
+            str(env_vars.get("ANOMALY_STATS_RETENTION_SECONDS", 86400))
+        )
+        self.redis_client: redis.Redis = RedisDataSource().client
+        # Set by "run", nothing is counted until then, e.g. when disabled.
+        self.counting: bool = False
+        # Counted, but not flushed yet.
+        self._counts: dict[AnomalyKey, int] = {}
+
+    def record(self, model_dto: ModelDto, validation_result: ValidationResult) -> None:
+        if not self.counting or not validation_result.is_abnormal:
+            return
+
+        bucket = int(time.time()) // self.bucket_seconds * self.bucket_seconds
+        # The model path, rather than the one of the request,
+        # so the number of keys is bounded by the number of models.
+        path, method = model_dto.path, HttpMethod(model_dto.method).value
+        counts = self._counts
+
+        for field_name, anomalies in validation_result.abnormal_fields.items():
+            for anomaly in anomalies:
+                key = (bucket, path, method, field_name, anomaly.type.value)
+                counts[key] = counts.get(key, 0) + 1
+
+    async def run(self) -> None:
+        self.counting = True
+
+        while True:
+            await asyncio.sleep(self.flush_interval)
+
+            try:
+                await self.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception as ex:
+                logging.error(msg=repr(ex))
+
+    async def flush(self) -> None:
+        counts, self._counts = self._counts, {}
+
+        if not counts:
+            return
+
+        try:
+            await self.incr_counts_redis(counts)
+        except BaseException:
+            # Kept for the next flush, the counts are bounded by the number of keys anyway.
+            for key, count in counts.items():
+                self._counts[key] = self._counts.get(key, 0) + count
+
+            raise
+
+    async def get_stats(
+        self,
+        window_seconds: int,
+        path: str | None = None,
+        method: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Counts of the buckets, overlapping the last "window_seconds", merged,
+        most frequent anomalies first. Counts, not flushed yet, aren't included.
+        """
+        now = int(time.time())
+        last_bucket = now // self.bucket_seconds * self.bucket_seconds
+        window_seconds = min(window_seconds, self.retention_seconds)
+        buckets = range(
+            last_bucket - window_seconds // self.bucket_seconds * self.bucket_seconds,
+            last_bucket + 1,
+            self.bucket_seconds,
+        )
+        merged: dict[bytes, int] = {}
+
+        for counts in await self.get_counts_redis(list(buckets)):
+            for field, value in counts.items():
+                merged[field] = merged.get(field, 0) + int(value)
+
+        stats: list[dict[str, Any]] = []
+
+        for field, count in merged.items():
+            field_path, field_method, field_name, type = orjson.loads(field)
+
+            if (path is None or path == field_path) and (
+                method is None or method == field_method
+            ):
+                stats.append(
+                    {
+                        "path": field_path,
+                        "method": field_method,
+                        "field": field_name,
+                        "type": type,
+                        "count": count,
+                    }
+                )
+
+        stats.sort(key=lambda stat: -stat["count"])
+        return stats
+
+    async def incr_counts_redis(self, counts: dict[AnomalyKey, int]) -> None:
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipeline:
+                buckets: set[int] = set()
+
+                for (bucket, *field), count in counts.items():
+                    key = f"{ANOMALY_STATS_PREFIX}{bucket}"
+                    pipeline.hincrby(key, orjson.dumps(field).decode(), count)
+                    buckets.add(bucket)
+
+                for bucket in buckets:
+                    pipeline.expire(
+                        f"{ANOMALY_STATS_PREFIX}{bucket}",
+                        self.retention_seconds + self.bucket_seconds,
+                    )
+
+                await pipeline.execute()
+        except Exception as ex:
+            logging.error(msg=repr(ex))
+            raise
+
+    async def get_counts_redis(self, buckets: list[int]) -> list[dict[bytes, bytes]]:
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipeline:
+                for bucket in buckets:
+                    pipeline.hgetall(f"{ANOMALY_STATS_PREFIX}{bucket}")
+
+                counts: list[dict[bytes, bytes]] = await pipeline.execute()
+                return counts
+        except Exception as ex:
+            logging.error(msg=repr(ex))
+            raise
@@ -0,0 +1,77 @@
+import re
+from itertools import repeat
+from operator import methodcaller
+from typing import Any, Callable
+
+from py_mirror.app.service.validation_plan import TypeChecker
+
+# Column counterparts of the RequestService type checkers.
+# Values of the same type are checked at once, across the requests of a batch,
+# by C-level "map" passes, hence without a Python frame per value.
+# Results must be the same as the ones of the scalar checkers, value by value.
+
+ColumnChecker = Callable[[list[Any]], list[bool]]
+
+# Canonical "dd-mm-yyyy" dates, valid in any year, i.e. all but "29-02".
+CANONICAL_DATE_PATTERN = re.compile(
+    r"^(?:(?:0[1-9]|1[0-9]|2[0-8])-(?:0[1-9]|1[0-2])"
+    r"|(?:29|30)-(?:0[13-9]|1[0-2])"
+    r"|31-(?:0[13578]|1[02]))"
+    r"-(?!0000)[0-9]{4}\Z"
+)
+# Strings of other lengths are never dates.
+DATE_CANDIDATE_PATTERN = re.compile(r"^.{10}\Z", re.DOTALL)
+CANONICAL_UUID_PATTERN = re.compile(
+    r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\Z"
+)
+# Shorter strings are never UUIDs, at least 32 hex digits are expected.
+UUID_CANDIDATE_PATTERN = re.compile(r"^.{32}", re.DOTALL)
+
+
+def get_instance_checker(expected_type: type) -> ColumnChecker:
+    def check_column(values: list[Any]) -> list[bool]:
+        return list(map(isinstance, values, repeat(expected_type)))
+
+    return check_column
+
+
+def get_string_checker(
+    match: Callable[[str], Any],
+    fallback: TypeChecker | None = None,
+    fallback_pattern: re.Pattern[str] | None = None,
+) -> ColumnChecker:
+    """
+    Non-strings never match. Strings are matched by "match", all at once.
+    Strings, not matched, are re-checked by "fallback", e.g. the less common forms,
+    which the scalar checker accepts, like a date of "29-02" or a UUID in braces.
+    Unless they can't be of the type anyway, according to "fallback_pattern".
+    """
+
+    def check_column(values: list[Any]) -> list[bool]:
+        indexes: list[int] | None = None
+        strings = values
+
+        if not all(map(isinstance, values, repeat(str))):
+            indexes = [i for i, value in enumerate(values) if isinstance(value, str)]
+            strings = [values[i] for i in indexes]
+
+        matches = list(map(bool, map(match, strings)))
+
+        if fallback is not None and not all(matches):
+            for i, is_match in enumerate(matches):
+                if not is_match and (
+                    fallback_pattern is None or fallback_pattern.match(strings[i])
+                ):
+                    matches[i] = fallback(strings[i])
+
+        if indexes is None:
+            return matches
+
+        results = [False] * len(values)
+
+        for i, is_match in zip(indexes, matches):
+            results[i] = is_match
+
+        return results
+
+    return check_column
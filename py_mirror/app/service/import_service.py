@@ -0,0 +1,232 @@
+import os
+import re
+import sys
+import asyncio
+import logging
+from typing import Any, AsyncIterator
+
+from dotenv import dotenv_values
+from pydantic import ValidationError
+
+from py_mirror.app.types import (
+    ModelDto,
+    ResponseDto,
+    ImportFailureDto,
+    ImportProgressDto,
+)
+from py_mirror.app.service.model_service import ModelService
+from py_mirror.app.service.stream_service import StreamService
+from py_mirror.app.service.outbox_service import OutboxService
+
+# Characters, affecting the nesting of a JSON document.
+JSON_STRUCTURE_PATTERN = re.compile(rb'["\\\[\]{},]')
+FILE_READ_SIZE = 65_536
+
+
+class ImportService:
+    """
+    Imports NDJSON or JSON array streams of ModelDto, in chunks of IMPORT_CHUNK_SIZE models.
+    Each chunk costs a single PG transaction, Redis is updated by OutboxService.
+    """
+
+    _instance: "ImportService" = None  # type: ignore
+
+    def __new__(cls) -> "ImportService":
+        if not cls._instance:
+            cls._instance = super().__new__(cls)
+
+        return cls._instance
+
+    def __init__(self) -> None:
+        if hasattr(self, "chunk_size"):
+            return
+
+        env_vars: dict[str, str | Any] = {**dotenv_values(".env"), **os.environ}
+        self.chunk_size: int = int(str(env_vars.get("IMPORT_CHUNK_SIZE", 1000)))
+        self.max_model_size: int = int(
+            str(env_vars.get("IMPORT_MAX_MODEL_BYTES", 16_777_216))
+        )
+
+    async def import_stream(self, chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        """NDJSON of ResponseDto, holding ImportProgressDto, per imported chunk."""
+        try:
+            async for progress in self.import_models(chunks):
+                yield ResponseDto(data=progress, error=None).model_dump_json().encode()
+                yield b"\n"
+        except Exception as ex:
+            logging.error(msg=repr(ex))
+            response_dto = ResponseDto(data=None, error=f"Import aborted: {ex}")
+            yield response_dto.model_dump_json().encode() + b"\n"
+
+    async def import_file(self, file_path: str) -> int:
+        """Returns the number of failed rows."""
+        failed = 0
+
+        with open(file_path, "rb") as file:
+
+            async def read_chunks() -> AsyncIterator[bytes]:
+                while chunk := await asyncio.to_thread(file.read, FILE_READ_SIZE):
+                    yield chunk
+
+            async for progress in self.import_models(read_chunks()):
+                sys.stdout.write(progress.model_dump_json() + "\n")
+                sys.stdout.flush()
+                failed = progress.failed
+
+        return failed
+
+    async def import_models(
+        self, chunks: AsyncIterator[bytes]
+    ) -> AsyncIterator[ImportProgressDto]:
+        model_service = ModelService()
+        progress = ImportProgressDto(
+            rows=0, imported=0, failed=0, failures=[], done=False
+        )
+        # Valid models of the current chunk, paired with their row numbers.
+        rows: list[tuple[int, ModelDto]] = []
+
+        async for item in self.split_items(chunks):
+            progress.rows += 1
+
+            try:
+                model_dto = ModelDto.model_validate_json(item)
+            except ValidationError as ex:
+                progress.failed += 1
+                progress.failures.append(
+                    ImportFailureDto(
+                        row=progress.rows,
+                        error=ex.errors(
+                            include_url=False,
+                            include_context=False,
+                            include_input=False,
+                        ),
+                    )
+                )
+                continue
+
+            model_service.initialize_names_to_units_maps(model_dto)
+            model_service.initialize_required_fields_map(model_dto)
+            rows.append((progress.rows, model_dto))
+
+            if len(rows) >= self.chunk_size:
+                await self.import_chunk(rows, progress)
+                yield progress
+                progress = progress.model_copy(update={"failures": []})
+                rows = []
+
+        if rows:
+            await self.import_chunk(rows, progress)
+
+        progress.done = True
+        yield progress
+
+    async def import_chunk(
+        self, rows: list[tuple[int, ModelDto]], progress: ImportProgressDto
+    ) -> None:
+        model_service = ModelService()
+        # A single statement can't upsert the same row twice, hence the last one wins.
+        model_dtos = list(
+            {model_service.get_key(m.path, m.method): m for _, m in rows}.values()
+        )
+
+        try:
+            await model_service.upsert_models_pg(model_dtos)
+        except Exception as ex:
+            self.fail_rows(rows, progress, f"Failed to save in PG: {ex!r}")
+            return
+
+        OutboxService().notify()
+        progress.imported += len(rows)
+
+    def fail_rows(
+        self, rows: list[tuple[int, ModelDto]], progress: ImportProgressDto, error: str
+    ) -> None:
+        progress.failed += len(rows)
+        progress.failures.extend(
+            ImportFailureDto(row=row, error=error) for row, _ in rows
+        )
+
+    async def split_items(self, chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        """Either NDJSON lines, or JSON array items, depending on the first character."""
+        chunk = b""
+
+        async for chunk in chunks:
+            if chunk.strip():
+                break
+
+        async def rest(first_chunk: bytes) -> AsyncIterator[bytes]:
+            yield first_chunk
+
+            async for chunk in chunks:
+                yield chunk
+
+        if chunk.lstrip().startswith(b"["):
+            items = self.split_array_items(rest(chunk))
+        else:
+            items = StreamService().split_lines(rest(chunk), self.max_model_size)
+
+        async for item in items:
+            if item.strip():
+                yield item
+
+    async def split_array_items(
+        self, chunks: AsyncIterator[bytes]
+    ) -> AsyncIterator[bytes]:
+        """
+        Streams the items of a top level JSON array, without parsing them.
+        Only quotes, escapes, brackets and commas are looked at.
+        """
+        depth = 0
+        in_string = False
+        # Absolute position of an escaped character, which must be skipped.
+        escaped_position = -1
+        offset = 0
+        item = bytearray()
+
+        async for chunk in chunks:
+            item_start = 0
+
+            for match in JSON_STRUCTURE_PATTERN.finditer(chunk):
+                position = match.start()
+
+                if offset + position == escaped_position:
+                    continue
+
+                char = match.group()
+
+                if in_string:
+                    if char == b"\\":
+                        escaped_position = offset + position + 1
+                    elif char == b'"':
+                        in_string = False
+                elif char == b'"':
+                    in_string = True
+                elif char in (b"[", b"{"):
+                    depth += 1
+
+                    if depth == 1:
+                        item_start = position + 1
+                elif char in (b"]", b"}"):
+                    depth -= 1
+
+                    if depth == 0:
+                        # End of the array, anything beyond is ignored.
+                        item += chunk[item_start:position]
+                        yield bytes(item)
+                        return
+                elif char == b"," and depth == 1:
+                    item += chunk[item_start:position]
+                    yield bytes(item)
+                    item = bytearray()
+                    item_start = position + 1
+
+            if depth > 0:
+                item += chunk[item_start:]
+
+                if len(item) > self.max_model_size:
+                    raise ValueError(f"Model exceeds {self.max_model_size} bytes")
+
+            offset += len(chunk)
+
+        if depth > 0:
+            raise ValueError("Unexpected end of JSON array")
@@ -0,0 +1,271 @@
+import os
+import time
+import logging
+import asyncio
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+
+from dotenv import dotenv_values
+import redis.asyncio as redis
+
+from py_mirror.app.types import ModelDto, ModelCacheStatsDto
+
+# Each "save_model" call publishes the saved model's key to this channel,
+# so every worker can drop its own in-process copy.
+MODEL_INVALIDATION_CHANNEL = "py_mirror:models:invalidate"
+
+
+class ModelCache:
+    """Bounded in-process LRU/TTL cache of parsed models, shared by the worker."""
+
+    _instance: "ModelCache" = None  # type: ignore
+
+    def __new__(cls) -> "ModelCache":
+        if not cls._instance:
+            cls._instance = super().__new__(cls)
+
+        return cls._instance
+
+    def __init__(self) -> None:
+        if hasattr(self, "_entries"):
+            return
+
+        env_vars: dict[str, str | Any] = {**dotenv_values(".env"), **os.environ}
+        self.max_size: int = int(str(env_vars.get("MODEL_CACHE_SIZE", 1000)))
+        self.ttl: float = float(str(env_vars.get("MODEL_CACHE_TTL_SECONDS", 60)))
+        self.negative_max_size: int = int(
+            str(env_vars.get("MODEL_NEGATIVE_CACHE_SIZE", 10_000))
+        )
+        self.negative_ttl: float = float(
+            str(env_vars.get("MODEL_NEGATIVE_CACHE_TTL_SECONDS", 5))
+        )
+        # Cross-worker lock per key upon fetching from PG, 0 disables it, see ModelService.
+        self.fill_lock_ttl_ms: int = int(str(env_vars.get("MODEL_FILL_LOCK_TTL_MS", 0)))
+        self.fill_lock_poll_ms: int = int(
+            str(env_vars.get("MODEL_FILL_LOCK_POLL_MS", 25))
+        )
+
+        # Key is "path:method", value is a pair of expiration timestamp and the model.
+        self._entries: OrderedDict[str, tuple[float, ModelDto]] = OrderedDict()
+        # Keys of the expired entries, which were already counted in "expirations".
+        self._expired: set[str] = set()
+        # Keys of models, which were not found in storage, with their expiration timestamps.
+        self._missing: OrderedDict[str, float] = OrderedDict()
+        # Fetches from storage, shared by all the concurrent misses of the same key.
+        self._in_flight: dict[str, asyncio.Future[ModelDto | None]] = {}
+        # Incremented on each invalidation.
+        # Lets "put" detect, that the model was changed while it was being fetched.
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.negative_hits = 0
+        # Misses, which awaited a fetch of another request, rather than fetching on their own.
+        self.coalesced = 0
+        self.stale_hits = 0
+        self.fill_lock_waits = 0
+        # Notified of each saved model's key, or of None, when models might have been missed.
+        self.listeners: list[Callable[[str | None], None]] = []
+
+    def get(self, key: str) -> ModelDto | None:
+        entry = self._entries.get(key)
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, model_dto = entry
+
+        if expires_at <= time.monotonic():
+            # Kept until evicted or invalidated, see "get_stale".
+            # Hence, counted upon the first access only.
+            if key not in self._expired:
+                self._expired.add(key)
+                self.expirations += 1
+
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return model_dto
+
+    def put(self, key: str, model_dto: ModelDto, generation: int | None = None) -> None:
+        if self.max_size <= 0:
+            return
+
+        if generation is not None and generation != self.generation:
+            # The model was invalidated while being fetched, hence might be stale.
+            return
+
+        self._entries[key] = (time.monotonic() + self.ttl, model_dto)
+        self._entries.move_to_end(key)
+        self._expired.discard(key)
+
+        while len(self._entries) > self.max_size:
+            evicted_key, _ = self._entries.popitem(last=False)
+            self._expired.discard(evicted_key)
+            self.evictions += 1
+
+    def get_stale(self, key: str) -> ModelDto | None:
+        """Expired, yet not invalidated, model."""
+        entry = self._entries.get(key)
+
+        if entry is None:
+            return None
+
+        self.stale_hits += 1
+        return entry[1]
+
+    async def coalesce(
+        self,
+        keys: list[str],
+        fetch: Callable[[list[str]], Awaitable[dict[str, ModelDto | None]]],
+    ) -> dict[str, ModelDto | None]:
+        """
+        Single-flight: keys, which are already being fetched, join the fetch in flight.
+        The rest are fetched at once, and are joined by the concurrent misses in turn.
+        """
+        futures = {key: self._in_flight[key] for key in keys if key in self._in_flight}
+        self.coalesced += len(futures)
+        fetched_keys = [key for key in keys if key not in futures]
+
+        if fetched_keys:
+            # A task, rather than a coroutine, so a cancelled caller doesn't fail the others.
+            task = asyncio.ensure_future(fetch(fetched_keys))
+            loop = asyncio.get_running_loop()
+            fetched: dict[str, asyncio.Future[ModelDto | None]] = {}
+
+            for key in fetched_keys:
+                fetched[key] = futures[key] = self._in_flight[key] = (
+                    loop.create_future()
+                )
+                # Marks the exception as retrieved, even if nobody awaits.
+                fetched[key].add_done_callback(lambda f: f.cancelled() or f.exception())
+
+            task.add_done_callback(lambda task: self.resolve_in_flight(task, fetched))
+
+        return {key: await asyncio.shield(futures[key]) for key in keys}
+
+    def resolve_in_flight(
+        self,
+        task: "asyncio.Future[dict[str, ModelDto | None]]",
+        futures: dict[str, "asyncio.Future[ModelDto | None]"],
+    ) -> None:
+        for key, future in futures.items():
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+
+            if task.cancelled():
+                future.cancel()
+            elif task.exception():
+                future.set_exception(task.exception())  # type: ignore
+            else:
+                future.set_result(task.result().get(key))
+
+    def is_missing(self, key: str) -> bool:
+        expires_at = self._missing.get(key)
+
+        if expires_at is None:
+            return False
+
+        if expires_at <= time.monotonic():
+            del self._missing[key]
+            return False
+
+        self.negative_hits += 1
+        return True
+
+    def put_missing(self, key: str, generation: int | None = None) -> None:
+        if self.negative_max_size <= 0:
+            return
+
+        if generation is not None and generation != self.generation:
+            # The model might have been created while being fetched.
+            return
+
+        self._missing[key] = time.monotonic() + self.negative_ttl
+        self._missing.move_to_end(key)
+
+        while len(self._missing) > self.negative_max_size:
+            self._missing.popitem(last=False)
+
+    def invalidate(self, key: str | None = None) -> None:
+        """Drop a single key, or the whole cache if no key is given."""
+        self.generation += 1
+        self.invalidations += 1
+
+        # Fetches in flight might return the previous version, hence aren't joined anymore.
+        if key is None:
+            self._entries.clear()
+            self._expired.clear()
+            self._missing.clear()
+            self._in_flight.clear()
+        else:
+            self._entries.pop(key, None)
+            self._expired.discard(key)
+            self._missing.pop(key, None)
+            self._in_flight.pop(key, None)
+
+    def stats(self) -> ModelCacheStatsDto:
+        return ModelCacheStatsDto(
+            size=len(self._entries),
+            max_size=self.max_size,
+            ttl=self.ttl,
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            expirations=self.expirations,
+            invalidations=self.invalidations,
+            negative_size=len(self._missing),
+            negative_hits=self.negative_hits,
+            in_flight=len(self._in_flight),
+            coalesced=self.coalesced,
+            stale_hits=self.stale_hits,
+            fill_lock_waits=self.fill_lock_waits,
+        )
+
+    def notify(self, key: str | None) -> None:
+        for listener in self.listeners:
+            listener(key)
+
+    async def publish_invalidations(
+        self, redis_client: redis.Redis, keys: list[str]
+    ) -> None:
+        """
+        Drops the keys locally, and notifies the other workers, in a single round trip.
+        """
+        async with redis_client.pipeline(transaction=False) as pipeline:
+            for key in keys:
+                self.invalidate(key)
+                self.notify(key)
+                pipeline.publish(MODEL_INVALIDATION_CHANNEL, key)
+
+            await pipeline.execute()
+
+    async def listen_for_invalidations(self, redis_client: redis.Redis) -> None:
+        """Runs for the lifetime of the worker, see the API lifespan."""
+        while True:
+            try:
+                async with redis_client.pubsub(
+                    ignore_subscribe_messages=True
+                ) as pubsub:
+                    await pubsub.subscribe(MODEL_INVALIDATION_CHANNEL)
+                    # Messages, published while not subscribed, are lost.
+                    # Hence, start from scratch upon each (re)subscription.
+                    self.invalidate()
+                    self.notify(None)
+
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            key = message["data"].decode()
+                            self.invalidate(key)
+                            self.notify(key)
+            except asyncio.CancelledError:
+                raise
+            except Exception as ex:
+                logging.error(msg=repr(ex))
+                self.invalidate()
+                await asyncio.sleep(1)
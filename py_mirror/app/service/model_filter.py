@@ -0,0 +1,94 @@
+import os
+import math
+import hashlib
+from typing import Any
+
+from dotenv import dotenv_values
+
+
+class ModelFilter:
+    """
+    Bloom filter of the known "path:method" keys.
+    No false negatives, hence keys, which are definitely unknown, are rejected without any I/O.
+    False positives, at the rate of MODEL_FILTER_ERROR_RATE, fall through to the storage.
+    """
+
+    _instance: "ModelFilter" = None  # type: ignore
+
+    def __new__(cls) -> "ModelFilter":
+        if not cls._instance:
+            cls._instance = super().__new__(cls)
+
+        return cls._instance
+
+    def __init__(self) -> None:
+        if hasattr(self, "bits"):
+            return
+
+        env_vars: dict[str, str | Any] = {**dotenv_values(".env"), **os.environ}
+        self.error_rate: float = float(
+            str(env_vars.get("MODEL_FILTER_ERROR_RATE", 0.01))
+        )
+        # Headroom for the models, saved after the build.
+        self.min_capacity: int = int(str(env_vars.get("MODEL_FILTER_CAPACITY", 10_000)))
+
+        self.bits = bytearray()
+        self.bit_count = 0
+        self.hash_count = 0
+        # Nothing is rejected, until built from PG, see ModelService.build_model_indexes.
+        self.ready = False
+        # Keys, added while the keys for "build" are being fetched.
+        self.pending: list[str] | None = None
+        self.rejections = 0
+
+    def begin_build(self) -> None:
+        self.pending = []
+
+    def cancel_build(self) -> None:
+        # Otherwise, the pending ones would pile up until the next build.
+        self.pending = None
+
+    def build(self, keys: list[str]) -> None:
+        keys = [*keys, *(self.pending or [])]
+        capacity = max(2 * len(keys), self.min_capacity)
+        # Optimal size and number of hash functions for the given capacity and error rate.
+        self.bit_count = math.ceil(
+            -capacity * math.log(self.error_rate) / math.log(2) ** 2
+        )
+        self.hash_count = max(1, round(self.bit_count / capacity * math.log(2)))
+        self.bits = bytearray((self.bit_count + 7) // 8)
+
+        for key in keys:
+            for position in self.get_positions(key):
+                self.bits[position >> 3] |= 1 << (position & 7)
+
+        self.ready = True
+        self.pending = None
+
+    def add(self, key: str) -> None:
+        if self.pending is not None:
+            self.pending.append(key)
+
+        if not self.ready:
+            return
+
+        for position in self.get_positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def might_contain(self, key: str) -> bool:
+        if not self.ready:
+            return True
+
+        for position in self.get_positions(key):
+            if not self.bits[position >> 3] & (1 << (position & 7)):
+                self.rejections += 1
+                return False
+
+        return True
+
+    def get_positions(self, key: str) -> list[int]:
+        # Double hashing, "k" positions out of a single 128 bit digest.
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.bit_count for i in range(self.hash_count)]
@@ -1,80 +1,436 @@
-import json
+import time
 import logging
 import asyncio
+from typing import Any, AsyncIterator, Coroutine
 
+import orjson
 import redis.asyncio as redis
-from sqlalchemy import select, delete, update, RowMapping
+from pydantic_core import to_json, to_jsonable_python
+from sqlalchemy import select, delete, update, tuple_, text, RowMapping
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
-from sqlalchemy.sql.dml import Delete, Update
 
-from py_mirror.app.types import ModelDto, ValidationUnitTemplateDto
-from py_mirror.app.storage.pg.models import ModelEntity
+from py_mirror.app.types import (
+    ModelDto,
+    ModelPatchDto,
+    ModelPatchOp,
+    ModelPatchOperationDto,
+    ValidationUnitTemplateDto,
+    HttpMethod,
+)
+from py_mirror.app.metrics import (
+    REDIS_GET_DURATION,
+    PG_FALLBACK_DURATION,
+    MODEL_PARSE_DURATION,
+    REDIS_HITS,
+    REDIS_MISSES,
+    PG_HITS,
+    PG_MISSES,
+)
+from py_mirror.app.service.model_cache import ModelCache
+from py_mirror.app.service.route_index import RouteIndex
+from py_mirror.app.service.model_filter import ModelFilter
+from py_mirror.app.storage.pg.models import ModelEntity, OutboxEntity
 from py_mirror.app.storage.pg.data_source import DataSource as PgDataSource
 from py_mirror.app.storage.redis.data_source import DataSource as RedisDataSource
+from py_mirror.app.storage.redis.serializer import (
+    GROUPS,
+    HASH_FIELDS,
+    META_FIELD,
+    REQUIRED_FIELD,
+    METHODS_BY_VALUE,
+    TYPES_BY_VALUE,
+    ModelSerializer,
+    construct_template,
+)
+
+# Columns of the "models" table, populated upon saving. "version" is maintained by PG.
+MODEL_COLUMNS: tuple[str, ...] = (
+    "path",
+    "method",
+    "body",
+    "headers",
+    "query_params",
+    "groups_to_names_units_map",
+    "groups_to_required_fields_map",
+)
+
+# Only the columns, needed for validation, the derived maps are never read past saving.
+# JSONB is fetched as text, and decoded by orjson, see "parse_model_record_pg".
+GET_MODEL_PG_COLUMNS = (
+    "m.path, m.method::text, m.query_params::text, m.headers::text, m.body::text, "
+    "m.version"
+)
+GET_MODEL_PG_SQL = (
+    f"SELECT {GET_MODEL_PG_COLUMNS} FROM {ModelEntity.__table__.fullname} AS m "
+    "WHERE m.path = $1 AND m.method = $2;"
+)
+# Batch counterpart, the PG fallback of "get_models_storage".
+# Keys are passed as a pair of arrays, hence a single prepared statement for any batch size.
+GET_MODELS_PG_SQL = (
+    f"SELECT {GET_MODEL_PG_COLUMNS} FROM {ModelEntity.__table__.fullname} AS m "
+    "JOIN unnest($1::text[], $2::text[]) AS k(path, method) "
+    "ON m.path = k.path AND m.method::text = k.method;"
+)
+
+# In-place updates of a single template, see "patch_model_pg".
+# Both the group and its derived maps are updated, the order of the templates is kept.
+# "{group}" is one of ModelGroup, hence safe to format.
+UPSERT_TEMPLATE_PG_SQL = (
+    f"UPDATE {ModelEntity.__table__.fullname} SET "
+    "{group} = CASE "
+    "WHEN groups_to_names_units_map #> CAST(:field_path AS text[]) IS NULL "
+    "THEN {group} || jsonb_build_array(CAST(:template AS jsonb)) "
+    "ELSE (SELECT jsonb_agg("
+    "CASE WHEN t ->> 'name' = :name THEN CAST(:template AS jsonb) ELSE t END ORDER BY i) "
+    "FROM jsonb_array_elements({group}) WITH ORDINALITY AS templates(t, i)) "
+    "END, "
+    "groups_to_names_units_map = jsonb_set("
+    "groups_to_names_units_map, CAST(:field_path AS text[]), CAST(:template AS jsonb)), "
+    "groups_to_required_fields_map = CASE "
+    "WHEN CAST(:required AS boolean) THEN jsonb_set("
+    "groups_to_required_fields_map, CAST(:field_path AS text[]), 'false') "
+    "ELSE groups_to_required_fields_map #- CAST(:field_path AS text[]) "
+    "END "
+    "WHERE id = :id;"
+)
+REMOVE_TEMPLATE_PG_SQL = (
+    f"UPDATE {ModelEntity.__table__.fullname} SET "
+    "{group} = (SELECT coalesce(jsonb_agg(t ORDER BY i), '[]') "
+    "FROM jsonb_array_elements({group}) WITH ORDINALITY AS templates(t, i) "
+    "WHERE t ->> 'name' <> :name), "
+    "groups_to_names_units_map = groups_to_names_units_map "
+    "#- CAST(:field_path AS text[]), "
+    "groups_to_required_fields_map = groups_to_required_fields_map "
+    "#- CAST(:field_path AS text[]) "
+    "WHERE id = :id;"
+)
+
+# Prefix of the model hashes, see REDIS_MODEL_LAYOUT.
+# Distinct from the string keys, so both layouts coexist during a migration.
+MODEL_HASH_PREFIX = "py_mirror:models:hash:"
+
+# Hash counterpart of "SET NX".
+SET_MISSING_MODEL_HASH_SCRIPT = """
+if redis.call("EXISTS", KEYS[1]) == 1 then
+    return 0
+end
+redis.call("HSET", KEYS[1], unpack(ARGV))
+return 1
+"""
+
+# Fields of an existing hash only, so a missing one is never left partial.
+SET_EXISTING_MODEL_HASH_SCRIPT = """
+if redis.call("EXISTS", KEYS[1]) == 0 then
+    return 0
+end
+redis.call("HSET", KEYS[1], unpack(ARGV))
+return 1
+"""
+
+# Sorted set of "path:method" keys, scored by the last time the model was fetched from storage.
+MODELS_LAST_USED_KEY = "py_mirror:models:last_used"
+
+# Prefix of the per-key locks, held by the worker, which fetches the model from PG.
+FILL_LOCK_PREFIX = "py_mirror:models:fill_lock:"
+
+# Strong references to fire-and-forget tasks, which are otherwise garbage collected.
+background_tasks: set[asyncio.Task[None]] = set()
+
+
+def run_in_background(coroutine: Coroutine[Any, Any, None]) -> None:
+    task = asyncio.create_task(coroutine)
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
 
 
 class ModelService:
     def __init__(self) -> None:
         self.redis_client: redis.Redis = RedisDataSource().client
+        self.pg_data_source = PgDataSource()
         self.pg_session: async_sessionmaker[AsyncSession] = PgDataSource().async_session
+        self.model_cache = ModelCache()
+        self.model_serializer = ModelSerializer()
+        self.route_index = RouteIndex()
+        self.model_filter = ModelFilter()
 
-    async def save_model(self, model_dto: ModelDto) -> None:
+    async def save_model(self, model_dto: ModelDto) -> int:
+        """Returns the saved version of the model."""
         # Arrange query params, headers and body as maps, prior saving.
         # Eventually it will speed up real - time requests validation,
         # due to reduced time complexity - "O(n)" instead of "O(n^2)".
         self.initialize_names_to_units_maps(model_dto)
         self.initialize_required_fields_map(model_dto)
 
-        # !!!Note, asyncio.gather, when called with return_exceptions=True, never raises exceptions.
-        pg_result, redis_result = await asyncio.gather(
-            self.set_model_pg(model_dto),
-            self.set_model_redis(model_dto),
-            return_exceptions=True,
-        )
-        pg_update_failed = isinstance(pg_result, Exception)
-        redis_update_failed = isinstance(redis_result, Exception)
+        # A single PG transaction, both the model and its outbox entry are saved, or neither.
+        # Redis, and the in-process caches of all the workers, are updated by OutboxService.
+        model_dto.version = await self.upsert_model_pg(model_dto)
+        # The indexes of this worker are updated right away, rather than upon propagation.
+        # Hence, "min_version" reads of templated paths, e.g. "/users/1", resolve the model.
+        self.update_model_indexes(self.get_key(model_dto.path, model_dto.method))
+        return model_dto.version
 
-        if not pg_update_failed and not redis_update_failed:
-            # Successfully saved the model in both MongoDB and Redis.
-            return
+    async def patch_model(self, model_patch_dto: ModelPatchDto) -> int | None:
+        """
+        Returns the saved version of the model, or None, unless the model exists.
+        Raises ValueError, unless the operations apply, e.g. upon adding an existing field.
+        """
+        # As "save_model", Redis and the caches are updated by OutboxService.
+        version = await self.patch_model_pg(model_patch_dto)
 
-        # Attempt rollback changes, following failed "transaction".
-        mode_delete = True
+        if version is not None:
+            self.update_model_indexes(
+                self.get_key(model_patch_dto.path, model_patch_dto.method)
+            )
 
-        if pg_update_failed and redis_update_failed:
-            # NO NEED to revert any operation, since both failed.
-            # Just throw an Error after rest of checks.
-            pass
-        elif pg_update_failed:
-            await self.set_model_redis(model_dto, mode_delete)
-        elif redis_update_failed:
-            await self.set_model_pg(model_dto, mode_delete)
+        return version
 
-        # Notify the consumer, that current operation has failed.
-        raise Exception(f"Failed to save the model {model_dto}")
+    def check_patch_operations(
+        self,
+        operations: list[ModelPatchOperationDto],
+        existing_fields: dict[tuple[str, str], bool],
+    ) -> None:
+        """Operations are checked in order, each one against the outcome of the previous ones."""
+        for operation in operations:
+            field = (operation.group.value, operation.field_name)
+            exists = existing_fields[field]
 
-    async def get_model(self, path: str, method: str) -> ModelDto | None:
-        # In most cases, requested model will be found in Redis.
-        model_dto = await self.get_model_redis(path, method)
+            if operation.op == ModelPatchOp.ADD and exists:
+                raise ValueError(f"Field {field[0]}:{field[1]} already exists")
 
-        if model_dto:
-            # Requested model was found in Redis.
-            return model_dto
+            if operation.op != ModelPatchOp.ADD and not exists:
+                raise ValueError(f"Field {field[0]}:{field[1]} doesn't exist")
 
-        # The model might be missing due to possible failure during model upload,
-        # or, for example, due to Redis instance crash.
-        # Try to find the model in PG.
-        model_dto = await self.get_model_pg(path, method)
+            existing_fields[field] = operation.op != ModelPatchOp.REMOVE
+
+    async def get_model(
+        self,
+        path: str,
+        method: str,
+        min_version: int | None = None,
+        groups: list[str] | None = None,
+    ) -> ModelDto | None:
+        """
+        Models, older than "min_version", e.g. not propagated to Redis yet, are read from PG.
+        Hence, the consumer, which has just saved a model, can read its own write.
+        "groups" are the ones of the request, the others may be fetched partially,
+        see "get_partial_model_redis".
+        """
+        # Concrete paths, e.g. "/users/1", are served by models like "/users/{id:int}".
+        path = self.resolve_path(path, method)
+        # Hot path - no network round trip and no parsing.
+        key = self.get_key(path, method)
+        model_dto = self.model_cache.get(key)
+
+        if model_dto and model_dto.version >= (min_version or 0):
+            return model_dto
 
-        if not model_dto:
-            # Requested model not found in both Redis and PG.
+        if not min_version and self.is_unknown(key):
+            # Junk traffic, e.g. scanners, never reaches the storage.
             return None
 
-        # Requested model was found in PG.
-        # Save it in Redis prior returning to the consumer.
-        await self.set_model_redis(model_dto)
+        if (
+            groups is not None
+            and self.model_serializer.layout == "hash"
+            and self.model_cache.max_size <= 0
+        ):
+            # Otherwise, the whole model is fetched once, and cached.
+            model_dto = await self.get_partial_model_redis(path, method, groups)
+
+            if model_dto and model_dto.version >= (min_version or 0):
+                REDIS_HITS.inc()
+                # Never cached, hence touched upon each fetch, as the cache misses.
+                self.touch_models([key])
+                return model_dto
+
+        # Concurrent misses of the same model share a single fetch.
+        models = await self.model_cache.coalesce(
+            [key], lambda keys: self.get_models_storage({key: (path, method)})
+        )
+        model_dto = models[key]
+
+        if min_version and (not model_dto or model_dto.version < min_version):
+            model_dto = await self.get_model_pg(path, method)
+
         return model_dto
 
+    async def get_models(
+        self, paths_methods: list[tuple[str, str]]
+    ) -> dict[str, ModelDto | None]:
+        """Batch version of "get_model", keyed by "get_key" of the requested paths."""
+        requested_keys_to_keys: dict[str, str] = {}
+        keys_to_paths_methods: dict[str, tuple[str, str]] = {}
+
+        for path, method in paths_methods:
+            model_path = self.resolve_path(path, method)
+            key = self.get_key(model_path, method)
+            requested_keys_to_keys[self.get_key(path, method)] = key
+            keys_to_paths_methods[key] = (model_path, method)
+
+        models: dict[str, ModelDto | None] = {}
+        missing_keys = []
+
+        for key in keys_to_paths_methods:
+            models[key] = self.model_cache.get(key)
+
+            if not models[key] and not self.is_unknown(key):
+                missing_keys.append(key)
+
+        if missing_keys:
+            models.update(
+                await self.model_cache.coalesce(
+                    missing_keys,
+                    lambda keys: self.get_models_storage(
+                        {key: keys_to_paths_methods[key] for key in keys}
+                    ),
+                )
+            )
+
+        return {
+            requested_key: models[key]
+            for requested_key, key in requested_keys_to_keys.items()
+        }
+
+    async def get_models_storage(
+        self, keys_to_paths_methods: dict[str, tuple[str, str]]
+    ) -> dict[str, ModelDto | None]:
+        generation = self.model_cache.generation
+        keys = list(keys_to_paths_methods)
+        # In most cases, requested models will be found in Redis, in a single round trip.
+        models = await self.get_models_redis(keys)
+        # The models might be missing due to possible failure during model upload,
+        # or, for example, due to Redis instance crash.
+        pg_keys = [key for key in keys if not models[key]]
+        stale_keys = set()
+        REDIS_HITS.inc(len(keys) - len(pg_keys))
+        REDIS_MISSES.inc(len(pg_keys))
+
+        if pg_keys:
+            locked_keys = await self.acquire_fill_locks(pg_keys)
+            # Other workers are fetching the rest from PG.
+            other_keys = [key for key in pg_keys if key not in set(locked_keys)]
+
+            for key in other_keys:
+                # Stale-while-revalidate.
+                models[key] = self.model_cache.get_stale(key)
+
+                if models[key]:
+                    stale_keys.add(key)
+
+            awaited_keys = [key for key in other_keys if not models[key]]
+
+            if awaited_keys:
+                models.update(await self.wait_for_models_redis(awaited_keys))
+                # The other worker didn't make it in time.
+                locked_keys += [key for key in awaited_keys if not models[key]]
+
+            if locked_keys:
+                # Models, missing in Redis, are fetched from PG using a single query.
+                pg_models = await self.get_models_pg(
+                    [keys_to_paths_methods[key] for key in locked_keys]
+                )
+                PG_HITS.inc(len(pg_models))
+                PG_MISSES.inc(len(locked_keys) - len(pg_models))
+
+                if pg_models:
+                    # Save them in Redis prior returning to the consumer.
+                    # Unless saved meanwhile by OutboxService, which is never overwritten.
+                    await self.set_missing_models_redis(list(pg_models.values()))
+
+                for key in locked_keys:
+                    models[key] = pg_models.get(key)
+
+        for key in keys:
+            model_dto = models[key]
+
+            if not model_dto:
+                self.model_cache.put_missing(key, generation)
+            elif key not in stale_keys:
+                self.model_cache.put(key, model_dto, generation)
+
+        self.touch_models([key for key in keys if models[key]])
+        return models
+
+    async def acquire_fill_locks(self, keys: list[str]) -> list[str]:
+        """
+        Keys, which this worker should fetch from PG.
+        Locks expire rather than being released, hence a key is fetched from PG
+        at most once per MODEL_FILL_LOCK_TTL_MS across all the workers.
+        """
+        ttl_ms = self.model_cache.fill_lock_ttl_ms
+
+        if not ttl_ms:
+            return keys
+
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipeline:
+                for key in keys:
+                    pipeline.set(f"{FILL_LOCK_PREFIX}{key}", 1, nx=True, px=ttl_ms)
+
+                acquired = await pipeline.execute()
+
+            return [key for key, is_acquired in zip(keys, acquired) if is_acquired]
+        except Exception as ex:
+            logging.error(msg=repr(ex))
+            raise
+
+    async def wait_for_models_redis(
+        self, keys: list[str]
+    ) -> dict[str, ModelDto | None]:
+        self.model_cache.fill_lock_waits += len(keys)
+        deadline = time.monotonic() + self.model_cache.fill_lock_ttl_ms / 1000
+        models: dict[str, ModelDto | None] = dict.fromkeys(keys)
+
+        while keys and time.monotonic() < deadline:
+            await asyncio.sleep(self.model_cache.fill_lock_poll_ms / 1000)
+            models.update(await self.get_models_redis(keys))
+            keys = [key for key in keys if not models[key]]
+
+        return models
+
+    def resolve_path(self, path: str, method: str) -> str:
+        # Falls back to the exact path, in case the route index doesn't know it (yet).
+        return self.route_index.match(path, self.get_method(method)) or path
+
+    def is_unknown(self, key: str) -> bool:
+        # Either definitely unknown, or recently not found.
+        return not self.model_filter.might_contain(key) or self.model_cache.is_missing(
+            key
+        )
+
+    async def build_model_indexes(self) -> None:
+        # Models, saved meanwhile, are added to the indexes upon build.
+        self.route_index.begin_build()
+        self.model_filter.begin_build()
+
+        try:
+            paths_methods = await self.get_paths_methods_pg()
+        except Exception as ex:
+            # Until built, models are looked up by their exact paths, and nothing is rejected.
+            logging.error(msg=repr(ex))
+            self.route_index.cancel_build()
+            self.model_filter.cancel_build()
+            return
+
+        self.route_index.build(paths_methods)
+        self.model_filter.build([self.get_key(*pm) for pm in paths_methods])
+
+    def update_model_indexes(self, key: str | None) -> None:
+        """Listens to saved models, see ModelCache.listeners."""
+        if key is not None:
+            self.route_index.add(*self.parse_key(key))
+            self.model_filter.add(key)
+            return
+
+        # Models, saved by other workers while unsubscribed, might be missed.
+        run_in_background(self.build_model_indexes())
+
+    def touch_models(self, keys: list[str]) -> None:
+        # Recency of the models is tracked upon fetching from storage only.
+        # Hence, a cached model is touched at most once per cache TTL, see WarmupService.
+        if keys:
+            run_in_background(self.set_models_last_used_redis(keys))
+
     def initialize_names_to_units_maps(self, model_dto: ModelDto) -> None:
         for field in model_dto.groups_to_names_units_map:
             # 'query_params', 'headers' and 'body'.
@@ -96,71 +452,566 @@ class ModelService:
                     required_fields[template.name] = False
 
     async def get_model_pg(self, path: str, method: str) -> ModelDto | None:
+        try:
+            # A single round trip of a prepared statement,
+            # rather than "BEGIN", the ORM query and "ROLLBACK" of a session.
+            async with self.pg_data_source.driver_connection() as connection:
+                record = await connection.fetchrow(
+                    GET_MODEL_PG_SQL, path, self.get_method(method)
+                )
+                return self.parse_model_record_pg(record) if record else None
+        except Exception as ex:
+            logging.error(msg=repr(ex))
+            raise
+
+    async def get_paths_methods_pg(self) -> list[tuple[str, str]]:
+        try:
+            async with self.pg_session() as async_session:
+                stmt = select(ModelEntity.path, ModelEntity.method)
+                result = await async_session.execute(stmt)
+                return [(path, self.get_method(method)) for path, method in result]
+        except Exception as ex:
+            logging.error(msg=repr(ex))
+            raise
+
+    async def get_models_pg(
+        self, paths_methods: list[tuple[str, str]]
+    ) -> dict[str, ModelDto]:
+        try:
+            started_at = time.perf_counter()
+
+            # As "get_model_pg", a single round trip of a prepared statement.
+            async with self.pg_data_source.driver_connection() as connection:
+                records = await connection.fetch(
+                    GET_MODELS_PG_SQL,
+                    [path for path, _ in paths_methods],
+                    [self.get_method(method) for _, method in paths_methods],
+                )
+                models = [self.parse_model_record_pg(record) for record in records]
+
+            PG_FALLBACK_DURATION.observe(time.perf_counter() - started_at)
+            return {self.get_key(m.path, m.method): m for m in models}
+        except Exception as ex:
+            logging.error(msg=repr(ex))
+            raise
+
+    async def upsert_model_pg(self, model_dto: ModelDto) -> int:
+        """Insert or update, along with an outbox entry. Returns the saved version."""
+        values = self.get_values_pg(model_dto)
+
+        try:
+            async with self.pg_session() as async_session:
+                stmt = insert(ModelEntity).values(**values)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[ModelEntity.path, ModelEntity.method],
+                    set_={
+                        **{c: stmt.excluded[c] for c in MODEL_COLUMNS[2:]},
+                        "version": ModelEntity.version + 1,
+                    },
+                )
+                version = (
+                    await async_session.execute(stmt.returning(ModelEntity.version))
+                ).scalar_one()
+                await async_session.execute(
+                    insert(OutboxEntity).values(
+                        path=model_dto.path, method=model_dto.method, version=version
+                    )
+                )
+                await async_session.commit()
+                return int(version)
+        except Exception as ex:
+            logging.error(msg=repr(ex))
+            raise
+
+    async def patch_model_pg(self, model_patch_dto: ModelPatchDto) -> int | None:
+        """
+        Templates are updated in place by PG, rather than rewriting the whole model.
+        The version is bumped, and the outbox entry lists the changed groups,
+        so only those are written to Redis, see "set_models_redis_pipeline".
+        """
+        operations = model_patch_dto.operations
+        fields = list(
+            dict.fromkeys((op.group.value, op.field_name) for op in operations)
+        )
+
+        try:
+            async with self.pg_session() as async_session:
+                # Locked, so the operations are checked against the state they are applied to.
+                stmt = (
+                    select(
+                        ModelEntity.id,
+                        *(
+                            ModelEntity.groups_to_names_units_map[field].isnot(None)
+                            for field in fields
+                        ),
+                    )
+                    .where(
+                        ModelEntity.path == model_patch_dto.path,
+                        ModelEntity.method == model_patch_dto.method,
+                    )
+                    .with_for_update()
+                )
+                row = (await async_session.execute(stmt)).first()
+
+                if row is None:
+                    return None
+
+                id, *exists = row
+                self.check_patch_operations(operations, dict(zip(fields, exists)))
+
+                for op in operations:
+                    params: dict[str, Any] = {
+                        "id": id,
+                        "name": op.field_name,
+                        "field_path": [op.group.value, op.field_name],
+                    }
+
+                    if op.op == ModelPatchOp.REMOVE:
+                        sql = REMOVE_TEMPLATE_PG_SQL
+                    else:
+                        sql = UPSERT_TEMPLATE_PG_SQL
+                        params["template"] = to_json(op.template).decode()
+                        params["required"] = op.template.required  # type: ignore
+
+                    await async_session.execute(
+                        text(sql.format(group=op.group.value)), params
+                    )
+
+                version_stmt = (
+                    update(ModelEntity)
+                    .where(ModelEntity.id == id)
+                    .values(version=ModelEntity.version + 1)
+                    .returning(ModelEntity.version)
+                )
+                version = (await async_session.execute(version_stmt)).scalar_one()
+                await async_session.execute(
+                    insert(OutboxEntity).values(
+                        path=model_patch_dto.path,
+                        method=model_patch_dto.method,
+                        version=version,
+                        groups=sorted({op.group.value for op in operations}),
+                    )
+                )
+                await async_session.commit()
+                return int(version)
+        except Exception as ex:
+            logging.error(msg=repr(ex))
+            raise
+
+    async def drain_outbox_pg(self, batch_size: int) -> int:
+        """
+        Propagates a batch of saved models to Redis. Returns the number of drained entries.
+        Entries are locked with "SKIP LOCKED", hence workers drain concurrently.
+        The models are share-locked until Redis is updated, so newer versions
+        can't be saved, and propagated by another worker, in between.
+        """
         try:
             async with self.pg_session() as async_session:
-                stmt = select(ModelEntity).where(
-                    ModelEntity.path == path, ModelEntity.method == method
+                stmt = (
+                    select(
+                        OutboxEntity.id,
+                        OutboxEntity.path,
+                        OutboxEntity.method,
+                        OutboxEntity.groups,
+                    )
+                    .order_by(OutboxEntity.id)
+                    .limit(batch_size)
+                    .with_for_update(skip_locked=True)
+                )
+                entries = (await async_session.execute(stmt)).all()
+
+                if not entries:
+                    return 0
+
+                paths_methods = sorted({(e.path, e.method) for e in entries})
+                # Groups, changed by the entries of each model, None means all of them.
+                groups_by_key: dict[str, set[str] | None] = {}
+
+                for e in entries:
+                    key = self.get_key(e.path, e.method)
+                    groups = groups_by_key.get(key, set())
+
+                    if groups is not None and e.groups is not None:
+                        groups_by_key[key] = groups | set(e.groups)
+                    else:
+                        groups_by_key[key] = None
+
+                stmt = (
+                    # Plain rows, rather than ORM entities, parsed by "parse_model_pg".
+                    # Share-locked, so the models aren't changed until Redis is written.
+                    select(*ModelEntity.__table__.c)
+                    .where(
+                        tuple_(ModelEntity.path, ModelEntity.method).in_(paths_methods)
+                    )
+                    # Same order as bulk upserts, avoiding deadlocks.
+                    .order_by(ModelEntity.path, ModelEntity.method)
+                    .with_for_update(read=True)
                 )
                 result = await async_session.execute(stmt)
-                raw_model = result.mappings().fetchone()
-                return self.parse_model_pg(raw_model) if raw_model else None
+                model_dtos = [self.parse_model_pg(raw) for raw in result.mappings()]
+                await self.set_models_redis_pipeline(model_dtos, groups_by_key)
+                await async_session.execute(
+                    delete(OutboxEntity).where(
+                        OutboxEntity.id.in_([e.id for e in entries])
+                    )
+                )
+                await async_session.commit()
+                return len(entries)
         except Exception as ex:
             logging.error(msg=repr(ex))
             raise
 
-    async def set_model_pg(
-        self, model_dto: ModelDto, mode_delete: bool = False
-    ) -> None:
+    async def stream_models_pg(
+        self,
+        batch_size: int,
+        paths_methods: list[tuple[str, str]] | None = None,
+        limit: int | None = None,
+    ) -> AsyncIterator[list[ModelDto]]:
+        """Streams batches of models, using a server-side cursor."""
         try:
             async with self.pg_session() as async_session:
-                stmt: Delete | Update = (
-                    delete(ModelEntity)
-                    if mode_delete
-                    else update(ModelEntity).values(**model_dto)
-                ).where(
-                    ModelEntity.path == model_dto.path,
-                    ModelEntity.method == model_dto.method,
+                # Plain rows, rather than ORM entities, parsed by "parse_model_pg".
+                # Hence, no identity map, growing along with the streamed batches.
+                stmt = select(*ModelEntity.__table__.c)
+
+                if paths_methods is not None:
+                    stmt = stmt.where(
+                        tuple_(ModelEntity.path, ModelEntity.method).in_(paths_methods)
+                    )
+
+                if limit:
+                    # Newest models first.
+                    stmt = stmt.order_by(ModelEntity.id.desc()).limit(limit)
+
+                result = await async_session.stream(
+                    stmt.execution_options(yield_per=batch_size)
                 )
 
-                await async_session.execute(stmt)
+                async for raw_models in result.mappings().partitions():
+                    yield [self.parse_model_pg(raw) for raw in raw_models]
+        except Exception as ex:
+            logging.error(msg=repr(ex))
+            raise
+
+    async def upsert_models_pg(self, model_dtos: list[ModelDto]) -> None:
+        """
+        Bulk insert or update, along with outbox entries, in a single transaction.
+        Models are COPY-ed into a temporary staging table, then merged into "models".
+        Note, models must be unique by "path:method".
+        """
+        table = ModelEntity.__table__.fullname
+        outbox_table = OutboxEntity.__table__.fullname
+        columns = ", ".join(MODEL_COLUMNS)
+        updates = ", ".join(f"{c} = EXCLUDED.{c}" for c in MODEL_COLUMNS[2:])
+
+        try:
+            async with self.pg_session() as async_session:
+                await async_session.execute(
+                    text(
+                        f"CREATE TEMP TABLE models_staging ON COMMIT DROP AS "
+                        f"SELECT {columns} FROM {table} WITH NO DATA;"
+                    )
+                )
+                connection = await async_session.connection()
+                raw_connection = await connection.get_raw_connection()
+                # COPY is only available via the asyncpg connection itself.
+                await raw_connection.driver_connection.copy_records_to_table(  # type: ignore
+                    "models_staging",
+                    columns=MODEL_COLUMNS,
+                    records=[self.get_record_pg(m) for m in model_dtos],
+                )
+                await async_session.execute(
+                    text(
+                        f"WITH upserted AS ("
+                        f"INSERT INTO {table} ({columns}) "
+                        f"SELECT {columns} FROM models_staging ORDER BY path, method "
+                        f"ON CONFLICT (path, method) DO UPDATE "
+                        f"SET {updates}, version = {table}.version + 1 "
+                        f"RETURNING path, method, version) "
+                        f"INSERT INTO {outbox_table} (path, method, version) "
+                        f"SELECT path, method, version FROM upserted;"
+                    )
+                )
                 await async_session.commit()
         except Exception as ex:
             logging.error(msg=repr(ex))
             raise
 
-    async def set_model_redis(
-        self, model_dto: ModelDto, mode_delete: bool = False
+    async def set_models_redis_pipeline(
+        self,
+        model_dtos: list[ModelDto],
+        groups_by_key: dict[str, set[str] | None] | None = None,
     ) -> None:
+        """
+        Notifies the workers of the saved models, see OutboxService.
+        In the hash layout, only the groups, changed according to "groups_by_key", are written.
+        """
         try:
-            key = self.get_key(model_dto.path, model_dto.method)
+            # Indexes of the pipelined commands, which write the changed groups only.
+            patched_indexes: dict[int, ModelDto] = {}
+
+            async with self.redis_client.pipeline(transaction=False) as pipeline:
+                command_count = 0
+
+                for m in model_dtos:
+                    key = self.get_key(m.path, m.method)
+                    groups = (groups_by_key or {}).get(key)
+
+                    if self.model_serializer.layout != "hash":
+                        pipeline.set(key, self.serialize_model_redis(m))
+                    elif groups is None:
+                        fields = self.model_serializer.encode_fields(m)
+                        pipeline.hset(f"{MODEL_HASH_PREFIX}{key}", mapping=fields)
+                        # The string is stale from now on, hence removed.
+                        pipeline.delete(key)
+                        command_count += 1
+                    else:
+                        fields = self.model_serializer.encode_fields(m, groups)
+                        patched_indexes[command_count] = m
+                        pipeline.eval(
+                            SET_EXISTING_MODEL_HASH_SCRIPT,
+                            1,
+                            f"{MODEL_HASH_PREFIX}{key}",
+                            *(item for field in fields.items() for item in field),  # type: ignore
+                        )
+
+                    command_count += 1
+
+                results = await pipeline.execute()
+
+            # Hashes, which are missing, e.g. not migrated yet, are written as a whole.
+            missing_model_dtos = [
+                m for i, m in patched_indexes.items() if not results[i]
+            ]
+
+            if missing_model_dtos:
+                async with self.redis_client.pipeline(transaction=False) as pipeline:
+                    for m in missing_model_dtos:
+                        key = self.get_key(m.path, m.method)
+                        fields = self.model_serializer.encode_fields(m)
+                        pipeline.hset(f"{MODEL_HASH_PREFIX}{key}", mapping=fields)
+                        pipeline.delete(key)
 
-            if mode_delete:
-                await self.redis_client.getdel(key)
-            else:
-                await self.redis_client.set(key, self.serialize_model_redis(model_dto))
+                    await pipeline.execute()
+
+            await self.model_cache.publish_invalidations(
+                self.redis_client, [self.get_key(m.path, m.method) for m in model_dtos]
+            )
+        except Exception as ex:
+            logging.error(msg=repr(ex))
+            raise
+
+    async def set_missing_models_redis(self, model_dtos: list[ModelDto]) -> None:
+        """
+        Models, already presented in Redis, are kept as is.
+        Hence, a model, saved meanwhile, is never overwritten by a stale copy.
+        """
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipeline:
+                for m in model_dtos:
+                    key = self.get_key(m.path, m.method)
+
+                    if self.model_serializer.layout == "hash":
+                        fields = self.model_serializer.encode_fields(m)
+                        pipeline.eval(
+                            SET_MISSING_MODEL_HASH_SCRIPT,
+                            1,
+                            f"{MODEL_HASH_PREFIX}{key}",
+                            *(item for field in fields.items() for item in field),  # type: ignore
+                        )
+                    else:
+                        pipeline.set(key, self.serialize_model_redis(m), nx=True)
+
+                await pipeline.execute()
+        except Exception as ex:
+            logging.error(msg=repr(ex))
+            raise
+
+    async def set_models_last_used_redis(self, keys: list[str]) -> None:
+        try:
+            await self.redis_client.zadd(
+                MODELS_LAST_USED_KEY, dict.fromkeys(keys, time.time())
+            )
+        except Exception as ex:
+            # Best effort, since it only affects the warm-up.
+            logging.error(msg=repr(ex))
+
+    async def get_models_last_used_redis(self, limit: int) -> list[tuple[str, str]]:
+        try:
+            keys = await self.redis_client.zrevrange(MODELS_LAST_USED_KEY, 0, limit - 1)
+            return [self.parse_key(key.decode()) for key in keys]
+        except Exception as ex:
+            logging.error(msg=repr(ex))
+            raise
+
+    async def get_models_redis(self, keys: list[str]) -> dict[str, ModelDto | None]:
+        if self.model_serializer.layout == "hash":
+            return await self.get_model_hashes_redis(keys)
+
+        try:
+            started_at = time.perf_counter()
+            serialized_models = await self.redis_client.mget(keys)
+            parsed_at = time.perf_counter()
+            REDIS_GET_DURATION.observe(parsed_at - started_at)
+            models = {
+                key: self.parse_model_redis(serialized_model)
+                if serialized_model
+                else None
+                for key, serialized_model in zip(keys, serialized_models)
+            }
+            MODEL_PARSE_DURATION.observe(time.perf_counter() - parsed_at)
+            return models
         except Exception as ex:
             logging.error(msg=repr(ex))
             raise
 
-    async def get_model_redis(self, path: str, method: str) -> ModelDto | None:
+    async def get_model_hashes_redis(
+        self, keys: list[str]
+    ) -> dict[str, ModelDto | None]:
+        """
+        Hash layout counterpart of "get_models_redis".
+        Models, which are still stored as strings, are read as such,
+        and stored as hashes in the background, hence migrated upon first use.
+        """
         try:
-            key = self.get_key(path, method)
-            serialized_model = await self.redis_client.get(key)
-            return (
-                self.parse_model_redis(serialized_model) if serialized_model else None
+            started_at = time.perf_counter()
+
+            async with self.redis_client.pipeline(transaction=False) as pipeline:
+                for key in keys:
+                    pipeline.hmget(f"{MODEL_HASH_PREFIX}{key}", list(HASH_FIELDS))
+
+                values = await pipeline.execute()
+
+            parsed_at = time.perf_counter()
+            REDIS_GET_DURATION.observe(parsed_at - started_at)
+            models: dict[str, ModelDto | None] = {
+                key: self.model_serializer.decode_fields(dict(zip(HASH_FIELDS, v)))
+                if v[0] is not None
+                else None
+                for key, v in zip(keys, values)
+            }
+            MODEL_PARSE_DURATION.observe(time.perf_counter() - parsed_at)
+            string_keys = [key for key in keys if not models[key]]
+
+            if string_keys:
+                string_models = await self.get_string_models_redis(string_keys)
+                models.update(string_models)
+                migrated_models = [m for m in string_models.values() if m]
+
+                if migrated_models:
+                    run_in_background(self.set_missing_models_redis(migrated_models))
+
+            return models
+        except Exception as ex:
+            logging.error(msg=repr(ex))
+            raise
+
+    async def get_string_models_redis(
+        self, keys: list[str]
+    ) -> dict[str, ModelDto | None]:
+        serialized_models = await self.redis_client.mget(keys)
+        return {
+            key: self.parse_model_redis(serialized_model) if serialized_model else None
+            for key, serialized_model in zip(keys, serialized_models)
+        }
+
+    async def get_partial_model_redis(
+        self, path: str, method: str, groups: list[str]
+    ) -> ModelDto | None:
+        """
+        Only the given groups of the model hash are fetched and decoded,
+        along with the names of the required fields of the others.
+        None, unless stored as a hash.
+        """
+        try:
+            fields = [META_FIELD, REQUIRED_FIELD, *(g for g in GROUPS if g in groups)]
+            started_at = time.perf_counter()
+            values = await self.redis_client.hmget(  # type: ignore
+                f"{MODEL_HASH_PREFIX}{self.get_key(path, method)}", fields
             )
+            parsed_at = time.perf_counter()
+            REDIS_GET_DURATION.observe(parsed_at - started_at)
+
+            if values[0] is None:
+                return None
+
+            model_dto = self.model_serializer.decode_fields(dict(zip(fields, values)))
+            MODEL_PARSE_DURATION.observe(time.perf_counter() - parsed_at)
+            return model_dto
         except Exception as ex:
             logging.error(msg=repr(ex))
             raise
 
     def get_key(self, path: str, method: str) -> str:
-        return f"{path}:{method}"
+        return f"{path}:{self.get_method(method)}"
+
+    def parse_key(self, key: str) -> tuple[str, str]:
+        path, method = key.rsplit(":", 1)
+        return path, method
+
+    def get_method(self, method: str) -> str:
+        # Both "GET" and HttpMethod.GET become "GET".
+        # Note, formatting of the latter results in "HttpMethod.GET".
+        return HttpMethod(method).value
+
+    def serialize_model_redis(self, model_dto: ModelDto) -> bytes:
+        return self.model_serializer.encode(model_dto)
+
+    def parse_model_redis(self, serialized_model: bytes) -> ModelDto:
+        return self.model_serializer.decode(serialized_model)
 
-    def serialize_model_redis(self, model_dto: ModelDto) -> str:
-        return json.dumps(model_dto)
+    def get_values_pg(self, model_dto: ModelDto) -> dict[str, Any]:
+        return {
+            "path": model_dto.path,
+            "method": model_dto.method,
+            **to_jsonable_python(
+                model_dto,
+                include={"body", "headers", "query_params"},
+            ),
+            "groups_to_names_units_map": to_jsonable_python(
+                model_dto.groups_to_names_units_map
+            ),
+            "groups_to_required_fields_map": to_jsonable_python(
+                model_dto.groups_to_required_fields_map
+            ),
+        }
 
-    def parse_model_redis(self, serialized_model: str) -> ModelDto:
-        return ModelDto(**json.loads(serialized_model))
+    def get_record_pg(self, model_dto: ModelDto) -> tuple[str, ...]:
+        # JSONB values are passed as JSON strings, see SQLAlchemy's asyncpg JSONB codec.
+        return (
+            model_dto.path,
+            self.get_method(model_dto.method),
+            to_json(model_dto.body).decode(),
+            to_json(model_dto.headers).decode(),
+            to_json(model_dto.query_params).decode(),
+            to_json(model_dto.groups_to_names_units_map).decode(),
+            to_json(model_dto.groups_to_required_fields_map).decode(),
+        )
 
     def parse_model_pg(self, raw_model: RowMapping) -> ModelDto:
         return ModelDto(**raw_model)
+
+    def parse_model_record_pg(self, record: Any) -> ModelDto:
+        """Counterpart of "parse_model_pg" for the rows of GET_MODEL(S)_PG_SQL."""
+        path, method, query_params, headers, body, version = record
+
+        # The data is trusted - it was validated prior being saved.
+        # Hence, pydantic validation is skipped, as upon decoding models from Redis.
+        return ModelDto.model_construct(
+            path=path,
+            method=METHODS_BY_VALUE[method],
+            query_params=self.parse_templates_pg(query_params),
+            headers=self.parse_templates_pg(headers),
+            body=self.parse_templates_pg(body),
+            version=version,
+        )
+
+    def parse_templates_pg(self, templates: str) -> list[ValidationUnitTemplateDto]:
+        return [
+            construct_template(
+                template["name"],
+                template["required"],
+                [TYPES_BY_VALUE[type] for type in template["types"]],
+            )
+            for template in orjson.loads(templates)
+        ]
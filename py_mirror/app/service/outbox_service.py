@@ -0,0 +1,66 @@
+import os
+import asyncio
+import logging
+from typing import Any
+
+from dotenv import dotenv_values
+
+from py_mirror.app.service.model_service import ModelService
+
+
+class OutboxService:
+    """
+    Propagates saved models from the PG outbox to Redis, in batches of pipelined writes.
+    Runs for the lifetime of the worker, see the API lifespan.
+    Models, saved by any process (e.g. "--import-models"), are propagated by the API workers.
+    """
+
+    _instance: "OutboxService" = None  # type: ignore
+
+    def __new__(cls) -> "OutboxService":
+        if not cls._instance:
+            cls._instance = super().__new__(cls)
+
+        return cls._instance
+
+    def __init__(self) -> None:
+        if hasattr(self, "batch_size"):
+            return
+
+        env_vars: dict[str, str | Any] = {**dotenv_values(".env"), **os.environ}
+        self.batch_size: int = int(str(env_vars.get("OUTBOX_BATCH_SIZE", 500)))
+        # Upper bound for propagation of models, saved by other processes.
+        self.poll_interval: float = float(
+            str(env_vars.get("OUTBOX_POLL_INTERVAL_SECONDS", 1))
+        )
+        # Set upon saving a model in this worker, so it's propagated without delay.
+        # Created by "run", since it's bound to the event loop.
+        self._saved: asyncio.Event | None = None
+
+    def notify(self) -> None:
+        if self._saved:
+            self._saved.set()
+
+    async def run(self) -> None:
+        self._saved = asyncio.Event()
+        model_service = ModelService()
+
+        while True:
+            try:
+                self._saved.clear()
+
+                if (
+                    await model_service.drain_outbox_pg(self.batch_size)
+                    == self.batch_size
+                ):
+                    # There might be more.
+                    continue
+
+                await asyncio.wait_for(self._saved.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as ex:
+                logging.error(msg=repr(ex))
+                await asyncio.sleep(self.poll_interval)
@@ -1,151 +1,249 @@
 import uuid
 import re
+import time
 import logging
 import datetime
-from typing import Any, Callable
-
-from py_mirror.app.types import (
-    ModelDto,
-    ValidationUnitDto,
-    ValidationResponseDto,
-    Type,
-    AbnormalityType,
-    AbnormalityReason,
-    RequestDto,
+from typing import Any
+from operator import methodcaller
+
+from py_mirror.app.types import ModelDto, Type, AbnormalityType, RequestDto
+from py_mirror.app.runtime_types import Anomaly, ValidationResult
+from py_mirror.app.metrics import ANOMALIES, VALIDATION_DURATION
+from py_mirror.app.service.validation_plan import (
+    TypeChecker,
+    ValidationPlan,
+    compile_validation_plan,
 )
+from py_mirror.app.service.anomaly_stats_service import AnomalyStatsService
+from py_mirror.app.service.column_checkers import (
+    CANONICAL_DATE_PATTERN,
+    CANONICAL_UUID_PATTERN,
+    DATE_CANDIDATE_PATTERN,
+    UUID_CANDIDATE_PATTERN,
+    ColumnChecker,
+    get_instance_checker,
+    get_string_checker,
+)
+
+
+# Compiled once, rather than looked up in the "re" module cache per value.
+EMAIL_PATTERN = re.compile(r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$")
 
 
 class RequestService:
-    def validate_request(
-        self, request_dto: RequestDto, model_dto: ModelDto
-    ) -> ValidationResponseDto:
-        validation_response_dto = ValidationResponseDto()
+    _instance: "RequestService" = None  # type: ignore
 
-        for group_name in model_dto.groups_to_names_units_map.keys():
-            response = self.validate_params_group(group_name, request_dto, model_dto)
+    def __new__(cls) -> "RequestService":
+        if not cls._instance:
+            cls._instance = super().__new__(cls)
 
-            if response.is_abnormal:
-                validation_response_dto.is_abnormal = True
+        return cls._instance
 
-                for abnormal_field in response.abnormal_fields:
-                    # Avoid possible override of fields with the same name,
-                    # but from different groups ('query_params', 'headers' and 'body').
-                    group_and_field = f"{group_name}:{abnormal_field}"
-                    validation_response_dto.abnormal_fields[group_and_field] = (
-                        response.abnormal_fields[abnormal_field]
-                    )
+    def __init__(self) -> None:
+        # Constructed per request, the checkers are built once though.
+        if hasattr(self, "type_checkers"):
+            return
 
-        return validation_response_dto
+        self.type_checkers: dict[Type, TypeChecker] = {
+            Type.Auth_Token: self.is_auth_token,
+            Type.Date: self.is_date,
+            Type.UUID: self.is_uuid,
+            Type.Email: self.is_email,
+            Type.List: self.is_list,
+            Type.Boolean: self.is_bool,
+            Type.Int: self.is_int,
+            Type.String: self.is_str,
+        }
+        # Batch counterparts of the above, see "validate_requests".
+        self.column_checkers: dict[Type, ColumnChecker] = {
+            Type.Auth_Token: get_string_checker(methodcaller("startswith", "Bearer ")),
+            Type.Date: get_string_checker(
+                CANONICAL_DATE_PATTERN.match, self.is_date, DATE_CANDIDATE_PATTERN
+            ),
+            Type.UUID: get_string_checker(
+                CANONICAL_UUID_PATTERN.match, self.is_uuid, UUID_CANDIDATE_PATTERN
+            ),
+            Type.Email: get_string_checker(EMAIL_PATTERN.match),
+            Type.List: get_instance_checker(list),
+            Type.Boolean: get_instance_checker(bool),
+            Type.Int: get_instance_checker(int),
+            Type.String: get_instance_checker(str),
+        }
+        self.anomaly_stats = AnomalyStatsService()
 
-    def validate_params_group(
-        self, group_name: str, request_dto: RequestDto, model_dto: ModelDto
-    ) -> ValidationResponseDto:
+    def validate_request(
+        self, request_dto: RequestDto, model_dto: ModelDto
+    ) -> ValidationResult:
         # Currently, there are two main flows to validate params:
         # 1.
         # Run through "POST /request" input and validate against corresponding validation template.
         # Along the way, we can find fields, which don't have corresponding validation template - yet another anomaly.
         # 2.
         # Must make sure, that all the required fields actually appear in the "POST /request" input.
-        validation_response_dto = ValidationResponseDto()
-
-        # Note, group names are the same for both RequestDto and ModelDto.
-        # Both DTOs were thoroughly validated prior being saved to Redis and Mongo.
-        validation_units = request_dto[group_name]
-        validation_unit_templates = model_dto.groups_to_names_units_map[group_name]
-
-        for unit in validation_units:
-            # Validation unit's template can be picked by name.
-            # Note:
-            # 1. Both the unit, and it's corresponding template, must share the name, validated using name's and request's DTOs.
-            # 2. Query params, headers and body were prearranged as name-value maps prior saving.
-            # 3. Some endpoints, received via "POST /request", may not have corresponding validation template.
-            template = validation_unit_templates[unit.name]
-
-            if not template:
-                abnormality_reason = AbnormalityReason(
-                    type=AbnormalityType.VALIDATION_TEMPLATE_MISSING,
-                    description=f"Field {unit.name} missing validation template",
-                )
-
-                self.set_anomaly_details(
-                    unit.name, validation_response_dto, abnormality_reason
-                )
-                continue
-
-            if template.required:
-                # Current validation unit (field from "POST /request" input) appears to be "required".
-                # Mark corresponding field in "groups_to_required_fields_map" as true.
-                model_dto.groups_to_required_fields_map[group_name][template.name] = (
-                    True
-                )
+        # !!!Note, the result is converted to ValidationResponseDto only at the API boundary.
+        started_at = time.perf_counter()
+        validation_result = self.get_validation_result(request_dto, model_dto)
+        VALIDATION_DURATION.observe(time.perf_counter() - started_at)
+        return validation_result
 
-            self.validate_type(unit, template.types, validation_response_dto)
+    def get_validation_result(
+        self, request_dto: RequestDto, model_dto: ModelDto
+    ) -> ValidationResult:
+        validation_result = ValidationResult()
+        validation_plan = self.get_validation_plan(model_dto)
+
+        # Models are cached and shared between requests, hence must not be mutated.
+        # Track the checked fields per request, as a bitmask, instead.
+        checked_fields = 0
+
+        for group in validation_plan.groups:
+            # Note, group names are the same for both RequestDto and ModelDto.
+            for unit in getattr(request_dto, group.name):
+                # Some fields, received via "POST /request", may not have corresponding validation template.
+                field = group.fields.get(unit.name)
+
+                if field is None:
+                    anomaly = Anomaly(
+                        AbnormalityType.VALIDATION_TEMPLATE_MISSING,
+                        f"Field {unit.name} missing validation template",
+                    )
 
-        self.add_missing_required_fields(group_name, model_dto, validation_response_dto)
-        return validation_response_dto
+                    self.set_anomaly_details(
+                        f"{group.name}:{unit.name}", validation_result, anomaly
+                    )
+                    continue
 
-    def add_missing_required_fields(
-        self,
-        group_name: str,
-        model_dto: ModelDto,
-        validation_response_dto: ValidationResponseDto,
-    ) -> None:
-        for field in model_dto.groups_to_required_fields_map[group_name]:
-            if not model_dto.groups_to_required_fields_map[group_name][field]:
-                abnormality_reason = AbnormalityReason(
-                    type=AbnormalityType.REQUIRED_FIELD_MISSING,
-                    description=f"Required field {field} is missing",
-                )
-
-                self.set_anomaly_details(
-                    field, validation_response_dto, abnormality_reason
-                )
-
-    def validate_type(
-        self,
-        unit: ValidationUnitDto,
-        allowed_types: list[Type],
-        validation_response_dto: ValidationResponseDto,
-    ) -> None:
-        is_valid_value = any(
-            self.is_value_of_type(type, unit.value) for type in allowed_types
-        )
+                checked_fields |= field.bit
 
-        if is_valid_value:
-            return
+                for checker in field.checkers:
+                    if checker(unit.value):
+                        break
+                else:
+                    self.set_anomaly_details(
+                        field.group_and_field, validation_result, field.type_missmatch
+                    )
 
-        allowed_types_str = ",".join(allowed_types)
-        abnormality_reason = AbnormalityReason(
-            type=AbnormalityType.TYPE_MISSMATCH,
-            description=f"Field {unit.name} must be of type[s] {allowed_types_str}",
-        )
+        missing_fields = validation_plan.required_mask & ~checked_fields
+
+        while missing_fields:
+            # Visit set bits only, lowest first.
+            bit = missing_fields & -missing_fields
+            missing_fields ^= bit
+            field = validation_plan.fields_by_index[bit.bit_length() - 1]
+            self.set_anomaly_details(
+                field.group_and_field, validation_result, field.required_field_missing
+            )
+
+        self.anomaly_stats.record(model_dto, validation_result)
+        return validation_result
+
+    def validate_requests(
+        self, requests_models: list[tuple[RequestDto, ModelDto]]
+    ) -> list[ValidationResult]:
+        """
+        Batch version of "validate_request", with the same results.
+        Values of the fields, allowing the same types, are grouped across all the requests,
+        and checked column by column, see "check_column".
+        Normal requests, the dominant case, are done at that point.
+        Abnormal ones are validated once again, one by one, to report their anomalies.
+        """
+        started_at = time.perf_counter()
+        # Allowed types to the values, and the indexes of the requests they belong to.
+        columns: dict[tuple[Type, ...], tuple[list[Any], list[int]]] = {}
+        is_abnormal = bytearray(len(requests_models))
+
+        for request_index, (request_dto, model_dto) in enumerate(requests_models):
+            validation_plan = self.get_validation_plan(model_dto)
+            checked_fields = 0
+
+            for group in validation_plan.groups:
+                for unit in getattr(request_dto, group.name):
+                    field = group.fields.get(unit.name)
+
+                    if field is None:
+                        is_abnormal[request_index] = 1
+                        continue
+
+                    checked_fields |= field.bit
+                    column = columns.get(field.types)
+
+                    if column is None:
+                        column = columns[field.types] = ([], [])
+
+                    column[0].append(unit.value)
+                    column[1].append(request_index)
+
+            if validation_plan.required_mask & ~checked_fields:
+                is_abnormal[request_index] = 1
+
+        for types, (values, request_indexes) in columns.items():
+            results = self.check_column(types, values)
+
+            if all(results):
+                continue
 
-        self.set_anomaly_details(unit.name, validation_response_dto, abnormality_reason)
+            # Failures are rare, hence they are searched for by "list.index", in C.
+            i = -1
+
+            try:
+                while True:
+                    i = results.index(False, i + 1)
+                    is_abnormal[request_indexes[i]] = 1
+            except ValueError:
+                pass
+
+        validation_results = [
+            self.get_validation_result(request_dto, model_dto)
+            if is_abnormal[request_index]
+            else ValidationResult()
+            for request_index, (request_dto, model_dto) in enumerate(requests_models)
+        ]
+        VALIDATION_DURATION.observe(time.perf_counter() - started_at)
+        return validation_results
+
+    def check_column(self, types: tuple[Type, ...], values: list[Any]) -> list[bool]:
+        # As the scalar checkers, the next type is checked only if the previous ones failed.
+        results = self.column_checkers[types[0]](values)
+
+        for type in types[1:]:
+            failed = [i for i, is_of_type in enumerate(results) if not is_of_type]
+
+            if not failed:
+                break
+
+            for i, is_of_type in zip(
+                failed, self.column_checkers[type]([values[i] for i in failed])
+            ):
+                results[i] = is_of_type
+
+        return results
+
+    def get_validation_plan(self, model_dto: ModelDto) -> ValidationPlan:
+        # The plan is attached to the model instance.
+        # Cached models are replaced upon each save, hence it is built once per version.
+        if model_dto._validation_plan is None:
+            model_dto._validation_plan = compile_validation_plan(
+                model_dto, self.type_checkers
+            )
+
+        validation_plan: ValidationPlan = model_dto._validation_plan
+        return validation_plan
 
     def set_anomaly_details(
-        self, field_name: str, dto: ValidationResponseDto, reason: AbnormalityReason
+        self, field_name: str, result: ValidationResult, anomaly: Anomaly
     ) -> None:
-        dto.is_abnormal = True
+        result.is_abnormal = True
+        ANOMALIES[anomaly.type].inc()
+        anomalies = result.abnormal_fields.get(field_name)
 
-        if field_name in dto.abnormal_fields:
-            dto.abnormal_fields[field_name].append(reason)
+        if anomalies is None:
+            result.abnormal_fields[field_name] = [anomaly]
         else:
-            dto.abnormal_fields[field_name] = [reason]
+            anomalies.append(anomaly)
 
     def is_value_of_type(self, type: Type, value: Any) -> bool:
         try:
-            func: Callable[[Any], bool] = {
-                Type.Auth_Token: self.is_auth_token,
-                Type.Date: self.is_date,
-                Type.UUID: self.is_uuid,
-                Type.Email: self.is_email,
-                Type.List: self.is_list,
-                Type.Boolean: self.is_bool,
-                Type.Int: self.is_int,
-                Type.String: self.is_str,
-            }[type]
-
-            return func(value)
+            return self.type_checkers[type](value)
         except KeyError:
             logging.error(msg=f"Unexpected type {type}")
             return False
@@ -154,8 +252,7 @@ class RequestService:
         if not self.is_str(x):
             return False
 
-        pattern = r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$"
-        return bool(re.match(pattern, x))
+        return bool(EMAIL_PATTERN.match(x))
 
     def is_date(self, x: Any) -> bool:
         # Expected format is a date-string, formatted as "dd-mm-yyyy".
@@ -191,6 +288,9 @@ class RequestService:
         return x.startswith("Bearer ") if self.is_str(x) else False
 
     def is_uuid(self, x: Any) -> bool:
+        if not self.is_str(x):
+            return False
+
         try:
             uuid.UUID(x, version=4)
             return True
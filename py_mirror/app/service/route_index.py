@@ -0,0 +1,127 @@
+import re
+from typing import Callable
+
+from py_mirror.app.types import PATH_PARAMETER_PATTERN
+
+UUID_PATTERN = re.compile(
+    r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$"
+)
+
+# Parameter types, in the order of precedence. Static segments precede them all.
+SEGMENT_CHECKERS: dict[str, Callable[[str], bool]] = {
+    "int": lambda segment: segment.isascii() and segment.isdigit(),
+    "uuid": lambda segment: bool(UUID_PATTERN.match(segment)),
+    "str": lambda segment: segment != "",
+}
+SEGMENT_PRECEDENCE: dict[str, int] = {t: i for i, t in enumerate(SEGMENT_CHECKERS)}
+
+
+class RouteNode:
+    __slots__ = ("static", "params", "template")
+
+    def __init__(self) -> None:
+        self.static: dict[str, RouteNode] = {}
+        # Pairs of parameter type and child node, sorted by precedence.
+        self.params: list[tuple[str, RouteNode]] = []
+        # Model path, terminating at this node, e.g. "/users/{id:int}".
+        self.template: str | None = None
+
+
+class RouteIndex:
+    """
+    Per HTTP method trie of path segments, resolving concrete paths to model paths.
+    E.g. "/users/1" resolves to a model, saved as "/users/{id:int}".
+    Matching cost depends on the path length, rather than on the number of models.
+    """
+
+    _instance: "RouteIndex" = None  # type: ignore
+
+    def __new__(cls) -> "RouteIndex":
+        if not cls._instance:
+            cls._instance = super().__new__(cls)
+
+        return cls._instance
+
+    def __init__(self) -> None:
+        if hasattr(self, "roots"):
+            return
+
+        self.roots: dict[str, RouteNode] = {}
+        # Becomes true once built from PG, see the API lifespan.
+        self.ready = False
+        # Routes, added while the routes for "build" are being fetched.
+        self.pending: list[tuple[str, str]] | None = None
+
+    def begin_build(self) -> None:
+        self.pending = []
+
+    def cancel_build(self) -> None:
+        # Otherwise, the pending ones would pile up until the next build.
+        self.pending = None
+
+    def build(self, paths_methods: list[tuple[str, str]]) -> None:
+        roots: dict[str, RouteNode] = {}
+
+        for path, method in [*paths_methods, *(self.pending or [])]:
+            self.add(path, method, roots)
+
+        self.roots = roots
+        self.ready = True
+        self.pending = None
+
+    def add(
+        self, path: str, method: str, roots: dict[str, RouteNode] | None = None
+    ) -> None:
+        if roots is None:
+            roots = self.roots
+
+            if self.pending is not None:
+                self.pending.append((path, method))
+
+        node = roots.setdefault(method, RouteNode())
+
+        for segment in path.split("/"):
+            parameter = PATH_PARAMETER_PATTERN.match(segment)
+
+            if not parameter:
+                node = node.static.setdefault(segment, RouteNode())
+                continue
+
+            parameter_type = parameter.group(2) or "str"
+            child = next((n for t, n in node.params if t == parameter_type), None)
+
+            if child is None:
+                child = RouteNode()
+                node.params.append((parameter_type, child))
+                node.params.sort(key=lambda param: SEGMENT_PRECEDENCE[param[0]])
+
+            node = child
+
+        node.template = path
+
+    def match(self, path: str, method: str) -> str | None:
+        root = self.roots.get(method)
+        return self._match(root, path.split("/"), 0) if root else None
+
+    def _match(self, node: RouteNode, segments: list[str], i: int) -> str | None:
+        if i == len(segments):
+            return node.template
+
+        segment = segments[i]
+        child = node.static.get(segment)
+
+        if child is not None:
+            template = self._match(child, segments, i + 1)
+
+            if template is not None:
+                return template
+
+        # Backtrack to parameters, if the static branch didn't lead to a model.
+        for parameter_type, child in node.params:
+            if SEGMENT_CHECKERS[parameter_type](segment):
+                template = self._match(child, segments, i + 1)
+
+                if template is not None:
+                    return template
+
+        return None
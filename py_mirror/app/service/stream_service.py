@@ -0,0 +1,134 @@
+import os
+import asyncio
+import logging
+from typing import Any, AsyncIterator
+
+from dotenv import dotenv_values
+from pydantic import ValidationError
+
+from py_mirror.app.types import RequestDto, ResponseDto
+from py_mirror.app.service.model_service import ModelService
+from py_mirror.app.service.request_service import RequestService
+
+InFlightQueue = asyncio.Queue["asyncio.Future[ResponseDto] | None"]
+
+
+class StreamService:
+    """Validates NDJSON streams of RequestDto lines with flat memory usage."""
+
+    _instance: "StreamService" = None  # type: ignore
+
+    def __new__(cls) -> "StreamService":
+        if not cls._instance:
+            cls._instance = super().__new__(cls)
+
+        return cls._instance
+
+    def __init__(self) -> None:
+        if hasattr(self, "concurrency"):
+            return
+
+        env_vars: dict[str, str | Any] = {**dotenv_values(".env"), **os.environ}
+        # Maximum number of lines, being validated simultaneously per stream.
+        self.concurrency: int = int(str(env_vars.get("STREAM_CONCURRENCY", 64)))
+        self.max_line_size: int = int(
+            str(env_vars.get("STREAM_MAX_LINE_BYTES", 1_048_576))
+        )
+        self.request_service = RequestService()
+
+    async def validate_stream(
+        self, chunks: AsyncIterator[bytes]
+    ) -> AsyncIterator[bytes]:
+        # Bounded queue of in-flight validations, in the input order.
+        # Once it's full, the producer stops reading the request body (backpressure),
+        # until the consumer writes the oldest result to the response.
+        in_flight: InFlightQueue = asyncio.Queue(maxsize=self.concurrency)
+        producer = asyncio.create_task(self.produce(chunks, in_flight))
+
+        try:
+            while (future := await in_flight.get()) is not None:
+                response_dto = await future
+                yield response_dto.model_dump_json().encode() + b"\n"
+        finally:
+            # Either the stream is over, or the client has gone away.
+            producer.cancel()
+
+            while not in_flight.empty():
+                pending = in_flight.get_nowait()
+
+                if pending is not None:
+                    pending.cancel()
+
+    async def produce(
+        self, chunks: AsyncIterator[bytes], in_flight: InFlightQueue
+    ) -> None:
+        try:
+            async for line in self.split_lines(chunks):
+                if line.strip():
+                    await in_flight.put(asyncio.ensure_future(self.validate_line(line)))
+        except asyncio.CancelledError:
+            raise
+        except Exception as ex:
+            logging.error(msg=repr(ex))
+            aborted: asyncio.Future[ResponseDto] = asyncio.Future()
+            aborted.set_result(ResponseDto(data=None, error=f"Stream aborted: {ex}"))
+            await in_flight.put(aborted)
+
+        await in_flight.put(None)
+
+    async def split_lines(
+        self, chunks: AsyncIterator[bytes], max_line_size: int | None = None
+    ) -> AsyncIterator[bytes]:
+        max_line_size = max_line_size or self.max_line_size
+        # Start of the current line, which has no line break yet.
+        buffer = bytearray()
+
+        async for chunk in chunks:
+            # Only the new chunk is searched, rather than the whole buffer again.
+            start = 0
+
+            while (end := chunk.find(b"\n", start)) != -1:
+                if buffer:
+                    buffer += chunk[start:end]
+                    yield bytes(buffer)
+                    buffer.clear()
+                else:
+                    yield chunk[start:end]
+
+                start = end + 1
+
+            buffer += chunk[start:]
+
+            if len(buffer) > max_line_size:
+                raise ValueError(f"Line exceeds {max_line_size} bytes")
+
+        if buffer:
+            yield bytes(buffer)
+
+    async def validate_line(self, line: bytes) -> ResponseDto:
+        try:
+            request_dto = RequestDto.model_validate_json(line)
+        except ValidationError as ex:
+            return ResponseDto(
+                data=None,
+                error=ex.errors(
+                    include_url=False, include_context=False, include_input=False
+                ),
+            )
+
+        try:
+            model_dto = await ModelService().get_model(
+                request_dto.path, request_dto.method
+            )
+
+            if not model_dto:
+                msg = f"Model not found for path:method '{request_dto.path}:{request_dto.method.value}'"
+                return ResponseDto(data=None, error=msg)
+
+            validation_response = self.request_service.validate_request(
+                request_dto, model_dto
+            )
+            return ResponseDto(data=validation_response.to_dto(), error=None)
+        except Exception as ex:
+            logging.error(msg=repr(ex))
+            return ResponseDto(data=None, error="Validation error occurred")
@@ -0,0 +1,90 @@
+from typing import Any, Callable, NamedTuple
+
+from py_mirror.app.types import ModelDto, Type, AbnormalityType
+from py_mirror.app.runtime_types import Anomaly
+
+TypeChecker = Callable[[Any], bool]
+
+# Same order as "RequestModelDtoBase.keys()".
+GROUP_NAMES: tuple[str, ...] = ("query_params", "body", "headers")
+
+
+class FieldPlan(NamedTuple):
+    name: str
+    # Avoid possible override of fields with the same name,
+    # but from different groups ('query_params', 'headers' and 'body').
+    group_and_field: str
+    required: bool
+    # Stable, model-wide "1 << index" of the field.
+    # Seen fields are tracked per request as a bitmask, without mutating the model.
+    bit: int
+    # Pre-resolved checkers of the allowed types, evaluated in the declared order.
+    checkers: tuple[TypeChecker, ...]
+    # The allowed types themselves, for the column checkers of batches.
+    types: tuple[Type, ...]
+    # Anomalies are immutable, hence shared by all the requests.
+    type_missmatch: Anomaly
+    required_field_missing: Anomaly
+
+
+class GroupPlan(NamedTuple):
+    name: str
+    # Field name to its plan, "O(1)" lookup per incoming validation unit.
+    fields: dict[str, FieldPlan]
+
+
+class ValidationPlan(NamedTuple):
+    """Compiled form of a ModelDto, consumed by RequestService.validate_request."""
+
+    groups: tuple[GroupPlan, ...]
+    # All the fields of the model, positioned by their bit index.
+    fields_by_index: tuple[FieldPlan, ...]
+    # Bits of the required fields.
+    required_mask: int
+
+
+def compile_validation_plan(
+    model_dto: ModelDto, type_checkers: dict[Type, TypeChecker]
+) -> ValidationPlan:
+    groups = []
+    fields_by_index: list[FieldPlan] = []
+    required_mask = 0
+
+    for group_name in GROUP_NAMES:
+        fields: dict[str, FieldPlan] = {}
+
+        for template in getattr(model_dto, group_name):
+            # The last one of duplicate templates wins, and takes over the bit.
+            duplicate = fields.get(template.name)
+            bit = duplicate.bit if duplicate else 1 << len(fields_by_index)
+            allowed_types_str = ",".join(type.value for type in template.types)
+            field = FieldPlan(
+                name=template.name,
+                group_and_field=f"{group_name}:{template.name}",
+                required=template.required,
+                bit=bit,
+                checkers=tuple(type_checkers[type] for type in template.types),
+                types=tuple(template.types),
+                type_missmatch=Anomaly(
+                    AbnormalityType.TYPE_MISSMATCH,
+                    f"Field {template.name} must be of type[s] {allowed_types_str}",
+                ),
+                required_field_missing=Anomaly(
+                    AbnormalityType.REQUIRED_FIELD_MISSING,
+                    f"Required field {template.name} is missing",
+                ),
+            )
+            fields[template.name] = field
+
+            if duplicate:
+                fields_by_index[bit.bit_length() - 1] = field
+            else:
+                fields_by_index.append(field)
+
+        groups.append(GroupPlan(group_name, fields))
+
+    for field in fields_by_index:
+        if field.required:
+            required_mask |= field.bit
+
+    return ValidationPlan(tuple(groups), tuple(fields_by_index), required_mask)
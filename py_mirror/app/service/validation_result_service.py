@@ -0,0 +1,254 @@
+import os
+import asyncio
+import logging
+import datetime
+from typing import Any, NamedTuple
+
+import orjson
+from dotenv import dotenv_values
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
+
+from py_mirror.app.types import ModelDto, RequestDto, HttpMethod
+from py_mirror.app.runtime_types import ValidationResult
+from py_mirror.app.metrics import (
+    VALIDATION_RESULTS_WRITTEN,
+    VALIDATION_RESULTS_DROPPED,
+    VALIDATION_RESULTS_FAILED,
+)
+from py_mirror.app.storage.pg.models import validation_results_table
+from py_mirror.app.storage.pg.data_source import DataSource as PgDataSource
+
+# Columns of the "validation_results" table, in the order of the COPY-ed records.
+VALIDATION_RESULT_COLUMNS: tuple[str, ...] = (
+    "created_at",
+    "path",
+    "method",
+    "model_path",
+    "model_version",
+    "is_abnormal",
+    "abnormal_fields",
+)
+
+
+class ValidationRecord(NamedTuple):
+    created_at: datetime.datetime
+    path: str
+    method: str
+    model_path: str
+    model_version: int
+    # Serialized by the writer, rather than by the request.
+    validation_result: ValidationResult
+
+
+class ValidationResultService:
+    """
+    Write-behind persistence of the "POST /api/request" validation results.
+    Results are buffered by a bounded in-process queue, and written to PG using COPY,
+    in batches of up to VALIDATION_RESULTS_BATCH_SIZE,
+    at least once per VALIDATION_RESULTS_FLUSH_INTERVAL_SECONDS.
+    Runs for the lifetime of the worker, see the API lifespan.
+    """
+
+    _instance: "ValidationResultService" = None  # type: ignore
+
+    def __new__(cls) -> "ValidationResultService":
+        if not cls._instance:
+            cls._instance = super().__new__(cls)
+
+        return cls._instance
+
+    def __init__(self) -> None:
+        if hasattr(self, "enabled"):
+            return
+
+        env_vars: dict[str, str | Any] = {**dotenv_values(".env"), **os.environ}
+        self.enabled: bool = (
+            str(env_vars.get("VALIDATION_RESULTS_ENABLED", "false")) == "true"
+        )
+        # Upper bound of the buffered results, hence of the memory they take.
+        self.queue_size: int = int(
+            str(env_vars.get("VALIDATION_RESULTS_QUEUE_SIZE", 100_000))
+        )
+        self.batch_size: int = int(
+            str(env_vars.get("VALIDATION_RESULTS_BATCH_SIZE", 5000))
+        )
+        self.flush_interval: float = float(
+            str(env_vars.get("VALIDATION_RESULTS_FLUSH_INTERVAL_SECONDS", 1))
+        )
+        # Once the queue is full, results are either dropped right away ("drop"),
+        # or the request waits for room, up to the block timeout, then drops ("block").
+        self.overflow: str = str(env_vars.get("VALIDATION_RESULTS_OVERFLOW", "drop"))
+        self.block_timeout: float = (
+            float(str(env_vars.get("VALIDATION_RESULTS_BLOCK_TIMEOUT_MS", 100))) / 1000
+        )
+        self.pg_session: async_sessionmaker[AsyncSession] = PgDataSource().async_session
+        # Created by "run", since it's bound to the event loop.
+        # Nothing is recorded until then, e.g. when disabled.
+        self._queue: asyncio.Queue[ValidationRecord] | None = None
+        # Taken off the queue, but not written yet.
+        self._batch: list[ValidationRecord] = []
+        # Days, which partitions are known to exist.
+        self._partitions: set[datetime.date] = set()
+
+    async def record(
+        self,
+        request_dto: RequestDto,
+        model_dto: ModelDto,
+        validation_result: ValidationResult,
+    ) -> None:
+        if self._queue is None:
+            return
+
+        record = ValidationRecord(
+            datetime.datetime.now(datetime.timezone.utc),
+            request_dto.path,
+            HttpMethod(model_dto.method).value,
+            model_dto.path,
+            model_dto.version,
+            validation_result,
+        )
+
+        try:
+            self._queue.put_nowait(record)
+            return
+        except asyncio.QueueFull:
+            if self.overflow != "block":
+                VALIDATION_RESULTS_DROPPED.inc()
+                return
+
+        try:
+            # Backpressure, the request is slowed down to the pace of the writer.
+            await asyncio.wait_for(self._queue.put(record), self.block_timeout)
+        except asyncio.TimeoutError:
+            VALIDATION_RESULTS_DROPPED.inc()
+
+    def queue_length(self) -> int:
+        return self._queue.qsize() if self._queue else 0
+
+    async def run(self) -> None:
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+
+        while True:
+            try:
+                await self.collect_batch()
+                await self.write_batch()
+            except asyncio.CancelledError:
+                raise
+            except Exception as ex:
+                logging.error(msg=repr(ex))
+
+    async def collect_batch(self) -> None:
+        """Waits for a batch, which is either full, or is due."""
+        queue: asyncio.Queue[ValidationRecord] = self._queue  # type: ignore
+
+        if not self._batch:
+            self._batch.append(await queue.get())
+
+        deadline = asyncio.get_running_loop().time() + self.flush_interval
+
+        while len(self._batch) < self.batch_size:
+            if not queue.empty():
+                self._batch.append(queue.get_nowait())
+                continue
+
+            timeout = deadline - asyncio.get_running_loop().time()
+
+            if timeout <= 0:
+                break
+
+            try:
+                self._batch.append(await asyncio.wait_for(queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+    async def write_batch(self) -> None:
+        records, self._batch = self._batch, []
+
+        try:
+            await self.write_results_pg(records)
+            VALIDATION_RESULTS_WRITTEN.inc(len(records))
+        except asyncio.CancelledError:
+            # Written upon shutdown, see "flush".
+            self._batch = records + self._batch
+            raise
+        except Exception as ex:
+            # Not retried, so a PG outage doesn't turn into unbounded memory usage.
+            logging.error(msg=repr(ex))
+            VALIDATION_RESULTS_FAILED.inc(len(records))
+
+    async def flush(self) -> None:
+        """Writes the buffered results, once "run" is cancelled, upon shutdown."""
+        queue = self._queue
+
+        if queue is None:
+            return
+
+        # No more results are recorded.
+        self._queue = None
+        records = self._batch
+
+        while not queue.empty():
+            records.append(queue.get_nowait())
+
+        for i in range(0, len(records), self.batch_size):
+            self._batch = records[i : i + self.batch_size]
+            await self.write_batch()
+
+    async def write_results_pg(self, records: list[ValidationRecord]) -> None:
+        table = validation_results_table
+
+        days = {record.created_at.date() for record in records}
+
+        try:
+            async with self.pg_session() as async_session:
+                await self.create_partitions_pg(async_session, days - self._partitions)
+                connection = await async_session.connection()
+                raw_connection = await connection.get_raw_connection()
+                # COPY is only available via the asyncpg connection itself.
+                # Rows are routed to the partitions by PG.
+                await raw_connection.driver_connection.copy_records_to_table(  # type: ignore
+                    table.name,
+                    schema_name=table.schema,
+                    columns=VALIDATION_RESULT_COLUMNS,
+                    records=[self.get_record_pg(record) for record in records],
+                )
+                await async_session.commit()
+
+            # The partitions exist once committed, along with the results.
+            self._partitions |= days
+        except Exception as ex:
+            logging.error(msg=repr(ex))
+            raise
+
+    async def create_partitions_pg(
+        self, async_session: AsyncSession, days: set[datetime.date]
+    ) -> None:
+        """Daily partitions, in UTC."""
+        table = validation_results_table.fullname
+
+        for day in sorted(days):
+            partition = f"{table}_{day:%Y%m%d}"
+            next_day = day + datetime.timedelta(days=1)
+            # Workers may create the same partition simultaneously.
+            await async_session.execute(
+                text(f"SELECT pg_advisory_xact_lock(hashtext('{table}'));")
+            )
+            await async_session.execute(
+                text(
+                    f"CREATE TABLE IF NOT EXISTS {partition} PARTITION OF {table} "
+                    f"FOR VALUES FROM ('{day} 00:00+00') TO ('{next_day} 00:00+00');"
+                )
+            )
+
+    def get_record_pg(self, record: ValidationRecord) -> tuple[Any, ...]:
+        validation_result = record.validation_result
+        return (
+            record.created_at,
+            record.path,
+            record.method,
+            record.model_path,
+            record.model_version,
+            validation_result.is_abnormal,
+            orjson.dumps(validation_result.to_dict()["abnormal_fields"]).decode(),
+        )
@@ -0,0 +1,93 @@
+import os
+import time
+import asyncio
+import logging
+from typing import Any
+
+from dotenv import dotenv_values
+
+from py_mirror.app.service.model_service import ModelService
+
+
+class WarmupService:
+    """
+    Fills Redis, and the in-process cache, with models from PG upon startup,
+    so the first requests after a Redis restart or flush don't hit PG one by one.
+    """
+
+    _instance: "WarmupService" = None  # type: ignore
+
+    def __new__(cls) -> "WarmupService":
+        if not cls._instance:
+            cls._instance = super().__new__(cls)
+
+        return cls._instance
+
+    def __init__(self) -> None:
+        if hasattr(self, "enabled"):
+            return
+
+        env_vars: dict[str, str | Any] = {**dotenv_values(".env"), **os.environ}
+        self.enabled: bool = (
+            str(env_vars.get("MODEL_WARMUP_ENABLED", "false")) == "true"
+        )
+        # Number of the most recently used models to warm up, 0 means all the models.
+        self.limit: int = int(str(env_vars.get("MODEL_WARMUP_LIMIT", 0)))
+        self.batch_size: int = int(str(env_vars.get("MODEL_WARMUP_BATCH_SIZE", 1000)))
+        # Delay between the attempts, e.g. while PG is unavailable upon startup.
+        self.retry_interval: float = float(
+            str(env_vars.get("MODEL_WARMUP_RETRY_INTERVAL_SECONDS", 5))
+        )
+        # Readiness is reported once the warm-up is done, see the readiness endpoint.
+        self.done = not self.enabled
+        # Failure of the last attempt, reported by the readiness endpoint until done.
+        self.error: str | None = None
+
+    async def warm_up(self) -> None:
+        # Retried until done, rather than reporting readiness with nothing warmed up.
+        while not await self.try_warm_up():
+            await asyncio.sleep(self.retry_interval)
+
+        self.error = None
+        self.done = True
+
+    async def try_warm_up(self) -> bool:
+        """Returns whether the attempt succeeded."""
+        model_service = ModelService()
+        started_at = time.perf_counter()
+        count = 0
+
+        try:
+            paths_methods = (
+                await model_service.get_models_last_used_redis(self.limit)
+                if self.limit
+                else None
+            )
+            # Recency is unknown, e.g. after a Redis flush, hence the newest models are taken.
+            limit = self.limit if self.limit and not paths_methods else None
+
+            async for model_dtos in model_service.stream_models_pg(
+                self.batch_size, paths_methods or None, limit
+            ):
+                generation = model_service.model_cache.generation
+                await model_service.set_missing_models_redis(model_dtos)
+
+                for model_dto in model_dtos:
+                    model_service.model_cache.put(
+                        model_service.get_key(model_dto.path, model_dto.method),
+                        model_dto,
+                        generation,
+                    )
+
+                count += len(model_dtos)
+
+            logging.info(
+                msg=f"Warmed up {count} models in {time.perf_counter() - started_at:.1f}s"
+            )
+        except Exception as ex:
+            # Meanwhile, models are loaded upon the first request.
+            logging.error(msg=repr(ex))
+            self.error = repr(ex)
+            return False
+
+        return True
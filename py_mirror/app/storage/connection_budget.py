@@ -0,0 +1,26 @@
+from typing import Any
+
+
+def get_worker_connections(
+    env_vars: dict[str, str | Any], budget_name: str
+) -> int | None:
+    """
+    Share of a global connection budget per API worker process, see HTTP_WORKERS.
+    Hence, the connections of all the workers together never exceed the budget.
+    None, unless the budget is set.
+    Raises ValueError, unless the budget allows a connection per worker, see "--run-api".
+    """
+    budget = int(str(env_vars.get(budget_name) or 0))
+
+    if not budget:
+        return None
+
+    workers = max(1, int(str(env_vars.get("HTTP_WORKERS") or 1)))
+
+    if budget < workers:
+        raise ValueError(
+            f"{budget_name}={budget} is less than HTTP_WORKERS={workers}, "
+            "each worker needs at least a single connection"
+        )
+
+    return budget // workers
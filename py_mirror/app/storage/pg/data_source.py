@@ -1,10 +1,12 @@
 import os
-from typing import Any
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
 
 from dotenv import dotenv_values
 from sqlalchemy import MetaData, text
 from sqlalchemy.orm import declarative_base
-from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlalchemy.ext.asyncio import (
     create_async_engine,
     async_sessionmaker,
@@ -12,6 +14,20 @@ from sqlalchemy.ext.asyncio import (
     AsyncSession,
 )
 
+from py_mirror.app.storage.connection_budget import get_worker_connections
+
+
+class LoopBoundSessionmaker(async_sessionmaker[AsyncSession]):
+    """Sessions are bound to the engine of the running event loop, see DataSource."""
+
+    def __init__(self, data_source: "DataSource", **kw: Any) -> None:
+        super().__init__(**kw)
+        self.data_source = data_source
+
+    def __call__(self, **local_kw: Any) -> AsyncSession:
+        local_kw.setdefault("bind", self.data_source.async_engine)
+        return super().__call__(**local_kw)
+
 
 class DataSource:
     _instance: "DataSource" = None  # type: ignore
@@ -35,27 +51,69 @@ class DataSource:
             else self.declarative_base
         )
 
-        self.async_engine: AsyncEngine = (
-            self._get_async_engine()
-            if not hasattr(self, "async_engine")
-            else self.async_engine
+        # Pooled connections are bound to the event loop, they were opened by.
+        # Hence, an engine per event loop, e.g. per test of PyTest.
+        # A single one in production, since each worker runs a single event loop.
+        self._async_engines: dict[asyncio.AbstractEventLoop | None, AsyncEngine] = (
+            {} if not hasattr(self, "_async_engines") else self._async_engines
         )
 
         self.async_session: async_sessionmaker[AsyncSession] = (
             # !!!Note,
             # Any initialization of the "async sessionmaker" leads to running "BEGIN (implicit)" each time.
-            async_sessionmaker(self.async_engine, expire_on_commit=False)
-            if not hasattr(self, "async_session_local")
+            LoopBoundSessionmaker(self, expire_on_commit=False)
+            if not hasattr(self, "async_session")
             else self.async_session
         )
 
+    @property
+    def async_engine(self) -> AsyncEngine:
+        """Engine of the running event loop, created upon first use."""
+        try:
+            loop: asyncio.AbstractEventLoop | None = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        async_engine = self._async_engines.get(loop)
+
+        if async_engine is None:
+            self._discard_closed_loops_engines()
+            async_engine = self._async_engines[loop] = self._get_async_engine()
+
+        return async_engine
+
+    @asynccontextmanager
+    async def driver_connection(self) -> AsyncIterator[Any]:
+        """
+        Pooled asyncpg connection itself, for the hot paths, which need neither the ORM,
+        nor a transaction. Statements are prepared once per connection,
+        see the statement cache of asyncpg.
+        """
+        async with self.async_engine.connect() as connection:
+            raw_connection = await connection.get_raw_connection()
+            yield raw_connection.driver_connection
+
+    async def dispose(self) -> None:
+        """Closes the pooled connections of the running event loop, e.g. upon shutdown."""
+        async_engine = self._async_engines.pop(asyncio.get_running_loop(), None)
+
+        if async_engine is not None:
+            await async_engine.dispose()
+
+    def _discard_closed_loops_engines(self) -> None:
+        for loop, async_engine in list(self._async_engines.items()):
+            if loop is not None and loop.is_closed():
+                # Connections can't be closed gracefully without their event loop.
+                # Hence, they are dereferenced, rather than closed.
+                async_engine.sync_engine.dispose(close=False)
+                del self._async_engines[loop]
+
     def _get_declarative_base(self) -> Any:
         schema = self._env_vars.get("POSTGRES_SCHEMA")
         metadata = MetaData(schema=schema)
         return declarative_base(metadata=metadata)
 
     def _get_async_engine(self) -> AsyncEngine:
-        env = self._env_vars.get("ENV")
         user = self._env_vars.get("POSTGRES_USERNAME")
         password = self._env_vars.get("POSTGRES_PASSWORD")
         dbname = self._env_vars.get("POSTGRES_DATABASE_NAME")
@@ -65,17 +123,20 @@ class DataSource:
         max_overflow = int(str(self._env_vars.get("SQLALCHEMY_MAX_OVERFLOW")))
         pool_timeout = int(str(self._env_vars.get("SQLALCHEMY_POOL_TIMEOUT")))
         pool_recycle = int(str(self._env_vars.get("SQLALCHEMY_POOL_RECYCLE")))
-        pg_url = f"postgresql+asyncpg://{user}:{password}@/{dbname}?host={host}:{port}"
+        echo = str(self._env_vars.get("SQLALCHEMY_ECHO", "false"))
+        worker_connections = get_worker_connections(
+            self._env_vars, "POSTGRES_CONNECTION_BUDGET"
+        )
 
-        if env == "DEV" or env == "TEST":
-            # Encountered issues upon running AsyncAdaptedQueuePool with PyTest.
-            #
-            # From SQLAlchemy docs:
-            # If the same engine must be shared between different loop,
-            # it should be configured to disable pooling using NullPool,
-            # preventing the Engine from using any connection more than once.
-            return create_async_engine(pg_url, poolclass=NullPool, echo=True)
+        if worker_connections:
+            # Both the pool and its overflow are bounded by the share of this worker.
+            # The overflow is never raised beyond SQLALCHEMY_MAX_OVERFLOW though.
+            pool_size = min(pool_size, worker_connections)
+            max_overflow = min(max_overflow, max(0, worker_connections - pool_size))
+
+        pg_url = f"postgresql+asyncpg://{user}:{password}@/{dbname}?host={host}:{port}"
 
+        # Pooled in any environment, since engines aren't shared between event loops.
         return create_async_engine(
             pg_url,
             poolclass=AsyncAdaptedQueuePool,
@@ -89,7 +150,7 @@ class DataSource:
             # Recycle connections after 1 hour.
             pool_recycle=pool_recycle,
             # Enable SQL logging (for debugging purposes).
-            echo=(env == "DEV"),
+            echo=(echo == "true"),
         )
 
     async def ping(self) -> str:
@@ -104,3 +165,18 @@ class DataSource:
 
         async with self.async_engine.begin() as connection:
             await connection.run_sync(self.declarative_base.metadata.create_all)
+            # "create_all" never alters existing tables.
+            # Hence, columns, added later, are added explicitly.
+            schema = self._env_vars.get("POSTGRES_SCHEMA")
+            await connection.execute(
+                text(
+                    f"ALTER TABLE {schema}.models "
+                    f"ADD COLUMN IF NOT EXISTS version BIGINT NOT NULL DEFAULT 1;"
+                )
+            )
+            await connection.execute(
+                text(
+                    f"ALTER TABLE {schema}.models_outbox "
+                    f"ADD COLUMN IF NOT EXISTS groups JSONB;"
+                )
+            )
@@ -1,9 +1,12 @@
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy import (
+    Table,
     Column,
     Index,
     Identity,
     BigInteger,
+    Boolean,
+    DateTime,
     String,
     Enum as PgEnum,
 )
@@ -28,5 +31,40 @@ class ModelEntity(Base):  # type: ignore
     query_params = Column(JSONB, nullable=False)
     groups_to_names_units_map = Column(JSONB, nullable=False)
     groups_to_required_fields_map = Column(JSONB, nullable=False)
+    # Incremented upon each save, see ModelService.upsert_model_pg.
+    version = Column(BigInteger, nullable=False, server_default="1")
 
     __table_args__ = (Index("idx_models_path_method", "path", "method", unique=True),)
+
+
+class OutboxEntity(Base):  # type: ignore
+    """Saved models, which are yet to be propagated to Redis, see OutboxService."""
+
+    __tablename__ = "models_outbox"
+
+    id = Column(BigInteger, Identity(start=1), primary_key=True, nullable=False)
+    path = Column(String(255), nullable=False)
+    method = Column(PgEnum(HttpMethod), nullable=False)  # type: ignore
+    version = Column(BigInteger, nullable=False)
+    # Groups, changed by a patch, see ModelService.patch_model_pg. NULL means all of them.
+    groups = Column(JSONB, nullable=True)
+
+
+# Append-only, written by ValidationResultService using COPY.
+# Partitioned by day, hence old results are removed by dropping whole partitions.
+# Partitions are created upon writing, see ValidationResultService.create_partitions_pg.
+validation_results_table = Table(
+    "validation_results",
+    Base.metadata,
+    Column("created_at", DateTime(timezone=True), nullable=False),
+    # Concrete path of the request, e.g. "/users/1".
+    Column("path", String(255), nullable=False),
+    Column("method", PgEnum(HttpMethod), nullable=False),
+    # Path and version of the model, the request was validated against.
+    Column("model_path", String(255), nullable=False),
+    Column("model_version", BigInteger, nullable=False),
+    Column("is_abnormal", Boolean, nullable=False),
+    Column("abnormal_fields", JSONB, nullable=False),
+    Index("idx_validation_results_path_method", "path", "method"),
+    postgresql_partition_by="RANGE (created_at)",
+)
@@ -4,6 +4,8 @@ from typing import Any
 from dotenv import dotenv_values
 import redis.asyncio as redis
 
+from py_mirror.app.storage.connection_budget import get_worker_connections
+
 
 class DataSource:
     _instance: "DataSource" = None  # type: ignore
@@ -29,14 +31,16 @@ class DataSource:
         host = self._env_vars.get("REDIS_HOST")
         port = self._env_vars.get("REDIS_PORT")
         db = self._env_vars.get("REDIS_DB")
-        pool_size = int(str(self._env_vars.get("REDIS_POOL_SIZE")))
+        pool_size = get_worker_connections(
+            self._env_vars, "REDIS_CONNECTION_BUDGET"
+        ) or int(str(self._env_vars.get("REDIS_POOL_SIZE")))
         redis_url = f"redis://{host}:{port}/{db}"
 
         pool = redis.ConnectionPool.from_url(
             redis_url,
             max_connections=pool_size,
-            encoding="utf-8",
-            decode_responses=True,
+            # Models are stored in a binary form, see ModelSerializer.
+            decode_responses=False,
         )
 
         return redis.Redis.from_pool(pool)
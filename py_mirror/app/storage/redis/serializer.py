@@ -0,0 +1,224 @@
+import os
+import json
+from typing import Any, Callable, Collection, NamedTuple
+
+import orjson
+import msgpack  # type: ignore
+import zstandard
+from dotenv import dotenv_values
+
+from py_mirror.app.types import ModelDto, ValidationUnitTemplateDto, Type, HttpMethod
+
+# Layout of a serialized model:
+# | magic (2 bytes) | schema version (1 byte) | flags (1 byte) | payload |
+# Flags: low nibble is a codec id, FLAG_ZSTD marks zstd compressed payload.
+# Values without the magic prefix are legacy JSON strings, written by "model_dump_json".
+# Schema version 2 appends the model version to the payload, version 1 lacks it.
+MAGIC = b"\xa7M"
+SCHEMA_VERSION = 2
+SUPPORTED_SCHEMA_VERSIONS = (1, 2)
+HEADER_SIZE = 4
+FLAG_ZSTD = 0x10
+CODEC_MASK = 0x0F
+GROUPS: tuple[str, ...] = ("query_params", "headers", "body")
+# Fields of a model, stored as a Redis hash, see ModelSerializer.encode_fields.
+# Each value has the layout of a serialized model, with its own payload.
+META_FIELD = "meta"
+REQUIRED_FIELD = "required"
+HASH_FIELDS: tuple[str, ...] = (META_FIELD, REQUIRED_FIELD, *GROUPS)
+
+TYPES_BY_VALUE: dict[str, Type] = {type.value: type for type in Type}
+TEMPLATE_FIELDS = set(ValidationUnitTemplateDto.model_fields)
+METHODS_BY_VALUE: dict[str, HttpMethod] = {
+    method.value: method for method in HttpMethod
+}
+
+
+class Codec(NamedTuple):
+    id: int
+    name: str
+    encode: Callable[[Any], bytes]
+    decode: Callable[[bytes], Any]
+
+
+CODECS: dict[str, Codec] = {
+    "json": Codec(1, "json", lambda x: json.dumps(x).encode(), json.loads),
+    "orjson": Codec(2, "orjson", orjson.dumps, orjson.loads),
+    "msgpack": Codec(
+        3,
+        "msgpack",
+        lambda x: msgpack.packb(x, use_bin_type=True),
+        lambda x: msgpack.unpackb(x, raw=False),
+    ),
+}
+CODECS_BY_ID: dict[int, Codec] = {codec.id: codec for codec in CODECS.values()}
+
+
+class ModelSerializer:
+    """Serializes models, stored in Redis, into a compact versioned binary form."""
+
+    _instance: "ModelSerializer" = None  # type: ignore
+
+    def __new__(cls) -> "ModelSerializer":
+        if not cls._instance:
+            cls._instance = super().__new__(cls)
+
+        return cls._instance
+
+    def __init__(self) -> None:
+        if hasattr(self, "codec"):
+            return
+
+        env_vars: dict[str, str | Any] = {**dotenv_values(".env"), **os.environ}
+        self.codec: Codec = CODECS[str(env_vars.get("REDIS_MODEL_CODEC", "msgpack"))]
+        # Payloads larger than the threshold are compressed, 0 disables compression.
+        self.zstd_threshold: int = int(
+            str(env_vars.get("REDIS_MODEL_ZSTD_THRESHOLD", 4096))
+        )
+        # Either "string", a single value per model, or "hash", a field per group.
+        self.layout: str = str(env_vars.get("REDIS_MODEL_LAYOUT", "string"))
+        self._compressor = zstandard.ZstdCompressor(level=3)
+        self._decompressor = zstandard.ZstdDecompressor()
+
+    def encode(self, model_dto: ModelDto) -> bytes:
+        # Only the groups are stored, the derived maps are never read past saving.
+        # Templates are stored as arrays, so field names aren't repeated per template.
+        return self.encode_value(
+            [
+                model_dto.path,
+                model_dto.method.value,
+                [self.encode_templates(getattr(model_dto, group)) for group in GROUPS],
+                model_dto.version,
+            ]
+        )
+
+    def decode(self, serialized_model: bytes | str) -> ModelDto:
+        if isinstance(serialized_model, str) or not serialized_model.startswith(MAGIC):
+            # Written prior the binary layout was introduced.
+            return ModelDto.model_validate_json(serialized_model)
+
+        path, method, groups, *version = self.decode_value(serialized_model)
+        query_params, headers, body = (self.decode_templates(g) for g in groups)
+
+        # The data is trusted - it was validated prior being saved.
+        # Hence, pydantic validation is skipped.
+        return ModelDto.model_construct(
+            path=path,
+            method=METHODS_BY_VALUE[method],
+            query_params=query_params,
+            headers=headers,
+            body=body,
+            version=version[0] if version else 0,
+        )
+
+    def encode_fields(
+        self, model_dto: ModelDto, groups: Collection[str] = GROUPS
+    ) -> dict[str, bytes]:
+        """
+        Fields of the Redis hash of the model, see HASH_FIELDS.
+        Hence, the groups can be fetched, and decoded, one by one.
+        Names of the required fields are stored apart, so the missing ones are reported
+        even if their groups aren't fetched.
+        Only the given groups are encoded, e.g. the ones changed by a patch.
+        """
+        templates = [getattr(model_dto, group) for group in GROUPS]
+        return {
+            META_FIELD: self.encode_value(
+                [model_dto.path, model_dto.method.value, model_dto.version]
+            ),
+            REQUIRED_FIELD: self.encode_value(
+                [[t.name for t in group if t.required] for group in templates]
+            ),
+            **{
+                group: self.encode_value(self.encode_templates(group_templates))
+                for group, group_templates in zip(GROUPS, templates)
+                if group in groups
+            },
+        }
+
+    def decode_fields(self, fields: dict[str, bytes | None]) -> ModelDto:
+        """
+        Groups, which weren't fetched, consist of their required fields only,
+        without any types. Hence, such a model is only good for requests
+        lacking those groups, and mustn't be cached.
+        """
+        path, method, version = self.decode_value(fields[META_FIELD])  # type: ignore
+        required_names: list[list[str]] | None = None
+        groups: dict[str, list[ValidationUnitTemplateDto]] = {}
+
+        for i, group in enumerate(GROUPS):
+            value = fields.get(group)
+
+            if value is not None:
+                groups[group] = self.decode_templates(self.decode_value(value))
+                continue
+
+            if required_names is None:
+                required_names = self.decode_value(fields[REQUIRED_FIELD])  # type: ignore
+
+            groups[group] = [
+                construct_template(name, True, []) for name in required_names[i]
+            ]
+
+        return ModelDto.model_construct(
+            path=path,
+            method=METHODS_BY_VALUE[method],
+            query_params=groups["query_params"],
+            headers=groups["headers"],
+            body=groups["body"],
+            version=version,
+        )
+
+    def encode_value(self, value: Any) -> bytes:
+        payload = self.codec.encode(value)
+        flags = self.codec.id
+
+        if 0 < self.zstd_threshold < len(payload):
+            payload = self._compressor.compress(payload)
+            flags |= FLAG_ZSTD
+
+        return MAGIC + bytes((SCHEMA_VERSION, flags)) + payload
+
+    def decode_value(self, serialized_value: bytes) -> Any:
+        schema_version, flags = serialized_value[2], serialized_value[3]
+
+        if schema_version not in SUPPORTED_SCHEMA_VERSIONS:
+            raise ValueError(f"Unsupported model schema version {schema_version}")
+
+        payload = serialized_value[HEADER_SIZE:]
+
+        if flags & FLAG_ZSTD:
+            payload = self._decompressor.decompress(payload)
+
+        return CODECS_BY_ID[flags & CODEC_MASK].decode(payload)
+
+    def encode_templates(
+        self, templates: list[ValidationUnitTemplateDto]
+    ) -> list[list[Any]]:
+        return [
+            [template.name, template.required, [type.value for type in template.types]]
+            for template in templates
+        ]
+
+    def decode_templates(
+        self, templates: list[list[Any]]
+    ) -> list[ValidationUnitTemplateDto]:
+        return [
+            construct_template(name, required, [TYPES_BY_VALUE[t] for t in types])
+            for name, required, types in templates
+        ]
+
+
+def construct_template(
+    name: str, required: bool, types: list[Type]
+) -> ValidationUnitTemplateDto:
+    # Equivalent of "ValidationUnitTemplateDto.model_construct", about 3 times faster.
+    # Matters for models with thousands of fields.
+    template = object.__new__(ValidationUnitTemplateDto)
+    object.__setattr__(
+        template, "__dict__", {"name": name, "required": required, "types": types}
+    )
+    object.__setattr__(template, "__pydantic_fields_set__", TEMPLATE_FIELDS)
+    object.__setattr__(template, "__pydantic_extra__", None)
+    object.__setattr__(template, "__pydantic_private__", None)
+    return template
@@ -1,7 +1,8 @@
+import re
 from enum import Enum
-from typing import Final, Any
+from typing import Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr, field_validator, model_validator
 
 
 class AbnormalityType(str, Enum):
@@ -73,6 +74,98 @@ class ReadinessResponseDto(BaseModel):
     error: Any | None
 
 
+class ModelCacheStatsDto(BaseModel):
+    size: int
+    max_size: int
+    ttl: float
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    invalidations: int
+    negative_size: int
+    negative_hits: int
+    in_flight: int
+    coalesced: int
+    stale_hits: int
+    fill_lock_waits: int
+
+
+class ModelVersionDto(BaseModel):
+    path: str
+    method: HttpMethod
+    version: int
+
+
+class ModelGroup(str, Enum):
+    QUERY_PARAMS = "query_params"
+    HEADERS = "headers"
+    BODY = "body"
+
+
+class ModelPatchOp(str, Enum):
+    ADD = "add"
+    UPDATE = "update"
+    REMOVE = "remove"
+
+
+class ModelPatchOperationDto(BaseModel):
+    op: ModelPatchOp
+    group: ModelGroup
+    # The template to add or update.
+    template: ValidationUnitTemplateDto | None = None
+    # The field to remove.
+    name: str | None = Field(default=None, min_length=1, max_length=255)
+
+    @model_validator(mode="after")
+    def validate_operands(self) -> "ModelPatchOperationDto":
+        if self.op == ModelPatchOp.REMOVE and self.name is None:
+            raise ValueError("Field name is required to remove a field")
+
+        if self.op != ModelPatchOp.REMOVE and self.template is None:
+            raise ValueError(f"Template is required to {self.op.value} a field")
+
+        return self
+
+    @property
+    def field_name(self) -> str:
+        return self.template.name if self.template else str(self.name)
+
+
+class ModelPatchDto(BaseModel):
+    path: str = Field(min_length=1, max_length=255)
+    method: HttpMethod
+    # Applied in order, either all of them, or none.
+    operations: list[ModelPatchOperationDto] = Field(min_length=1)
+
+
+class ProfilingSettingsDto(BaseModel):
+    server_timing: bool = Field(description="Add the Server-Timing header")
+    sample_rate: int = Field(ge=0, description="Profile 1-in-N requests, 0 disables")
+
+
+class ImportFailureDto(BaseModel):
+    # 1-based number of the NDJSON line, or of the JSON array item.
+    row: int
+    error: Any
+
+
+class ImportProgressDto(BaseModel):
+    rows: int
+    imported: int
+    failed: int
+    # Failures since the previous progress report only, hence memory usage is bounded.
+    failures: list[ImportFailureDto]
+    done: bool
+
+
+# Path segment of a parameterized model, e.g. "{id:int}" in "/users/{id:int}".
+# Type is one of "int", "uuid" and "str", which is the default.
+PATH_PARAMETER_PATTERN = re.compile(
+    r"^\{([A-Za-z_][A-Za-z0-9_]*)(?::(int|uuid|str))?\}$"
+)
+
+
 class RequestModelDtoBase(BaseModel):
     path: str = Field(
         min_length=1,
@@ -80,12 +173,10 @@ class RequestModelDtoBase(BaseModel):
         description="Path, which is a subject for incoming requests validation",
     )
     method: HttpMethod = Field(description="HTTP method")
-    query_params: list[ValidationUnitTemplateDto]
-    headers: list[ValidationUnitTemplateDto]
-    body: list[ValidationUnitTemplateDto]
 
     def __getitem__(self, key: str) -> Any:
-        return self.model_dump()[key]
+        # Reads a single field, rather than dumping the whole model per access.
+        return getattr(self, key)
 
     def keys(self) -> list[str]:
         """Enable 'class as mapping' functionality."""
@@ -93,19 +184,47 @@ class RequestModelDtoBase(BaseModel):
 
 
 class RequestDto(RequestModelDtoBase):
-    pass
+    query_params: list[ValidationUnitDto]
+    headers: list[ValidationUnitDto]
+    body: list[ValidationUnitDto]
 
 
 class ModelDto(RequestModelDtoBase):
+    query_params: list[ValidationUnitTemplateDto]
+    headers: list[ValidationUnitTemplateDto]
+    body: list[ValidationUnitTemplateDto]
+    # Assigned by PG upon each save, the value of the consumer is ignored.
+    version: int = Field(default=0, description="Model version")
     # !!!Note, id is omitted on purpose.
+    # Both maps below are derived from the groups above.
+    # They are per instance, and excluded from serialization to avoid storing groups twice.
     # Each value is a mapping of param names with their corresponding validation templates.
-    groups_to_names_units_map: Final[
-        dict[str, dict[ValidationUnitTemplateName, ValidationUnitTemplateDto]]
-    ] = {"query_params": {}, "headers": {}, "body": {}}
+    groups_to_names_units_map: dict[
+        str, dict[ValidationUnitTemplateName, ValidationUnitTemplateDto]
+    ] = Field(
+        default_factory=lambda: {"query_params": {}, "headers": {}, "body": {}},
+        exclude=True,
+    )
     # Each value is a mapping of param names,
     # with their corresponding mapping of required field and boolean,
     # indicating if it was already checked.
     # Eventually, it helps to validate the "POST /request" input in O(n) time complexity.
-    groups_to_required_fields_map: Final[
-        dict[str, dict[ValidationUnitTemplateName, RequiredFieldChecked]]
-    ] = {"query_params": {}, "headers": {}, "body": {}}
+    groups_to_required_fields_map: dict[
+        str, dict[ValidationUnitTemplateName, RequiredFieldChecked]
+    ] = Field(
+        default_factory=lambda: {"query_params": {}, "headers": {}, "body": {}},
+        exclude=True,
+    )
+    # Compiled form of the model, built once by RequestService upon first use.
+    # Cached models are shared, hence the plan is built once per model version.
+    _validation_plan: Any = PrivateAttr(default=None)
+
+    @field_validator("path")
+    @classmethod
+    def validate_path_parameters(cls, path: str) -> str:
+        for segment in path.split("/"):
+            if "{" in segment or "}" in segment:
+                if not PATH_PARAMETER_PATTERN.match(segment):
+                    raise ValueError(f"Invalid path parameter {segment}")
+
+        return path
@@ -0,0 +1,53 @@
+"""
+Seconds per 1M values of RequestService type checkers, value by value versus column by column.
+Run: python -m py_mirror.tests.benchmarks.column_checkers_bench
+"""
+
+import time
+import uuid
+from typing import Any, Callable
+
+from py_mirror.app.types import Type
+from py_mirror.app.service.request_service import RequestService
+
+VALUE_COUNT = 1_000_000
+# Every tenth value is of another type, or malformed.
+TYPES_TO_VALUES: dict[Type, Callable[[int], Any]] = {
+    Type.Int: lambda i: i if i % 10 else str(i),
+    Type.String: lambda i: f"value{i}" if i % 10 else i,
+    Type.Boolean: lambda i: bool(i % 2) if i % 10 else "true",
+    Type.List: lambda i: [i] if i % 10 else None,
+    Type.Date: lambda i: f"{i % 28 + 1:02d}-{i % 12 + 1:02d}-{1990 + i % 30}"
+    if i % 10
+    else "2026-10-18",
+    Type.Email: lambda i: f"user{i}@example.com" if i % 10 else f"user{i}",
+    Type.UUID: lambda i: str(uuid.UUID(int=i * 7919)) if i % 10 else f"uuid{i}",
+    Type.Auth_Token: lambda i: f"Bearer token{i}" if i % 10 else f"Basic token{i}",
+}
+
+
+def seconds(func: Callable[[], Any]) -> float:
+    started_at = time.perf_counter()
+    func()
+    return time.perf_counter() - started_at
+
+
+def main() -> None:
+    service = RequestService()
+
+    for type, get_value in TYPES_TO_VALUES.items():
+        values = [get_value(i) for i in range(VALUE_COUNT)]
+        type_checker = service.type_checkers[type]
+        column_checker = service.column_checkers[type]
+        assert column_checker(values) == [type_checker(value) for value in values]
+
+        scalar = seconds(lambda: [type_checker(value) for value in values])
+        column = seconds(lambda: column_checker(values))
+        print(
+            f"type={type.value:<10} scalar={scalar:>6.3f}s column={column:>6.3f}s "
+            f"speedup={scalar / column:>5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Lookups/sec and latency of ModelService.get_models_pg, the PG fallback upon Redis misses,
+the asyncpg prepared statement versus the ORM, per batch size of missed keys,
+at concurrencies up to several times the pool size, i.e. at pool saturation.
+Requires a running PG, see docker-compose.yml and .env.
+Run: python -m py_mirror.tests.benchmarks.model_pg_bench
+"""
+
+import time
+import asyncio
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import select, tuple_
+
+from py_mirror.app.types import ModelDto
+from py_mirror.app.service.model_service import ModelService
+from py_mirror.app.storage.pg.models import ModelEntity
+from py_mirror.app.storage.pg.data_source import DataSource as PgDataSource
+from py_mirror.tests.benchmarks.validation_plan_bench import build_model_and_request
+
+FIELD_COUNTS = (10, 100)
+MODEL_COUNT = 100
+# Number of keys, missed in Redis at once, e.g. by a single request, or a batch.
+BATCH_SIZES = (1, 10)
+# Multiples of the pool size, see SQLALCHEMY_POOL_SIZE.
+POOL_SIZE_MULTIPLES = (1, 4)
+SECONDS = 3.0
+
+Lookup = Callable[[list[tuple[str, str]]], Awaitable[dict[str, ModelDto]]]
+
+
+async def get_models_orm_pg(
+    model_service: ModelService, paths_methods: list[tuple[str, str]]
+) -> dict[str, ModelDto]:
+    # The route, replaced by the prepared statement.
+    async with model_service.pg_session() as async_session:
+        stmt = select(*ModelEntity.__table__.c).where(
+            tuple_(ModelEntity.path, ModelEntity.method).in_(paths_methods)
+        )
+        result = await async_session.execute(stmt)
+        models = [model_service.parse_model_pg(raw) for raw in result.mappings()]
+
+    return {model_service.get_key(m.path, m.method): m for m in models}
+
+
+def get_batches(paths: list[str], batch_size: int) -> list[list[tuple[str, str]]]:
+    return [
+        [(path, "POST") for path in paths[i : i + batch_size]]
+        for i in range(0, len(paths), batch_size)
+    ]
+
+
+async def measure(
+    lookup: Lookup, batches: list[list[tuple[str, str]]], concurrency: int
+) -> dict[str, float]:
+    latencies: list[float] = []
+    deadline = time.perf_counter() + SECONDS
+
+    async def run_worker(worker: int) -> None:
+        i = worker
+
+        while time.perf_counter() < deadline:
+            batch = batches[i % len(batches)]
+            started_at = time.perf_counter()
+
+            if len(await lookup(batch)) != len(batch):
+                raise RuntimeError(f"Models not found {batch}")
+
+            latencies.append(time.perf_counter() - started_at)
+            i += concurrency
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(run_worker(worker) for worker in range(concurrency)))
+    elapsed = time.perf_counter() - started_at
+    latencies.sort()
+    return {
+        "lookups_per_second": len(latencies) / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1e3,
+        "p99_ms": latencies[int(len(latencies) * 0.99)] * 1e3,
+    }
+
+
+async def main() -> None:
+    data_source = PgDataSource()
+    await data_source.init_db()
+    model_service = ModelService()
+    pool_size = int(str(data_source._env_vars.get("SQLALCHEMY_POOL_SIZE")))
+    routes: dict[str, Lookup] = {
+        "orm": lambda paths_methods: get_models_orm_pg(model_service, paths_methods),
+        "asyncpg": model_service.get_models_pg,
+    }
+
+    for field_count in FIELD_COUNTS:
+        model_dto, _ = build_model_and_request(field_count)
+        paths = [f"/bench/pg/{field_count}/resource{i}" for i in range(MODEL_COUNT)]
+
+        for path in paths:
+            await model_service.save_model(model_dto.model_copy(update={"path": path}))
+
+        for batch_size in BATCH_SIZES:
+            batches = get_batches(paths, batch_size)
+
+            for multiple in POOL_SIZE_MULTIPLES:
+                concurrency = pool_size * multiple
+
+                for name, lookup in routes.items():
+                    # Warms up the pool, and the prepared statements of its connections.
+                    await measure_briefly(lookup, batches, concurrency)
+                    results: dict[str, Any] = await measure(
+                        lookup, batches, concurrency
+                    )
+                    print(
+                        f"fields={field_count:<5} batch={batch_size:<4} "
+                        f"concurrency={concurrency:<4} {name:<8} "
+                        + " ".join(f"{k}={v:.2f}" for k, v in results.items())
+                    )
+
+    await data_source.dispose()
+
+
+async def measure_briefly(
+    lookup: Lookup, batches: list[list[tuple[str, str]]], concurrency: int
+) -> None:
+    await asyncio.gather(
+        *(lookup(batches[i % len(batches)]) for i in range(concurrency * 4))
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
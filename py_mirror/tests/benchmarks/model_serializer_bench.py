@@ -0,0 +1,72 @@
+"""
+Encode/decode time and bytes per model of the Redis model serializers.
+Run: python -m py_mirror.tests.benchmarks.model_serializer_bench
+"""
+
+import time
+from typing import Any, Callable
+
+from py_mirror.app.types import ModelDto, Type
+from py_mirror.app.storage.redis.serializer import ModelSerializer, CODECS
+
+FIELD_COUNTS = (100, 1_000, 10_000)
+
+
+def build_model(field_count: int) -> ModelDto:
+    types = list(Type)
+    groups: dict[str, Any] = {"query_params": [], "headers": [], "body": []}
+
+    for i in range(field_count):
+        group_name = ("query_params", "headers", "body")[i % 3]
+        groups[group_name].append(
+            {
+                "name": f"field_name_{i}",
+                "required": i % 2 == 0,
+                "types": [types[i % len(types)], types[(i + 3) % len(types)]],
+            }
+        )
+
+    return ModelDto(**{"path": "/bench", "method": "POST", **groups})
+
+
+def seconds_per_call(func: Callable[[], Any], min_seconds: float = 0.5) -> float:
+    iterations, started_at = 0, time.perf_counter()
+
+    while (elapsed := time.perf_counter() - started_at) < min_seconds:
+        func()
+        iterations += 1
+
+    return elapsed / iterations
+
+
+def main() -> None:
+    serializer = ModelSerializer()
+
+    for field_count in FIELD_COUNTS:
+        model_dto = build_model(field_count)
+
+        # The layout, preceding the binary one: JSON + full pydantic validation.
+        serialized_json = model_dto.model_dump_json()
+        encode = seconds_per_call(lambda: model_dto.model_dump_json())
+        decode = seconds_per_call(lambda: ModelDto.model_validate_json(serialized_json))
+        print(
+            f"fields={field_count:>6} {'legacy-json':<16} encode={encode * 1e6:>10.1f}us "
+            f"decode={decode * 1e6:>10.1f}us bytes={len(serialized_json):>9}"
+        )
+
+        for codec_name in CODECS:
+            for zstd_threshold in (0, 1):
+                serializer.codec = CODECS[codec_name]
+                serializer.zstd_threshold = zstd_threshold
+                serialized_model = serializer.encode(model_dto)
+                encode = seconds_per_call(lambda: serializer.encode(model_dto))
+                decode = seconds_per_call(lambda: serializer.decode(serialized_model))
+                name = f"{codec_name}{'+zstd' if zstd_threshold else ''}"
+                print(
+                    f"fields={field_count:>6} {name:<16} encode={encode * 1e6:>10.1f}us "
+                    f"decode={decode * 1e6:>10.1f}us bytes={len(serialized_model):>9}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Build time and lookup latency of the route index, compared with a linear scan of the models.
+Run: python -m py_mirror.tests.benchmarks.route_index_bench
+"""
+
+import time
+from typing import Any, Callable
+
+from py_mirror.app.service.route_index import RouteIndex, SEGMENT_CHECKERS
+from py_mirror.app.types import PATH_PARAMETER_PATTERN
+
+ROUTE_COUNTS = (1_000, 10_000, 100_000)
+
+
+def build_paths_methods(route_count: int) -> list[tuple[str, str]]:
+    paths_methods = []
+
+    for i in range(route_count):
+        # Mix of static and parameterized models, sharing prefixes.
+        if i % 2:
+            path = f"/resource{i // 100}/sub{i}/{{id:int}}"
+        else:
+            path = f"/resource{i // 100}/sub{i}"
+
+        paths_methods.append((path, "GET"))
+
+    return paths_methods
+
+
+def linear_match(paths_methods: list[tuple[str, str]], path: str) -> str | None:
+    segments = path.split("/")
+
+    for template, _ in paths_methods:
+        template_segments = template.split("/")
+
+        if len(template_segments) != len(segments):
+            continue
+
+        for template_segment, segment in zip(template_segments, segments):
+            parameter = PATH_PARAMETER_PATTERN.match(template_segment)
+
+            if parameter:
+                if not SEGMENT_CHECKERS[parameter.group(2) or "str"](segment):
+                    break
+            elif template_segment != segment:
+                break
+        else:
+            return template
+
+    return None
+
+
+def seconds_per_call(func: Callable[[], Any], min_seconds: float = 0.5) -> float:
+    iterations, started_at = 0, time.perf_counter()
+
+    while (elapsed := time.perf_counter() - started_at) < min_seconds:
+        func()
+        iterations += 1
+
+    return elapsed / iterations
+
+
+def main() -> None:
+    route_index = RouteIndex()
+
+    for route_count in ROUTE_COUNTS:
+        paths_methods = build_paths_methods(route_count)
+        started_at = time.perf_counter()
+        route_index.build(paths_methods)
+        build = time.perf_counter() - started_at
+        # The last model is the worst case of the linear scan.
+        path = f"/resource{(route_count - 1) // 100}/sub{route_count - 1}/42"
+        assert route_index.match(path, "GET") == linear_match(paths_methods, path)
+
+        trie = seconds_per_call(lambda: route_index.match(path, "GET"))
+        linear = seconds_per_call(lambda: linear_match(paths_methods, path))
+        print(
+            f"routes={route_count:>7} build={build * 1e3:>9.1f}ms "
+            f"trie={trie * 1e6:>8.2f}us linear={linear * 1e6:>12.1f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
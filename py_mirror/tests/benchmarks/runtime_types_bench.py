@@ -0,0 +1,88 @@
+"""
+Latency and allocations per request of RequestService.validate_request on large payloads,
+including the conversion of the result into the response DTO.
+Run: python -m py_mirror.tests.benchmarks.runtime_types_bench
+"""
+
+import time
+import tracemalloc
+from typing import Any, Callable
+
+from fastapi.encoders import jsonable_encoder
+
+from py_mirror.app.types import ModelDto, RequestDto, ResponseDto
+from py_mirror.app.service.request_service import RequestService
+from py_mirror.tests.benchmarks.validation_plan_bench import build_model_and_request
+
+FIELD_COUNTS = (100, 1_000, 10_000)
+
+
+def seconds_per_call(func: Callable[[], Any], min_seconds: float = 1.0) -> float:
+    iterations, started_at = 0, time.perf_counter()
+
+    while (elapsed := time.perf_counter() - started_at) < min_seconds:
+        func()
+        iterations += 1
+
+    return elapsed / iterations
+
+
+def peak_bytes_per_call(func: Callable[[], Any]) -> int:
+    tracemalloc.start()
+
+    try:
+        func()
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        return peak - baseline
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> None:
+    service = RequestService()
+
+    for field_count in FIELD_COUNTS:
+        model_dto, request_dto = build_model_and_request(field_count)
+        # Each value mismatches its types, so every field is abnormal.
+        abnormal_request_dto = RequestDto(
+            **{
+                **request_dto.model_dump(),
+                "query_params": [
+                    {"name": unit.name, "value": None}
+                    for unit in request_dto.query_params
+                ],
+                "headers": [
+                    {"name": unit.name, "value": None} for unit in request_dto.headers
+                ],
+                "body": [
+                    {"name": unit.name, "value": None} for unit in request_dto.body
+                ],
+            }
+        )
+
+        for name, dto in (("valid", request_dto), ("abnormal", abnormal_request_dto)):
+
+            def validate(dto: RequestDto = dto, model_dto: ModelDto = model_dto) -> Any:
+                return service.validate_request(dto, model_dto)
+
+            def respond(dto: RequestDto = dto, model_dto: ModelDto = model_dto) -> Any:
+                # The API boundary is where the result becomes a pydantic DTO.
+                validation_response = service.validate_request(dto, model_dto)
+                return jsonable_encoder(
+                    ResponseDto(data=validation_response.to_dto(), error=None)
+                )
+
+            for stage, func in (("validate", validate), ("respond", respond)):
+                latency = seconds_per_call(func)
+                peak = peak_bytes_per_call(func)
+                print(
+                    f"fields={field_count:>6} {name:<9} {stage:<9} "
+                    f"latency={latency * 1e6:>10.1f}us peak_allocated={peak / 1024:>9.1f}KiB"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+"""
+In-process stand-ins of Redis and PG, used by the end-to-end benchmarks.
+They implement only what ModelService and AnomalyStatsService need,
+with an optional round trip latency, so the benchmarks measure the API itself rather than a particular network.
+"""
+
+import time
+import asyncio
+from typing import Any
+
+from py_mirror.app.types import ModelDto
+from py_mirror.app.service.model_cache import ModelCache
+from py_mirror.app.service.model_service import ModelService
+from py_mirror.app.storage.redis.data_source import DataSource as RedisDataSource
+
+
+class InMemoryPipeline:
+    def __init__(self, redis_client: "InMemoryRedis") -> None:
+        self.redis_client = redis_client
+        self.commands: list[tuple[str, tuple[Any, ...], dict[str, Any]]] = []
+
+    async def __aenter__(self) -> "InMemoryPipeline":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        self.commands = []
+
+    def set(self, *args: Any, **kwargs: Any) -> None:
+        self.commands.append(("set", args, kwargs))
+
+    def publish(self, *args: Any, **kwargs: Any) -> None:
+        self.commands.append(("publish", args, kwargs))
+
+    def hincrby(self, *args: Any, **kwargs: Any) -> None:
+        self.commands.append(("hincrby", args, kwargs))
+
+    def hset(self, *args: Any, **kwargs: Any) -> None:
+        self.commands.append(("hset", args, kwargs))
+
+    def hmget(self, *args: Any, **kwargs: Any) -> None:
+        self.commands.append(("hmget", args, kwargs))
+
+    def delete(self, *args: Any, **kwargs: Any) -> None:
+        self.commands.append(("delete", args, kwargs))
+
+    def hgetall(self, *args: Any, **kwargs: Any) -> None:
+        self.commands.append(("hgetall", args, kwargs))
+
+    def expire(self, *args: Any, **kwargs: Any) -> None:
+        self.commands.append(("expire", args, kwargs))
+
+    async def execute(self) -> list[Any]:
+        # A single round trip for the whole pipeline.
+        await self.redis_client.round_trip()
+        return [
+            getattr(self.redis_client, f"_{name}")(*args, **kwargs)
+            for name, args, kwargs in self.commands
+        ]
+
+
+class InMemoryRedis:
+    def __init__(self, latency_ms: float = 0) -> None:
+        self.latency_ms = latency_ms
+        self.values: dict[str, bytes] = {}
+        self.expirations: dict[str, float] = {}
+        self.sorted_sets: dict[str, dict[str, float]] = {}
+        self.hashes: dict[str, dict[bytes, bytes]] = {}
+
+    async def round_trip(self) -> None:
+        # Yields to the event loop, as a real client would.
+        await asyncio.sleep(self.latency_ms / 1000)
+
+    def pipeline(self, transaction: bool = True) -> InMemoryPipeline:
+        return InMemoryPipeline(self)
+
+    async def get(self, key: str) -> bytes | None:
+        await self.round_trip()
+        return self._get(key)
+
+    async def mget(self, keys: list[str]) -> list[bytes | None]:
+        await self.round_trip()
+        return [self._get(key) for key in keys]
+
+    async def set(self, key: str, value: Any, **kwargs: Any) -> bool:
+        await self.round_trip()
+        return self._set(key, value, **kwargs)
+
+    async def publish(self, channel: str, message: str) -> int:
+        await self.round_trip()
+        return self._publish(channel, message)
+
+    async def hmget(self, key: str, fields: list[str]) -> list[bytes | None]:
+        await self.round_trip()
+        return self._hmget(key, fields)
+
+    async def zadd(self, key: str, mapping: dict[str, float]) -> int:
+        await self.round_trip()
+        self.sorted_sets.setdefault(key, {}).update(mapping)
+        return len(mapping)
+
+    async def zrevrange(self, key: str, start: int, end: int) -> list[bytes]:
+        await self.round_trip()
+        members = sorted(
+            self.sorted_sets.get(key, {}).items(), key=lambda item: -item[1]
+        )
+        return [member.encode() for member, _ in members[start : end + 1]]
+
+    def _get(self, key: str) -> bytes | None:
+        expires_at = self.expirations.get(key)
+
+        if expires_at is not None and expires_at <= time.monotonic():
+            self.values.pop(key, None)
+            self.expirations.pop(key, None)
+
+        return self.values.get(key)
+
+    def _set(
+        self, key: str, value: Any, nx: bool = False, px: int | None = None
+    ) -> bool:
+        if nx and self._get(key) is not None:
+            return False
+
+        self.values[key] = value if isinstance(value, bytes) else str(value).encode()
+
+        if px:
+            self.expirations[key] = time.monotonic() + px / 1000
+        else:
+            self.expirations.pop(key, None)
+
+        return True
+
+    def _hincrby(self, key: str, field: str, amount: int = 1) -> int:
+        fields = self.hashes.setdefault(key, {})
+        value = int(fields.get(field.encode(), b"0")) + amount
+        fields[field.encode()] = str(value).encode()
+        return value
+
+    def _hset(self, key: str, mapping: dict[str, bytes]) -> int:
+        fields = self.hashes.setdefault(key, {})
+        added = len(mapping.keys() - {field.decode() for field in fields})
+        fields.update({field.encode(): value for field, value in mapping.items()})
+        return added
+
+    def _hmget(self, key: str, fields: list[str]) -> list[bytes | None]:
+        values = self.hashes.get(key, {})
+        return [values.get(field.encode()) for field in fields]
+
+    def _hgetall(self, key: str) -> dict[bytes, bytes]:
+        return dict(self.hashes.get(key, {}))
+
+    def _delete(self, *keys: str) -> int:
+        deleted = [self.values.pop(key, None) for key in keys]
+        return len([value for value in deleted if value is not None])
+
+    def _expire(self, key: str, seconds: int) -> bool:
+        # Hashes outlive the benchmarks anyway.
+        return key in self.hashes
+
+    def _publish(self, channel: str, message: str) -> int:
+        # Delivered right away, as if this process was subscribed.
+        ModelCache().notify(message)
+        return 1
+
+
+class InMemoryPg:
+    """
+    Replaces the PG methods of ModelService.
+    Saved models are queued in the outbox, and propagated to Redis by the drains of
+    the actual OutboxService, see "run_e2e" of the suite. Hence, saving and propagation
+    take the same route as in production, apart from the SQL itself.
+    """
+
+    def __init__(self, latency_ms: float = 0) -> None:
+        self.latency_ms = latency_ms
+        self.models: dict[str, ModelDto] = {}
+        # Keys of the saved models, yet to be propagated, in the order of saving.
+        self.outbox: list[str] = []
+
+    async def round_trip(self) -> None:
+        await asyncio.sleep(self.latency_ms / 1000)
+
+    def install(self) -> None:
+        pg = self
+
+        async def get_model_pg(
+            model_service: ModelService, path: str, method: str
+        ) -> ModelDto | None:
+            await pg.round_trip()
+            return pg.models.get(model_service.get_key(path, method))
+
+        async def get_models_pg(
+            model_service: ModelService, paths_methods: list[tuple[str, str]]
+        ) -> dict[str, ModelDto]:
+            await pg.round_trip()
+            keys = [
+                model_service.get_key(path, method) for path, method in paths_methods
+            ]
+            return {key: pg.models[key] for key in keys if key in pg.models}
+
+        async def upsert_model_pg(
+            model_service: ModelService, model_dto: ModelDto
+        ) -> int:
+            await pg.round_trip()
+            key = model_service.get_key(model_dto.path, model_dto.method)
+            saved_model_dto = pg.models.get(key)
+            version = saved_model_dto.version + 1 if saved_model_dto else 1
+            pg.models[key] = model_dto.model_copy(update={"version": version})
+            pg.outbox.append(key)
+            return version
+
+        async def drain_outbox_pg(model_service: ModelService, batch_size: int) -> int:
+            await pg.round_trip()
+            keys = pg.outbox[:batch_size]
+            del pg.outbox[:batch_size]
+
+            if keys:
+                # The latest versions, once per model, as the actual drain.
+                await model_service.set_models_redis_pipeline(
+                    [pg.models[key] for key in dict.fromkeys(keys)]
+                )
+
+            return len(keys)
+
+        ModelService.get_model_pg = get_model_pg  # type: ignore
+        ModelService.get_models_pg = get_models_pg  # type: ignore
+        ModelService.upsert_model_pg = upsert_model_pg  # type: ignore
+        ModelService.drain_outbox_pg = drain_outbox_pg  # type: ignore
+
+
+def install_stand_ins(
+    redis_latency_ms: float = 0, pg_latency_ms: float = 0
+) -> tuple[InMemoryRedis, InMemoryPg]:
+    """Must be called prior serving any request."""
+    redis_client = InMemoryRedis(redis_latency_ms)
+    RedisDataSource().client = redis_client  # type: ignore
+    pg = InMemoryPg(pg_latency_ms)
+    pg.install()
+    return redis_client, pg
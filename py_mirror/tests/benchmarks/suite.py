@@ -0,0 +1,329 @@
+"""
+Benchmark suite, written as JSON, so regressions can be compared between commits.
+Micro: RequestService.validate_request over models of varying width, batches of requests,
+each type checker and encoding of the "POST /api/request" response.
+End-to-end: throughput and latency of "POST /api/request" and "POST /api/model",
+served by the ASGI app in-process, on top of the Redis and PG stand-ins.
+Saved models are propagated to Redis by OutboxService, running alongside, as in production.
+Run: python -m py_mirror.tests.benchmarks.suite --output bench.json
+Compare: python -m py_mirror.tests.benchmarks.suite --compare before.json after.json
+"""
+
+import sys
+import json
+import time
+import uuid
+import asyncio
+import argparse
+import datetime
+import platform
+import subprocess
+from typing import Any, Callable
+
+from httpx import ASGITransport, AsyncClient
+from fastapi.responses import JSONResponse
+from fastapi.encoders import jsonable_encoder
+
+from py_mirror.app.types import Type, ResponseDto, AbnormalityType
+from py_mirror.app.runtime_types import Anomaly, ValidationResult
+from py_mirror.app.api.main import get_api
+from py_mirror.app.api.responses import ORJSONResponse, render_validation_result
+from py_mirror.app.service.request_service import RequestService
+from py_mirror.app.service.outbox_service import OutboxService
+from py_mirror.tests.benchmarks.stand_ins import install_stand_ins
+from py_mirror.tests.benchmarks.validation_plan_bench import build_model_and_request
+
+FIELD_COUNTS = (1, 10, 100, 1_000)
+BATCH_SIZES = (100, 10_000)
+CONCURRENCIES = (1, 32)
+E2E_FIELD_COUNT = 30
+# Models, "POST /api/model" rotates over, so saves of the same model are interleaved.
+E2E_MODEL_COUNT = 100
+
+# Matching and mismatching value per type, since the checkers may exit early.
+TYPES_TO_SAMPLES: dict[Type, tuple[Any, Any]] = {
+    Type.Int: (1, "1"),
+    Type.String: ("value", 1),
+    Type.Boolean: (True, "true"),
+    Type.List: ([1, 2], "1,2"),
+    Type.Date: ("18-10-2026", "2026-10-18"),
+    Type.Email: ("user@example.com", "user@example"),
+    Type.UUID: (str(uuid.uuid4()), "not-a-uuid-at-all-not-a-uuid-at-all0"),
+    Type.Auth_Token: ("Bearer token", "Basic token"),
+}
+
+Results = dict[str, dict[str, float]]
+
+
+def seconds_per_call(func: Callable[[], Any], min_seconds: float) -> float:
+    iterations, started_at = 0, time.perf_counter()
+
+    while (elapsed := time.perf_counter() - started_at) < min_seconds:
+        func()
+        iterations += 1
+
+    return elapsed / iterations
+
+
+def percentile(sorted_values: list[float], percent: float) -> float:
+    # Nearest rank.
+    index = max(0, round(percent / 100 * len(sorted_values)) - 1)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+def run_micro(min_seconds: float) -> Results:
+    results: Results = {}
+    request_service = RequestService()
+
+    for field_count in FIELD_COUNTS:
+        model_dto, request_dto = build_model_and_request(field_count)
+        # Compiled once per model, as it is upon caching.
+        request_service.validate_request(request_dto, model_dto)
+        duration = seconds_per_call(
+            lambda: request_service.validate_request(request_dto, model_dto),
+            min_seconds,
+        )
+        results[f"validate_request[fields={field_count}]"] = {
+            "us_per_call": duration * 1e6,
+            "us_per_field": duration * 1e6 / field_count,
+        }
+
+    for request_count in BATCH_SIZES:
+        model_dto, request_dto = build_model_and_request(E2E_FIELD_COUNT)
+        requests_models = [(request_dto, model_dto)] * request_count
+        one_by_one = seconds_per_call(
+            lambda: [
+                request_service.validate_request(r, m) for r, m in requests_models
+            ],
+            min_seconds,
+        )
+        batch = seconds_per_call(
+            lambda: request_service.validate_requests(requests_models), min_seconds
+        )
+        name = f"requests={request_count}, fields={E2E_FIELD_COUNT}"
+        results[f"validate_requests[{name}, one_by_one]"] = {
+            "us_per_request": one_by_one * 1e6 / request_count,
+        }
+        results[f"validate_requests[{name}, columns]"] = {
+            "us_per_request": batch * 1e6 / request_count,
+        }
+
+    for type, (matching_value, mismatching_value) in TYPES_TO_SAMPLES.items():
+        checker = request_service.type_checkers[type]
+
+        for outcome, value in (
+            ("match", matching_value),
+            ("mismatch", mismatching_value),
+        ):
+            results[f"type_checker[{type.value}, {outcome}]"] = {
+                "ns_per_call": seconds_per_call(lambda: checker(value), min_seconds)
+                * 1e9,
+            }
+
+    anomaly = Anomaly(AbnormalityType.TYPE_MISSMATCH, "Expected one of [Int]")
+
+    # No abnormal fields is the dominant outcome.
+    for abnormal_field_count in (0, 10):
+        validation_result = ValidationResult(
+            is_abnormal=bool(abnormal_field_count),
+            abnormal_fields={
+                f"field{i}": [anomaly] for i in range(abnormal_field_count)
+            },
+        )
+        name = f"abnormal_fields={abnormal_field_count}"
+        results[f"encode_response[{name}, jsonable_encoder]"] = {
+            "us_per_call": seconds_per_call(
+                lambda: JSONResponse(
+                    jsonable_encoder(
+                        ResponseDto(data=validation_result.to_dto(), error=None)
+                    )
+                ),
+                min_seconds,
+            )
+            * 1e6,
+        }
+        results[f"encode_response[{name}, orjson]"] = {
+            "us_per_call": seconds_per_call(
+                lambda: ORJSONResponse(render_validation_result(validation_result)),
+                min_seconds,
+            )
+            * 1e6,
+        }
+
+    return results
+
+
+def build_model_payload(path: str) -> dict[str, Any]:
+    model_dto, _ = build_model_and_request(E2E_FIELD_COUNT)
+    return model_dto.model_copy(update={"path": path}).model_dump(
+        mode="json", include={"path", "method", "query_params", "headers", "body"}
+    )
+
+
+def build_request_payload(path: str) -> dict[str, Any]:
+    _, request_dto = build_model_and_request(E2E_FIELD_COUNT)
+    return request_dto.model_copy(update={"path": path}).model_dump(mode="json")
+
+
+async def measure(
+    client: AsyncClient,
+    url: str,
+    payloads: list[dict[str, Any]],
+    concurrency: int,
+    seconds: float,
+) -> dict[str, float]:
+    latencies: list[float] = []
+    deadline = time.perf_counter() + seconds
+
+    async def run_worker(worker: int) -> None:
+        i = worker
+
+        while time.perf_counter() < deadline:
+            started_at = time.perf_counter()
+            response = await client.post(url, json=payloads[i % len(payloads)])
+            latencies.append(time.perf_counter() - started_at)
+
+            if response.status_code >= 300:
+                raise RuntimeError(f"{url} {response.status_code}: {response.text}")
+
+            i += concurrency
+            # Cache hits never suspend, so the workers take turns explicitly.
+            await asyncio.sleep(0)
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(run_worker(worker) for worker in range(concurrency)))
+    elapsed = time.perf_counter() - started_at
+    latencies.sort()
+    return {
+        "requests_per_second": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1e3,
+        "p99_ms": percentile(latencies, 99) * 1e3,
+        "requests": len(latencies),
+    }
+
+
+async def run_e2e(
+    seconds: float, redis_latency_ms: float, pg_latency_ms: float
+) -> Results:
+    _, pg = install_stand_ins(redis_latency_ms, pg_latency_ms)
+    results: Results = {}
+    paths = [f"/bench/resource{i}" for i in range(E2E_MODEL_COUNT)]
+    model_payloads = [build_model_payload(path) for path in paths]
+    request_payloads = [build_request_payload(path) for path in paths]
+    # The lifespan isn't run by ASGITransport, hence started explicitly.
+    outbox_drainer = asyncio.create_task(OutboxService().run())
+
+    async with AsyncClient(
+        transport=ASGITransport(app=get_api()), base_url="http://bench"
+    ) as client:
+        for model_payload in model_payloads:
+            response = await client.post("/api/model", json=model_payload)
+            response.raise_for_status()
+
+        # Validation is measured once the models are propagated to Redis.
+        while pg.outbox:
+            await asyncio.sleep(0.01)
+
+        for concurrency in CONCURRENCIES:
+            for url, payloads in (
+                ("/api/request", request_payloads),
+                ("/api/model", model_payloads),
+            ):
+                results[f"POST {url}[concurrency={concurrency}]"] = await measure(
+                    client, url, payloads, concurrency, seconds
+                )
+
+    outbox_drainer.cancel()
+    await asyncio.gather(outbox_drainer, return_exceptions=True)
+    return results
+
+
+def get_meta() -> dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "commit": commit,
+        "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+    }
+
+
+def compare(before_path: str, after_path: str) -> None:
+    with open(before_path) as file:
+        before: Results = json.load(file)["results"]
+
+    with open(after_path) as file:
+        after: Results = json.load(file)["results"]
+
+    for name, metrics in after.items():
+        for metric, value in metrics.items():
+            previous_value = before.get(name, {}).get(metric)
+
+            if not previous_value:
+                continue
+
+            change = (value - previous_value) / previous_value * 100
+            print(
+                f"{name:<48} {metric:<20} {previous_value:>12.3f} "
+                f"{value:>12.3f} {change:>+8.1f}%"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="py-mirror benchmarks")
+    parser.add_argument("--output", help="JSON file, stdout by default")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"))
+    parser.add_argument("--skip-micro", action="store_true")
+    parser.add_argument("--skip-e2e", action="store_true")
+    parser.add_argument("--micro-seconds", type=float, default=0.2)
+    parser.add_argument("--e2e-seconds", type=float, default=3.0)
+    parser.add_argument("--redis-latency-ms", type=float, default=0)
+    parser.add_argument("--pg-latency-ms", type=float, default=0)
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    results: Results = {}
+
+    if not args.skip_micro:
+        results.update(run_micro(args.micro_seconds))
+
+    if not args.skip_e2e:
+        results.update(
+            asyncio.run(
+                run_e2e(args.e2e_seconds, args.redis_latency_ms, args.pg_latency_ms)
+            )
+        )
+
+    report = json.dumps(
+        {
+            "meta": {
+                **get_meta(),
+                "redis_latency_ms": args.redis_latency_ms,
+                "pg_latency_ms": args.pg_latency_ms,
+            },
+            "results": results,
+        },
+        indent=2,
+    )
+
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(report + "\n")
+    else:
+        sys.stdout.write(report + "\n")
+
+
+if __name__ == "__main__":
+    main()
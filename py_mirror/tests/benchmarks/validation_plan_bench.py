@@ -0,0 +1,140 @@
+"""
+Requests/sec of RequestService.validate_request, before and after compiling models.
+Run: python -m py_mirror.tests.benchmarks.validation_plan_bench
+"""
+
+import time
+import uuid
+from typing import Any, Callable
+
+from py_mirror.app.types import (
+    ModelDto,
+    RequestDto,
+    ValidationResponseDto,
+    AbnormalityType,
+    AbnormalityReason,
+    Type,
+)
+from py_mirror.app.service.request_service import RequestService
+
+FIELD_COUNTS = (10, 100, 1_000)
+TYPES_TO_VALUES: dict[Type, Any] = {
+    Type.Int: 1,
+    Type.String: "value",
+    Type.Boolean: True,
+    Type.List: [1, 2],
+    Type.Date: "18-10-2026",
+    Type.Email: "user@example.com",
+    Type.UUID: str(uuid.uuid4()),
+    Type.Auth_Token: "Bearer token",
+}
+
+
+def build_model_and_request(field_count: int) -> tuple[ModelDto, RequestDto]:
+    types = list(TYPES_TO_VALUES)
+    groups: dict[str, Any] = {
+        "query_params": [],
+        "headers": [],
+        "body": [],
+    }
+    units: dict[str, Any] = {
+        "query_params": [],
+        "headers": [],
+        "body": [],
+    }
+
+    for i in range(field_count):
+        group_name = ("query_params", "headers", "body")[i % 3]
+        type = types[i % len(types)]
+        # Allow a couple of types per field, so the checkers are actually iterated.
+        allowed_types = [types[(i + 1) % len(types)], type]
+        groups[group_name].append(
+            {"name": f"field{i}", "required": i % 2 == 0, "types": allowed_types}
+        )
+        units[group_name].append({"name": f"field{i}", "value": TYPES_TO_VALUES[type]})
+
+    model_dto = ModelDto(**{"path": "/bench", "method": "POST", **groups})
+    request_dto = RequestDto(**{"path": "/bench", "method": "POST", **units})
+    return model_dto, request_dto
+
+
+def legacy_validate_request(
+    service: RequestService, request_dto: RequestDto, model_dto: ModelDto
+) -> ValidationResponseDto:
+    """The per-value flow, preceding the validation plan."""
+    validation_response_dto = ValidationResponseDto()
+
+    for group_name in ("query_params", "headers", "body"):
+        group_response = ValidationResponseDto()
+        templates = {t.name: t for t in getattr(model_dto, group_name)}
+        required_fields = {t.name: False for t in templates.values() if t.required}
+
+        for unit in getattr(request_dto, group_name):
+            template = templates[unit.name]
+
+            if template.required:
+                required_fields[template.name] = True
+
+            if not any(
+                legacy_is_value_of_type(service, t, unit.value) for t in template.types
+            ):
+                group_response.is_abnormal = True
+                group_response.abnormal_fields.setdefault(unit.name, []).append(
+                    AbnormalityReason(
+                        type=AbnormalityType.TYPE_MISSMATCH, description=unit.name
+                    )
+                )
+
+        for abnormal_field in group_response.abnormal_fields:
+            validation_response_dto.abnormal_fields[
+                f"{group_name}:{abnormal_field}"
+            ] = group_response.abnormal_fields[abnormal_field]
+
+    return validation_response_dto
+
+
+def legacy_is_value_of_type(service: RequestService, type: Type, value: Any) -> bool:
+    # The checkers map used to be rebuilt upon each call.
+    func: Callable[[Any], bool] = {
+        Type.Auth_Token: service.is_auth_token,
+        Type.Date: service.is_date,
+        Type.UUID: service.is_uuid,
+        Type.Email: service.is_email,
+        Type.List: service.is_list,
+        Type.Boolean: service.is_bool,
+        Type.Int: service.is_int,
+        Type.String: service.is_str,
+    }[type]
+
+    return func(value)
+
+
+def requests_per_second(func: Callable[[], Any], min_seconds: float = 1.0) -> float:
+    iterations, started_at = 0, time.perf_counter()
+
+    while (elapsed := time.perf_counter() - started_at) < min_seconds:
+        func()
+        iterations += 1
+
+    return iterations / elapsed
+
+
+def main() -> None:
+    service = RequestService()
+
+    for field_count in FIELD_COUNTS:
+        model_dto, request_dto = build_model_and_request(field_count)
+        before = requests_per_second(
+            lambda: legacy_validate_request(service, request_dto, model_dto)
+        )
+        after = requests_per_second(
+            lambda: service.validate_request(request_dto, model_dto)
+        )
+        print(
+            f"fields={field_count:>5} before={before:>10.0f} req/s "
+            f"after={after:>10.0f} req/s speedup={after / before:.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -84,3 +84,17 @@ def model_dto_type_mismatch() -> dict[str, Any]:
             },
         ],
     }
+
+
+@pytest.fixture(scope="function", autouse=False)
+def valid_request_dto_payload() -> dict[str, Any]:
+    return {
+        "path": "/resource1/id1",
+        "method": "GET",
+        "body": [],
+        "query_params": [],
+        "headers": [
+            {"name": "Authorization", "value": "Bearer token"},
+            {"name": "Content-Type", "value": "application/json"},
+        ],
+    }
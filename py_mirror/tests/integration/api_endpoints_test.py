@@ -0,0 +1,57 @@
+import json
+from typing import Any
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from fastapi import FastAPI
+
+
+@pytest.mark.asyncio
+async def test_requests_batch_malformed_items(
+    api: FastAPI, valid_request_dto_payload: dict[str, Any]
+) -> None:
+    async with AsyncClient(
+        transport=ASGITransport(app=api), base_url="http://test"
+    ) as ac:
+        response = await ac.post(
+            "/api/requests/batch",
+            json=[
+                {**valid_request_dto_payload, "method": "GEET"},
+                {**valid_request_dto_payload, "path": ""},
+            ],
+        )
+
+    assert response.status_code == 201
+    items = response.json()["data"]
+    assert len(items) == 2
+    assert items[0]["data"] is None
+    assert items[0]["error"][0]["loc"] == ["method"]
+    assert items[1]["data"] is None
+    assert items[1]["error"][0]["loc"] == ["path"]
+
+
+@pytest.mark.asyncio
+async def test_requests_stream_malformed_lines(
+    api: FastAPI, valid_request_dto_payload: dict[str, Any]
+) -> None:
+    lines = [
+        json.dumps({**valid_request_dto_payload, "method": "GEET"}),
+        "",
+        "not a json",
+        json.dumps({**valid_request_dto_payload, "path": ""}),
+    ]
+
+    async with AsyncClient(
+        transport=ASGITransport(app=api), base_url="http://test"
+    ) as ac:
+        response = await ac.post(
+            "/api/requests/stream", content="\n".join(lines).encode()
+        )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    items = [json.loads(line) for line in response.text.splitlines()]
+    assert len(items) == 3
+    assert items[0]["error"][0]["loc"] == ["method"]
+    assert items[1]["error"][0]["type"] == "json_invalid"
+    assert items[2]["error"][0]["loc"] == ["path"]
@@ -4,6 +4,8 @@ import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
 from fastapi import FastAPI
 
+from py_mirror.app.service.warmup_service import WarmupService
+
 # from py_mirror.app.storage.pg.data_source import DataSource as PgDataSource
 # from py_mirror.app.storage.redis.data_source import DataSource as RedisDataSource
 
@@ -30,6 +32,40 @@ async def test_liveness(api: FastAPI) -> None:
     assert response.json() == {"data": "Ok", "error": None}
 
 
+@pytest.mark.asyncio
+async def test_readiness_warm_up_in_progress(api: FastAPI) -> None:
+    WarmupService().done = False
+
+    try:
+        async with AsyncClient(
+            transport=ASGITransport(app=api), base_url="http://test"
+        ) as ac:
+            response = await ac.get("/healthcheck/readiness")
+    finally:
+        WarmupService().done = True
+
+    assert response.status_code == 503
+    assert response.json()["error"] == "Models warm-up is in progress"
+
+
+@pytest.mark.asyncio
+async def test_readiness_warm_up_failed(api: FastAPI) -> None:
+    WarmupService().done = False
+    WarmupService().error = "ConnectionRefusedError()"
+
+    try:
+        async with AsyncClient(
+            transport=ASGITransport(app=api), base_url="http://test"
+        ) as ac:
+            response = await ac.get("/healthcheck/readiness")
+    finally:
+        WarmupService().done = True
+        WarmupService().error = None
+
+    assert response.status_code == 503
+    assert response.json()["error"] == "Models warm-up failed: ConnectionRefusedError()"
+
+
 @pytest.mark.asyncio
 async def test_readiness(api: FastAPI) -> None:
     async with AsyncClient(
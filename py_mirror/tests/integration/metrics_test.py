@@ -0,0 +1,29 @@
+import pytest
+from httpx import ASGITransport, AsyncClient
+from fastapi import FastAPI
+
+from py_mirror.app.metrics import VALIDATION_DURATION
+
+
+@pytest.mark.asyncio
+async def test_metrics(api: FastAPI) -> None:
+    VALIDATION_DURATION.observe(0.0003)
+
+    async with AsyncClient(
+        transport=ASGITransport(app=api), base_url="http://test"
+    ) as ac:
+        response = await ac.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    lines = response.text.splitlines()
+    assert "# TYPE py_mirror_stage_duration_seconds histogram" in lines
+    assert (
+        'py_mirror_stage_duration_seconds_count{stage="validation"} '
+        f"{sum(VALIDATION_DURATION.counts)}"
+    ) in lines
+    assert any(
+        line.startswith('py_mirror_anomalies_total{type="type_missmatch"}')
+        for line in lines
+    )
+    assert any(line.startswith("py_mirror_redis_pool_checked_out ") for line in lines)
@@ -0,0 +1,431 @@
+"""
+ModelService against the real storage, PG and Redis, see docker-compose.yml and .env.
+"""
+
+import json
+import uuid
+import datetime
+from typing import Any, AsyncIterator
+
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import select, delete, text
+
+from py_mirror.app.types import ModelDto, Type, ValidationUnitTemplateDto
+from py_mirror.app.runtime_types import ValidationResult
+from py_mirror.app.api.main import get_api
+from py_mirror.app.service.model_service import (
+    GET_MODEL_PG_SQL,
+    MODEL_HASH_PREFIX,
+    ModelService,
+)
+from py_mirror.app.service.import_service import ImportService
+from py_mirror.app.service.warmup_service import WarmupService
+from py_mirror.app.service.validation_result_service import (
+    ValidationRecord,
+    ValidationResultService,
+)
+from py_mirror.app.storage.pg.models import (
+    ModelEntity,
+    OutboxEntity,
+    validation_results_table,
+)
+from py_mirror.app.storage.pg.data_source import DataSource as PgDataSource
+from py_mirror.app.storage.redis.data_source import DataSource as RedisDataSource
+
+
+# Rather than the session-scoped "api", since these tests run in the event loop of each test.
+@pytest.fixture(scope="module", autouse=False)
+def storage_api() -> FastAPI:
+    return get_api()
+
+
+@pytest_asyncio.fixture(scope="function", loop_scope="function", autouse=False)
+async def model_service() -> AsyncIterator[ModelService]:
+    # Pooled connections are bound to the event loop of the test, see PgDataSource.
+    # Redis connections, left by the previous tests, are bound to closed loops.
+    await RedisDataSource().disconnect()
+    await PgDataSource().init_db()
+    yield ModelService()
+    await RedisDataSource().disconnect()
+    await PgDataSource().dispose()
+
+
+@pytest_asyncio.fixture(scope="function", loop_scope="function", autouse=False)
+async def model_dto(
+    model_service: ModelService, valid_model_dto_payload: dict[str, Any]
+) -> AsyncIterator[ModelDto]:
+    # Unique per test, so neither the storage, nor the caches are shared between tests.
+    model_dto = ModelDto(
+        **{**valid_model_dto_payload, "path": f"/storage/{uuid.uuid4().hex}"}
+    )
+    yield model_dto
+
+    key = model_service.get_key(model_dto.path, model_dto.method)
+
+    async with model_service.pg_session() as async_session:
+        for entity in (ModelEntity, OutboxEntity):
+            await async_session.execute(
+                delete(entity).where(entity.path.startswith(model_dto.path))
+            )
+
+        await async_session.commit()
+
+    await model_service.redis_client.delete(key, f"{MODEL_HASH_PREFIX}{key}")
+    model_service.model_cache.invalidate(key)
+
+
+@pytest.mark.asyncio
+async def test_get_models_pg(model_service: ModelService, model_dto: ModelDto) -> None:
+    version = await model_service.upsert_model_pg(model_dto)
+
+    models = await model_service.get_models_pg([(model_dto.path, "GET")])
+
+    key = model_service.get_key(model_dto.path, model_dto.method)
+    assert models == {key: model_dto.model_copy(update={"version": version})}
+
+
+@pytest.mark.asyncio
+async def test_parse_model_pg_same_as_record(
+    model_service: ModelService, model_dto: ModelDto
+) -> None:
+    await model_service.upsert_model_pg(model_dto)
+
+    async with model_service.pg_session() as async_session:
+        stmt = select(*ModelEntity.__table__.c).where(
+            ModelEntity.path == model_dto.path
+        )
+        row = (await async_session.execute(stmt)).mappings().one()
+
+    async with model_service.pg_data_source.driver_connection() as connection:
+        record = await connection.fetchrow(GET_MODEL_PG_SQL, model_dto.path, "GET")
+
+    parsed_model_dto = model_service.parse_model_pg(row)
+    assert (
+        parsed_model_dto.model_dump()
+        == model_service.parse_model_record_pg(record).model_dump()
+    )
+    assert parsed_model_dto.path == model_dto.path
+
+
+@pytest.mark.asyncio
+async def test_post_request_redis_miss(
+    storage_api: FastAPI,
+    model_service: ModelService,
+    model_dto: ModelDto,
+    valid_request_dto_payload: dict[str, Any],
+) -> None:
+    # Not propagated to Redis, hence fetched from PG.
+    await model_service.upsert_model_pg(model_dto)
+
+    async with AsyncClient(
+        transport=ASGITransport(app=storage_api), base_url="http://test"
+    ) as ac:
+        response = await ac.post(
+            "/api/request",
+            json={**valid_request_dto_payload, "path": model_dto.path},
+        )
+
+    assert response.status_code == 201
+    assert response.json()["data"]["is_abnormal"] is False
+
+
+@pytest.mark.asyncio
+async def test_warm_up(model_service: ModelService, model_dto: ModelDto) -> None:
+    version = await model_service.upsert_model_pg(model_dto)
+
+    assert await WarmupService().try_warm_up()
+
+    key = model_service.get_key(model_dto.path, model_dto.method)
+    assert model_service.model_cache.get(key) == model_dto.model_copy(
+        update={"version": version}
+    )
+    assert (await model_service.get_models_redis([key]))[key] is not None
+
+
+@pytest.mark.asyncio
+async def test_post_request_propagated_model(
+    storage_api: FastAPI,
+    model_service: ModelService,
+    model_dto: ModelDto,
+    valid_request_dto_payload: dict[str, Any],
+) -> None:
+    version = await model_service.save_model(model_dto)
+
+    while await model_service.drain_outbox_pg(batch_size=100):
+        pass
+
+    key = model_service.get_key(model_dto.path, model_dto.method)
+    models = await model_service.get_models_redis([key])
+    assert models[key] is not None
+    assert models[key].version == version  # type: ignore
+    # Served by Redis, rather than by the in-process cache.
+    model_service.model_cache.invalidate(key)
+
+    async with AsyncClient(
+        transport=ASGITransport(app=storage_api), base_url="http://test"
+    ) as ac:
+        response = await ac.post(
+            "/api/request",
+            json={**valid_request_dto_payload, "path": model_dto.path},
+        )
+
+    assert response.status_code == 201
+    assert response.json()["data"]["is_abnormal"] is False
+
+
+@pytest.mark.asyncio
+async def test_post_request_min_version_templated_path(
+    storage_api: FastAPI,
+    model_service: ModelService,
+    model_dto: ModelDto,
+    valid_request_dto_payload: dict[str, Any],
+) -> None:
+    # Under the path of "model_dto", hence removed along with it.
+    templated_model_dto = model_dto.model_copy(
+        update={"path": f"{model_dto.path}/users/{{id:int}}"}
+    )
+    # Neither propagated to Redis, nor to the indexes of the other workers yet.
+    version = await model_service.save_model(templated_model_dto)
+
+    async with AsyncClient(
+        transport=ASGITransport(app=storage_api), base_url="http://test"
+    ) as ac:
+        response = await ac.post(
+            "/api/request",
+            params={"min_version": version},
+            json={**valid_request_dto_payload, "path": f"{model_dto.path}/users/5"},
+        )
+
+    assert response.status_code == 201
+    assert response.json()["data"]["is_abnormal"] is False
+
+
+@pytest.mark.asyncio
+async def test_post_request_model_not_found(
+    storage_api: FastAPI,
+    model_service: ModelService,
+    model_dto: ModelDto,
+    valid_request_dto_payload: dict[str, Any],
+) -> None:
+    async with AsyncClient(
+        transport=ASGITransport(app=storage_api), base_url="http://test"
+    ) as ac:
+        # Missing in storage, then rejected by the negative cache.
+        responses = [
+            await ac.post(
+                "/api/request",
+                json={**valid_request_dto_payload, "path": model_dto.path},
+            )
+            for _ in range(2)
+        ]
+
+    key = model_service.get_key(model_dto.path, model_dto.method)
+    assert model_service.model_cache.is_missing(key)
+
+    for response in responses:
+        assert response.status_code == 404
+        assert response.json() == {
+            "data": None,
+            "error": f"Model not found for path:method '{model_dto.path}:GET'",
+        }
+
+
+async def as_chunks(data: bytes) -> AsyncIterator[bytes]:
+    yield data
+
+
+@pytest.mark.asyncio
+async def test_import_models(
+    model_service: ModelService, model_dto: ModelDto, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # A single chunk, including the same "path:method" twice, the last one wins.
+    monkeypatch.setattr(ImportService(), "chunk_size", 10)
+    updated_model_dto = model_dto.model_copy(
+        update={
+            "body": [
+                ValidationUnitTemplateDto(name="id", required=True, types=[Type.Int])
+            ]
+        }
+    )
+    other_model_dto = model_dto.model_copy(update={"path": f"{model_dto.path}/other"})
+    data = json.dumps(
+        [
+            m.model_dump(mode="json")
+            for m in (model_dto, other_model_dto, updated_model_dto)
+        ]
+    ).encode()
+    paths_methods = [(model_dto.path, "GET"), (other_model_dto.path, "GET")]
+    key, other_key = [model_service.get_key(*pm) for pm in paths_methods]
+
+    for version in (1, 2):
+        progresses = [
+            progress
+            async for progress in ImportService().import_models(as_chunks(data))
+        ]
+
+        assert (progresses[-1].imported, progresses[-1].failed) == (3, 0)
+        models = await model_service.get_models_pg(paths_methods)
+        # Re-imported models are updated, rather than inserted again.
+        assert models[key].version == models[other_key].version == version
+        assert models[key].body == updated_model_dto.body
+        assert models[other_key].body == []
+
+    async with model_service.pg_session() as async_session:
+        stmt = (
+            select(OutboxEntity.path, OutboxEntity.version, OutboxEntity.groups)
+            .where(OutboxEntity.path.startswith(model_dto.path))
+            .order_by(OutboxEntity.id)
+        )
+        entries = (await async_session.execute(stmt)).all()
+
+    # An entry per imported model, none for the duplicate.
+    assert sorted(entries) == [
+        (model_dto.path, 1, None),
+        (model_dto.path, 2, None),
+        (other_model_dto.path, 1, None),
+        (other_model_dto.path, 2, None),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_write_validation_results_partitions(
+    model_service: ModelService, model_dto: ModelDto
+) -> None:
+    service = ValidationResultService()
+    table = validation_results_table.fullname
+    # Far in the future, so the partitions aren't shared with the other results.
+    midnight = datetime.datetime(2099, 1, 2, tzinfo=datetime.timezone.utc)
+    records = [
+        ValidationRecord(
+            midnight + datetime.timedelta(microseconds=microseconds),
+            f"{model_dto.path}/{microseconds}",
+            "GET",
+            model_dto.path,
+            1,
+            ValidationResult(),
+        )
+        for microseconds in (-1, 0, 1)
+    ]
+    days = {datetime.date(2099, 1, 1), datetime.date(2099, 1, 2)}
+
+    try:
+        await service.write_results_pg(records)
+        # Partitions are known to exist, hence not created again.
+        assert days <= service._partitions
+        await service.write_results_pg(records[:1])
+
+        async with model_service.pg_session() as async_session:
+            stmt = text(
+                f"SELECT tableoid::regclass::text, path FROM {table} "
+                "WHERE model_path = :model_path ORDER BY created_at, path;"
+            )
+            rows = (
+                await async_session.execute(stmt, {"model_path": model_dto.path})
+            ).all()
+
+        # The last microsecond of a day belongs to that day, midnight to the next one.
+        assert [(partition.split(".")[-1], path) for partition, path in rows] == [
+            ("validation_results_20990101", f"{model_dto.path}/-1"),
+            ("validation_results_20990101", f"{model_dto.path}/-1"),
+            ("validation_results_20990102", f"{model_dto.path}/0"),
+            ("validation_results_20990102", f"{model_dto.path}/1"),
+        ]
+    finally:
+        async with model_service.pg_session() as async_session:
+            for day in days:
+                await async_session.execute(
+                    text(f"DROP TABLE IF EXISTS {table}_{day:%Y%m%d};")
+                )
+
+            await async_session.commit()
+
+        service._partitions -= days
+
+
+@pytest.mark.asyncio
+async def test_patch_model(
+    storage_api: FastAPI, model_service: ModelService, model_dto: ModelDto
+) -> None:
+    version = await model_service.save_model(model_dto)
+
+    while await model_service.drain_outbox_pg(batch_size=100):
+        pass
+
+    id_template = ValidationUnitTemplateDto(name="id", required=True, types=[Type.Int])
+    content_type_template = ValidationUnitTemplateDto(
+        name="Content-Type", required=False, types=[Type.Int]
+    )
+    templates = {
+        "id": id_template.model_dump(mode="json"),
+        "content_type": content_type_template.model_dump(mode="json"),
+    }
+    operations = [
+        {"op": "add", "group": "body", "template": templates["id"]},
+        {"op": "update", "group": "headers", "template": templates["content_type"]},
+        {"op": "remove", "group": "headers", "name": "Authorization"},
+    ]
+
+    async with AsyncClient(
+        transport=ASGITransport(app=storage_api), base_url="http://test"
+    ) as ac:
+        response = await ac.patch(
+            "/api/model",
+            json={"path": model_dto.path, "method": "GET", "operations": operations},
+        )
+        # Either all the operations apply, or none.
+        conflict_response = await ac.patch(
+            "/api/model",
+            json={
+                "path": model_dto.path,
+                "method": "GET",
+                "operations": [
+                    {"op": "add", "group": "query_params", "template": templates["id"]},
+                    operations[0],
+                ],
+            },
+        )
+        not_found_response = await ac.patch(
+            "/api/model",
+            json={
+                "path": f"{model_dto.path}/missing",
+                "method": "GET",
+                "operations": operations[:1],
+            },
+        )
+
+    assert response.status_code == 200
+    assert response.json()["data"]["version"] == version + 1
+    assert conflict_response.status_code == 409
+    assert conflict_response.json()["error"] == "Field body:id already exists"
+    assert not_found_response.status_code == 404
+
+    async with model_service.pg_session() as async_session:
+        stmt = select(
+            OutboxEntity.path, OutboxEntity.version, OutboxEntity.groups
+        ).where(OutboxEntity.path.startswith(model_dto.path))
+        entries = (await async_session.execute(stmt)).all()
+
+    # Only the changed groups are propagated.
+    assert [tuple(entry) for entry in entries] == [
+        (model_dto.path, version + 1, ["body", "headers"])
+    ]
+
+    while await model_service.drain_outbox_pg(batch_size=100):
+        pass
+
+    key = model_service.get_key(model_dto.path, model_dto.method)
+    models = [
+        (await model_service.get_models_pg([(model_dto.path, "GET")]))[key],
+        (await model_service.get_models_redis([key]))[key],
+    ]
+
+    # Either read from PG, or propagated to Redis, the other groups are unchanged.
+    for patched_model_dto in models:
+        assert patched_model_dto is not None
+        assert patched_model_dto.version == version + 1
+        assert patched_model_dto.body == [id_template]
+        assert patched_model_dto.headers == [content_type_template]
+        assert patched_model_dto.query_params == []
@@ -0,0 +1,54 @@
+from typing import Iterator
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from fastapi import FastAPI
+
+from py_mirror.app.api.main import get_api
+from py_mirror.app.api.profiling import Profiler
+
+
+@pytest.fixture(scope="function", autouse=False)
+def profiled_api() -> Iterator[FastAPI]:
+    profiler = Profiler()
+    enabled, server_timing, sample_rate = (
+        profiler.enabled,
+        profiler.server_timing,
+        profiler.sample_rate,
+    )
+    profiler.enabled, profiler.server_timing, profiler.sample_rate = True, True, 1
+    yield get_api()
+    profiler.enabled, profiler.server_timing, profiler.sample_rate = (
+        enabled,
+        server_timing,
+        sample_rate,
+    )
+    profiler.reset()
+
+
+@pytest.mark.asyncio
+async def test_server_timing_and_profile(profiled_api: FastAPI) -> None:
+    async with AsyncClient(
+        transport=ASGITransport(app=profiled_api), base_url="http://test"
+    ) as ac:
+        response = await ac.get("/healthcheck/liveness")
+        profile_response = await ac.get("/debug/profile", params={"sort": "time"})
+        bad_sort_response = await ac.get("/debug/profile", params={"sort": "unknown"})
+
+    assert response.status_code == 200
+    assert response.headers["server-timing"].startswith("total;dur=")
+    assert profile_response.status_code == 200
+    assert profile_response.text.startswith("Samples: ")
+    assert bad_sort_response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_profiling_disabled(api: FastAPI) -> None:
+    async with AsyncClient(
+        transport=ASGITransport(app=api), base_url="http://test"
+    ) as ac:
+        response = await ac.get("/healthcheck/liveness")
+        profile_response = await ac.get("/debug/profile")
+
+    assert "server-timing" not in response.headers
+    assert profile_response.status_code == 404
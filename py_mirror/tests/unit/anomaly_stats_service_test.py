@@ -0,0 +1,103 @@
+from typing import Any, Iterator
+
+import pytest
+
+from py_mirror.app.types import ModelDto, RequestDto, AbnormalityType
+from py_mirror.app.runtime_types import Anomaly, ValidationResult
+from py_mirror.app.service.request_service import RequestService
+from py_mirror.app.service.anomaly_stats_service import AnomalyStatsService
+from py_mirror.tests.benchmarks.stand_ins import InMemoryRedis
+
+
+@pytest.fixture(scope="function", autouse=False)
+def anomaly_stats_service(
+    monkeypatch: pytest.MonkeyPatch,
+) -> Iterator[AnomalyStatsService]:
+    service = AnomalyStatsService()
+    monkeypatch.setattr(service, "redis_client", InMemoryRedis())
+    monkeypatch.setattr(service, "counting", True)
+    yield service
+    service._counts = {}
+
+
+def get_validation_result(*anomaly_types: AbnormalityType) -> ValidationResult:
+    return ValidationResult(
+        is_abnormal=True,
+        abnormal_fields={
+            "headers:Authorization": [
+                Anomaly(type, "description") for type in anomaly_types
+            ]
+        },
+    )
+
+
+@pytest.mark.asyncio
+async def test_anomaly_stats_merged_across_flushes(
+    anomaly_stats_service: AnomalyStatsService,
+    valid_model_dto_payload: dict[str, Any],
+) -> None:
+    model_dto = ModelDto(**valid_model_dto_payload)
+    type_missmatch = AbnormalityType.TYPE_MISSMATCH
+
+    anomaly_stats_service.record(model_dto, get_validation_result(type_missmatch))
+    await anomaly_stats_service.flush()
+    anomaly_stats_service.record(
+        model_dto, get_validation_result(type_missmatch, type_missmatch)
+    )
+    # Normal results aren't counted at all.
+    anomaly_stats_service.record(model_dto, ValidationResult())
+    await anomaly_stats_service.flush()
+
+    assert await anomaly_stats_service.get_stats(3600) == [
+        {
+            "path": model_dto.path,
+            "method": model_dto.method,
+            "field": "headers:Authorization",
+            "type": type_missmatch.value,
+            "count": 3,
+        }
+    ]
+    assert await anomaly_stats_service.get_stats(3600, path="/other") == []
+
+
+@pytest.mark.asyncio
+async def test_anomaly_stats_kept_upon_failed_flush(
+    anomaly_stats_service: AnomalyStatsService,
+    valid_model_dto_payload: dict[str, Any],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    model_dto = ModelDto(**valid_model_dto_payload)
+    validation_result = get_validation_result(AbnormalityType.TYPE_MISSMATCH)
+    anomaly_stats_service.record(model_dto, validation_result)
+
+    async def incr_counts_redis(counts: Any) -> None:
+        raise ConnectionError()
+
+    with monkeypatch.context() as patch:
+        patch.setattr(anomaly_stats_service, "incr_counts_redis", incr_counts_redis)
+
+        with pytest.raises(ConnectionError):
+            await anomaly_stats_service.flush()
+
+    anomaly_stats_service.record(model_dto, validation_result)
+    await anomaly_stats_service.flush()
+    stats = await anomaly_stats_service.get_stats(3600)
+
+    assert [stat["count"] for stat in stats] == [2]
+
+
+def test_anomaly_stats_counted_by_request_service(
+    anomaly_stats_service: AnomalyStatsService,
+    valid_model_dto_payload: dict[str, Any],
+    valid_request_dto_payload: dict[str, Any],
+) -> None:
+    model_dto = ModelDto(**valid_model_dto_payload)
+    request_dto = RequestDto(**valid_request_dto_payload)
+    request_dto.headers = []
+
+    validation_result = RequestService().validate_request(request_dto, model_dto)
+
+    assert validation_result.is_abnormal
+    assert sum(anomaly_stats_service._counts.values()) == sum(
+        len(anomalies) for anomalies in validation_result.abnormal_fields.values()
+    )
@@ -0,0 +1,74 @@
+import uuid
+from typing import Any
+
+import pytest
+
+from py_mirror.app.types import Type
+from py_mirror.app.service.request_service import RequestService
+
+# Canonical forms, as well as the less common ones, the scalar checkers accept.
+VALUES: list[Any] = [
+    None,
+    1,
+    0,
+    True,
+    1.5,
+    [],
+    ["a"],
+    {},
+    "",
+    "value",
+    "1",
+    "true",
+    "Bearer token",
+    "Bearer",
+    "bearer token",
+    "user@example.com",
+    "user@example",
+    "user@example.com\n",
+    "18-10-2026",
+    "18-10-2026\n",
+    "29-02-2024",
+    "29-02-2023",
+    "31-04-2026",
+    "00-10-2026",
+    "18-10-0000",
+    " 1- 1-2026",
+    "1-1-000001",
+    "2026-10-18",
+    str(uuid.uuid4()),
+    str(uuid.uuid4()).upper(),
+    uuid.uuid4().hex,
+    "{" + str(uuid.uuid4()) + "}",
+    str(uuid.uuid4()) + "\n",
+    " " + uuid.uuid4().hex,
+    "urn:uuid:" + str(uuid.uuid4()),
+    "12345678-1234-5678-1234-56781234567g",
+]
+
+
+@pytest.mark.parametrize("type", list(Type))
+def test_column_checker_same_as_type_checker(type: Type) -> None:
+    service = RequestService()
+    type_checker = service.type_checkers[type]
+
+    assert service.column_checkers[type](VALUES) == [
+        type_checker(value) for value in VALUES
+    ]
+
+
+@pytest.mark.parametrize("type", list(Type))
+def test_column_checker_strings_only(type: Type) -> None:
+    service = RequestService()
+    type_checker = service.type_checkers[type]
+    values = [value for value in VALUES if isinstance(value, str)]
+
+    assert service.column_checkers[type](values) == [
+        type_checker(value) for value in values
+    ]
+
+
+def test_column_checker_empty() -> None:
+    service = RequestService()
+
+    assert all(checker([]) == [] for checker in service.column_checkers.values())
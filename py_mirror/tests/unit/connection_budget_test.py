@@ -0,0 +1,34 @@
+import pytest
+
+from py_mirror.app.storage.connection_budget import get_worker_connections
+
+
+def test_worker_connections_budget_not_set() -> None:
+    assert (
+        get_worker_connections({"HTTP_WORKERS": "4"}, "REDIS_CONNECTION_BUDGET") is None
+    )
+    assert (
+        get_worker_connections(
+            {"HTTP_WORKERS": "4", "REDIS_CONNECTION_BUDGET": "0"},
+            "REDIS_CONNECTION_BUDGET",
+        )
+        is None
+    )
+
+
+def test_worker_connections_split_evenly() -> None:
+    env_vars = {"HTTP_WORKERS": "4", "POSTGRES_CONNECTION_BUDGET": "90"}
+    assert get_worker_connections(env_vars, "POSTGRES_CONNECTION_BUDGET") == 22
+
+
+def test_worker_connections_single_worker() -> None:
+    env_vars = {"POSTGRES_CONNECTION_BUDGET": "90"}
+    assert get_worker_connections(env_vars, "POSTGRES_CONNECTION_BUDGET") == 90
+
+
+def test_worker_connections_less_than_workers() -> None:
+    env_vars = {"HTTP_WORKERS": "16", "POSTGRES_CONNECTION_BUDGET": "8"}
+
+    # A connection per worker would exceed the budget.
+    with pytest.raises(ValueError, match="less than HTTP_WORKERS=16"):
+        get_worker_connections(env_vars, "POSTGRES_CONNECTION_BUDGET")
@@ -1,8 +1,9 @@
 from typing import cast, Any
 
+import pytest
 from pydantic import ValidationError
 
-from py_mirror.app.types import ModelDto
+from py_mirror.app.types import ModelDto, ModelPatchDto, ModelPatchOperationDto
 
 
 def test_model_dto_success(valid_model_dto_payload: dict[str, Any]) -> None:
@@ -68,3 +69,29 @@ def test_model_dto_type_mismatch(model_dto_type_mismatch: dict[str, Any]) -> Non
     assert error["loc"][2] == "required"
     assert error["input"] == "required"
     assert error["msg"] == "Input should be a valid boolean, unable to interpret input"
+
+
+def test_model_patch_dto_operands() -> None:
+    template = {"name": "Authorization", "required": True, "types": ["String"]}
+    model_patch_dto = ModelPatchDto(
+        path="/resource1/id1",
+        method="GET",  # type: ignore
+        operations=[
+            {"op": "update", "group": "headers", "template": template},  # type: ignore
+            {"op": "remove", "group": "body", "name": "id"},  # type: ignore
+        ],
+    )
+
+    assert [op.field_name for op in model_patch_dto.operations] == [
+        "Authorization",
+        "id",
+    ]
+
+    with pytest.raises(ValidationError):
+        ModelPatchOperationDto(op="add", group="headers", name="Authorization")  # type: ignore
+
+    with pytest.raises(ValidationError):
+        ModelPatchOperationDto(op="remove", group="headers")  # type: ignore
+
+    with pytest.raises(ValidationError):
+        ModelPatchDto(path="/resource1/id1", method="GET", operations=[])  # type: ignore
@@ -0,0 +1,72 @@
+import json
+from typing import Any, AsyncIterator
+
+import pytest
+
+from py_mirror.app.service.import_service import ImportService
+
+
+async def as_chunks(data: bytes, chunk_size: int) -> AsyncIterator[bytes]:
+    for i in range(0, len(data), chunk_size):
+        yield data[i : i + chunk_size]
+
+
+async def collect(items: AsyncIterator[bytes]) -> list[Any]:
+    return [json.loads(item) async for item in items]
+
+
+@pytest.mark.asyncio
+async def test_split_array_items(valid_model_dto_payload: dict[str, Any]) -> None:
+    items = [
+        valid_model_dto_payload,
+        {**valid_model_dto_payload, "path": '/a,b]}{["\\\\"'},
+        [1, {"a": [2]}],
+        "x\\",
+    ]
+    data = b" \n" + json.dumps(items).encode() + b" \n"
+
+    # Items must not depend on the boundaries of the chunks.
+    for chunk_size in (1, 2, 3, 7, len(data)):
+        chunks = as_chunks(data, chunk_size)
+        assert await collect(ImportService().split_items(chunks)) == items
+
+
+@pytest.mark.asyncio
+async def test_split_ndjson_items(valid_model_dto_payload: dict[str, Any]) -> None:
+    items = [valid_model_dto_payload, {**valid_model_dto_payload, "path": "/a"}]
+    data = b"\n".join(json.dumps(item).encode() for item in items)
+
+    for chunk_size in (1, 5, len(data)):
+        chunks = as_chunks(b"\n" + data + b"\n\n", chunk_size)
+        assert await collect(ImportService().split_items(chunks)) == items
+
+
+@pytest.mark.asyncio
+async def test_split_array_items_truncated() -> None:
+    with pytest.raises(ValueError):
+        await collect(ImportService().split_items(as_chunks(b'[{"a": 1}, {', 4)))
+
+
+@pytest.mark.asyncio
+async def test_import_models_failures(
+    valid_model_dto_payload: dict[str, Any],
+) -> None:
+    items = [
+        {**valid_model_dto_payload, "method": "GEET"},
+        {**valid_model_dto_payload, "path": "/users/{id:float}"},
+    ]
+    data = json.dumps(items).encode()
+    progresses = [
+        progress
+        async for progress in ImportService().import_models(as_chunks(data, 16))
+    ]
+
+    assert len(progresses) == 1
+    assert progresses[0].done
+    assert (progresses[0].rows, progresses[0].imported, progresses[0].failed) == (
+        2,
+        0,
+        2,
+    )
+    assert [failure.row for failure in progresses[0].failures] == [1, 2]
+    assert progresses[0].failures[0].error[0]["loc"] == ("method",)
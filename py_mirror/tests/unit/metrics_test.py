@@ -0,0 +1,24 @@
+from py_mirror.app.metrics import Histogram, Counter
+
+
+def test_histogram_render() -> None:
+    histogram = Histogram("latency", {"stage": "a"}, buckets=(0.1, 1.0))
+
+    for value in (0.05, 0.1, 0.5, 5):
+        histogram.observe(value)
+
+    assert histogram.render() == [
+        'latency_bucket{stage="a",le="0.1"} 2',
+        'latency_bucket{stage="a",le="1.0"} 3',
+        'latency_bucket{stage="a",le="+Inf"} 4',
+        'latency_sum{stage="a"} 5.65',
+        'latency_count{stage="a"} 4',
+    ]
+
+
+def test_counter_render() -> None:
+    counter = Counter("lookups_total", {"source": "redis", "result": "hit"})
+    counter.inc()
+    counter.inc(2)
+
+    assert counter.render() == ['lookups_total{source="redis",result="hit"} 3']
@@ -0,0 +1,137 @@
+import asyncio
+from typing import Any, Iterator
+
+import pytest
+
+from py_mirror.app.types import ModelDto
+from py_mirror.app.service.model_cache import ModelCache
+
+
+@pytest.fixture(scope="function", autouse=False)
+def model_cache() -> Iterator[ModelCache]:
+    cache = ModelCache()
+    max_size, ttl = cache.max_size, cache.ttl
+    cache.max_size, cache.ttl = 2, 60
+    cache.invalidate()
+    yield cache
+    cache.max_size, cache.ttl = max_size, ttl
+    cache.invalidate()
+
+
+def test_model_cache_hit_and_miss(
+    model_cache: ModelCache, valid_model_dto_payload: dict[str, Any]
+) -> None:
+    model_dto = ModelDto(**valid_model_dto_payload)
+    hits, misses = model_cache.hits, model_cache.misses
+
+    assert model_cache.get("/resource1/id1:GET") is None
+    model_cache.put("/resource1/id1:GET", model_dto)
+    assert model_cache.get("/resource1/id1:GET") is model_dto
+    assert model_cache.hits == hits + 1
+    assert model_cache.misses == misses + 1
+
+
+def test_model_cache_lru_eviction(
+    model_cache: ModelCache, valid_model_dto_payload: dict[str, Any]
+) -> None:
+    model_dto = ModelDto(**valid_model_dto_payload)
+    evictions = model_cache.evictions
+
+    model_cache.put("a", model_dto)
+    model_cache.put("b", model_dto)
+    model_cache.get("a")  # "b" becomes the least recently used one.
+    model_cache.put("c", model_dto)
+
+    assert model_cache.evictions == evictions + 1
+    assert model_cache.get("b") is None
+    assert model_cache.get("a") is model_dto
+    assert model_cache.get("c") is model_dto
+
+
+def test_model_cache_ttl_expiration(
+    model_cache: ModelCache, valid_model_dto_payload: dict[str, Any]
+) -> None:
+    model_cache.ttl = 0
+    model_dto = ModelDto(**valid_model_dto_payload)
+    expirations = model_cache.expirations
+    model_cache.put("a", model_dto)
+
+    assert model_cache.get("a") is None
+    assert model_cache.get("a") is None
+    # Counted once, although kept, and accessed again.
+    assert model_cache.expirations == expirations + 1
+    # Expired models are served as stale, while another worker refreshes them.
+    assert model_cache.get_stale("a") is model_dto
+
+    # Expires again, once replaced.
+    model_cache.put("a", model_dto)
+    assert model_cache.get("a") is None
+    assert model_cache.expirations == expirations + 2
+
+    model_cache.invalidate("a")
+    assert model_cache.get_stale("a") is None
+
+
+def test_model_cache_put_skipped_after_invalidation(
+    model_cache: ModelCache, valid_model_dto_payload: dict[str, Any]
+) -> None:
+    generation = model_cache.generation
+    model_cache.invalidate("a")
+    model_cache.put("a", ModelDto(**valid_model_dto_payload), generation)
+
+    assert model_cache.get("a") is None
+
+
+def test_model_cache_negative_entries(model_cache: ModelCache) -> None:
+    generation = model_cache.generation
+    model_cache.put_missing("a", generation)
+
+    assert model_cache.is_missing("a")
+    assert not model_cache.is_missing("b")
+
+    # E.g. the model was created by another worker.
+    model_cache.invalidate("a")
+    assert not model_cache.is_missing("a")
+
+    model_cache.put_missing("a", generation)
+    assert not model_cache.is_missing("a")
+
+
+@pytest.mark.asyncio
+async def test_model_cache_coalesced_misses(
+    model_cache: ModelCache, valid_model_dto_payload: dict[str, Any]
+) -> None:
+    model_dto = ModelDto(**valid_model_dto_payload)
+    fetched_keys: list[list[str]] = []
+    coalesced = model_cache.coalesced
+
+    async def fetch(keys: list[str]) -> dict[str, ModelDto | None]:
+        fetched_keys.append(keys)
+        await asyncio.sleep(0.01)
+        return {"a": model_dto, "b": None}
+
+    results = await asyncio.gather(
+        *(model_cache.coalesce(["a"], fetch) for _ in range(10)),
+        model_cache.coalesce(["a", "b"], fetch),
+    )
+
+    assert fetched_keys == [["a"], ["b"]]
+    assert model_cache.coalesced == coalesced + 10
+    assert all(result["a"] is model_dto for result in results)
+    assert results[-1]["b"] is None
+    assert model_cache.stats().in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_model_cache_coalesced_failure(model_cache: ModelCache) -> None:
+    async def fetch(keys: list[str]) -> dict[str, ModelDto | None]:
+        await asyncio.sleep(0.01)
+        raise ConnectionError()
+
+    results = await asyncio.gather(
+        *(model_cache.coalesce(["a"], fetch) for _ in range(3)),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, ConnectionError) for result in results)
+    assert model_cache.stats().in_flight == 0
@@ -0,0 +1,42 @@
+from typing import Iterator
+
+import pytest
+
+from py_mirror.app.service.model_filter import ModelFilter
+
+
+@pytest.fixture(scope="function", autouse=False)
+def model_filter() -> Iterator[ModelFilter]:
+    model_filter = ModelFilter()
+    yield model_filter
+    model_filter.ready = False
+    model_filter.pending = None
+
+
+def test_model_filter_not_ready(model_filter: ModelFilter) -> None:
+    assert model_filter.might_contain("/unknown:GET")
+
+
+def test_model_filter_no_false_negatives(model_filter: ModelFilter) -> None:
+    keys = [f"/resource{i}:GET" for i in range(20_000)]
+    model_filter.build(keys[:10_000])
+
+    for key in keys[10_000:]:
+        model_filter.add(key)
+
+    assert all(model_filter.might_contain(key) for key in keys)
+    false_positives = sum(
+        model_filter.might_contain(f"/unknown{i}:GET") for i in range(10_000)
+    )
+    assert false_positives < 10_000 * model_filter.error_rate * 3
+
+
+def test_model_filter_keys_added_during_build(model_filter: ModelFilter) -> None:
+    model_filter.begin_build()
+    # Saved after the keys were fetched from PG, but prior the build.
+    model_filter.add("/saved:POST")
+    model_filter.build(["/resource:GET"])
+
+    assert model_filter.might_contain("/saved:POST")
+    assert model_filter.might_contain("/resource:GET")
+    assert not model_filter.might_contain("/unknown:GET")
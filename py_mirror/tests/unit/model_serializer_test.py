@@ -0,0 +1,111 @@
+from typing import Any
+
+import pytest
+
+from py_mirror.app.types import ModelDto
+from py_mirror.app.storage.redis.serializer import (
+    ModelSerializer,
+    CODECS,
+    FLAG_ZSTD,
+    HASH_FIELDS,
+    MAGIC,
+)
+
+
+@pytest.mark.parametrize("codec_name", ["json", "orjson", "msgpack"])
+@pytest.mark.parametrize("zstd_threshold", [0, 1])
+def test_model_serializer_round_trip(
+    valid_model_dto_payload: dict[str, Any], codec_name: str, zstd_threshold: int
+) -> None:
+    serializer = ModelSerializer()
+    codec, threshold = serializer.codec, serializer.zstd_threshold
+    serializer.codec, serializer.zstd_threshold = CODECS[codec_name], zstd_threshold
+    model_dto = ModelDto(**valid_model_dto_payload, version=7)
+
+    try:
+        serialized_model = serializer.encode(model_dto)
+        parsed_model_dto = serializer.decode(serialized_model)
+    finally:
+        serializer.codec, serializer.zstd_threshold = codec, threshold
+
+    assert bool(serialized_model[3] & FLAG_ZSTD) == bool(zstd_threshold)
+    assert parsed_model_dto == model_dto
+
+
+def test_model_serializer_legacy_json(
+    valid_model_dto_payload: dict[str, Any],
+) -> None:
+    model_dto = ModelDto(**valid_model_dto_payload)
+
+    parsed_model_dto = ModelSerializer().decode(model_dto.model_dump_json().encode())
+
+    assert parsed_model_dto == model_dto
+
+
+def test_model_serializer_schema_version_1(
+    valid_model_dto_payload: dict[str, Any],
+) -> None:
+    model_dto = ModelDto(**valid_model_dto_payload)
+    serializer = ModelSerializer()
+    groups = [
+        serializer.encode_templates(getattr(model_dto, group))
+        for group in ("query_params", "headers", "body")
+    ]
+    payload = CODECS["json"].encode([model_dto.path, model_dto.method.value, groups])
+
+    parsed_model_dto = serializer.decode(
+        MAGIC + bytes((1, CODECS["json"].id)) + payload
+    )
+
+    assert parsed_model_dto == model_dto
+    assert parsed_model_dto.version == 0
+
+
+@pytest.mark.parametrize("zstd_threshold", [0, 1])
+def test_model_serializer_fields_round_trip(
+    valid_model_dto_payload: dict[str, Any], zstd_threshold: int
+) -> None:
+    serializer = ModelSerializer()
+    threshold, serializer.zstd_threshold = serializer.zstd_threshold, zstd_threshold
+    model_dto = ModelDto(**valid_model_dto_payload, version=7)
+
+    try:
+        fields = serializer.encode_fields(model_dto)
+        parsed_model_dto = serializer.decode_fields(dict(fields))
+    finally:
+        serializer.zstd_threshold = threshold
+
+    assert list(fields) == list(HASH_FIELDS)
+    assert parsed_model_dto == model_dto
+
+
+def test_model_serializer_partial_fields(
+    valid_model_dto_payload: dict[str, Any],
+) -> None:
+    serializer = ModelSerializer()
+    valid_model_dto_payload["body"] = [
+        {"name": "id", "required": True, "types": ["Int"]},
+        {"name": "note", "required": False, "types": ["String"]},
+    ]
+    model_dto = ModelDto(**valid_model_dto_payload)
+    fields: dict[str, bytes | None] = {**serializer.encode_fields(model_dto)}
+    fields["body"] = None
+
+    parsed_model_dto = serializer.decode_fields(fields)
+
+    assert parsed_model_dto.headers == model_dto.headers
+    # Only the required fields of the groups, which weren't fetched, without types.
+    assert [(t.name, t.required, t.types) for t in parsed_model_dto.body] == [
+        ("id", True, [])
+    ]
+
+
+def test_model_serializer_fields_of_groups(
+    valid_model_dto_payload: dict[str, Any],
+) -> None:
+    model_dto = ModelDto(**valid_model_dto_payload)
+
+    fields = ModelSerializer().encode_fields(model_dto, {"headers"})
+
+    # Along with the meta and the required fields of all the groups.
+    assert list(fields) == ["meta", "required", "headers"]
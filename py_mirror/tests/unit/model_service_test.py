@@ -0,0 +1,179 @@
+import asyncio
+from typing import Any
+
+import orjson
+import pytest
+
+from py_mirror.app.metrics import MODEL_PARSE_DURATION, REDIS_GET_DURATION
+from py_mirror.app.types import (
+    ModelDto,
+    ModelGroup,
+    ModelPatchOp,
+    ModelPatchOperationDto,
+    Type,
+    ValidationUnitTemplateDto,
+)
+from py_mirror.app.service.model_service import MODEL_HASH_PREFIX, ModelService
+from py_mirror.tests.benchmarks.stand_ins import InMemoryRedis
+
+
+def test_parse_model_record_pg_same_as_orm_row(
+    valid_model_dto_payload: dict[str, Any],
+) -> None:
+    model_service = ModelService()
+    model_dto = ModelDto(**valid_model_dto_payload)
+    values = {**model_service.get_values_pg(model_dto), "version": 3}
+    # The row of GET_MODEL_PG_SQL, JSONB fetched as text.
+    record = (
+        values["path"],
+        model_service.get_method(values["method"]),
+        orjson.dumps(values["query_params"]).decode(),
+        orjson.dumps(values["headers"]).decode(),
+        orjson.dumps(values["body"]).decode(),
+        values["version"],
+    )
+
+    parsed_model_dto = model_service.parse_model_record_pg(record)
+    expected_model_dto = model_service.parse_model_pg(values)  # type: ignore
+
+    # The derived maps are excluded, they are never read past saving.
+    assert parsed_model_dto.model_dump() == expected_model_dto.model_dump()
+    assert parsed_model_dto.method is expected_model_dto.method
+
+
+@pytest.fixture(scope="function", autouse=False)
+def hash_model_service(monkeypatch: pytest.MonkeyPatch) -> ModelService:
+    model_service = ModelService()
+    model_service.redis_client = InMemoryRedis()  # type: ignore
+    monkeypatch.setattr(model_service.model_serializer, "layout", "hash")
+    return model_service
+
+
+@pytest.mark.asyncio
+async def test_models_redis_hash_layout(
+    hash_model_service: ModelService, valid_model_dto_payload: dict[str, Any]
+) -> None:
+    model_dto = ModelDto(**valid_model_dto_payload, version=2)
+    key = hash_model_service.get_key(model_dto.path, model_dto.method)
+    redis_client: InMemoryRedis = hash_model_service.redis_client  # type: ignore
+    # Stale string of the same model.
+    redis_client._set(key, hash_model_service.serialize_model_redis(model_dto))
+
+    await hash_model_service.set_models_redis_pipeline([model_dto])
+
+    assert key not in redis_client.values
+    assert f"{MODEL_HASH_PREFIX}{key}" in redis_client.hashes
+    models = await hash_model_service.get_models_redis([key])
+    assert models == {key: model_dto}
+
+    partial_model_dto = await hash_model_service.get_partial_model_redis(
+        model_dto.path, model_dto.method, ["query_params"]
+    )
+    assert partial_model_dto is not None
+    assert partial_model_dto.version == model_dto.version
+    # Headers weren't fetched, only the names of the required ones.
+    assert [t.name for t in partial_model_dto.headers] == [
+        t.name for t in model_dto.headers if t.required
+    ]
+
+
+@pytest.mark.asyncio
+async def test_models_redis_hash_layout_reads_strings(
+    hash_model_service: ModelService,
+    valid_model_dto_payload: dict[str, Any],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    model_dto = ModelDto(**valid_model_dto_payload, version=2)
+    key = hash_model_service.get_key(model_dto.path, model_dto.method)
+    redis_client: InMemoryRedis = hash_model_service.redis_client  # type: ignore
+    redis_client._set(key, hash_model_service.serialize_model_redis(model_dto))
+    migrated: list[ModelDto] = []
+
+    async def set_missing_models_redis(model_dtos: list[ModelDto]) -> None:
+        migrated.extend(model_dtos)
+
+    monkeypatch.setattr(
+        hash_model_service, "set_missing_models_redis", set_missing_models_redis
+    )
+
+    models = await hash_model_service.get_models_redis([key, "/missing:GET"])
+    await asyncio.sleep(0)
+
+    assert models == {key: model_dto, "/missing:GET": None}
+    # Stored as a hash in the background.
+    assert migrated == [model_dto]
+    assert (
+        await hash_model_service.get_partial_model_redis(
+            model_dto.path, model_dto.method, ["headers"]
+        )
+        is None
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_model_partial_redis(
+    hash_model_service: ModelService,
+    valid_model_dto_payload: dict[str, Any],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    model_dto = ModelDto(**valid_model_dto_payload, version=2)
+    await hash_model_service.set_models_redis_pipeline([model_dto])
+    touched: list[list[str]] = []
+    monkeypatch.setattr(hash_model_service, "touch_models", touched.append)
+    monkeypatch.setattr(hash_model_service, "is_unknown", lambda key: False)
+    # Partial models are fetched only if nothing is cached.
+    monkeypatch.setattr(hash_model_service.model_cache, "max_size", 0)
+    redis_gets, parses = (
+        sum(REDIS_GET_DURATION.counts),
+        sum(MODEL_PARSE_DURATION.counts),
+    )
+
+    partial_model_dto = await hash_model_service.get_model(
+        model_dto.path, model_dto.method, groups=["query_params"]
+    )
+
+    assert partial_model_dto is not None
+    assert partial_model_dto.version == model_dto.version
+    # Observed and touched, the same as the whole models.
+    assert sum(REDIS_GET_DURATION.counts) == redis_gets + 1
+    assert sum(MODEL_PARSE_DURATION.counts) == parses + 1
+    assert touched == [[hash_model_service.get_key(model_dto.path, model_dto.method)]]
+
+
+def test_check_patch_operations() -> None:
+    model_service = ModelService()
+    template = ValidationUnitTemplateDto(name="id", required=True, types=[Type.Int])
+    remove = ModelPatchOperationDto(
+        op=ModelPatchOp.REMOVE, group=ModelGroup.BODY, name="id"
+    )
+    add = ModelPatchOperationDto(
+        op=ModelPatchOp.ADD, group=ModelGroup.BODY, template=template
+    )
+    update = ModelPatchOperationDto(
+        op=ModelPatchOp.UPDATE, group=ModelGroup.BODY, template=template
+    )
+
+    # Each operation is checked against the outcome of the previous ones.
+    model_service.check_patch_operations([remove, add, update], {("body", "id"): True})
+
+    with pytest.raises(ValueError, match="already exists"):
+        model_service.check_patch_operations([add], {("body", "id"): True})
+
+    with pytest.raises(ValueError, match="doesn't exist"):
+        model_service.check_patch_operations([remove, update], {("body", "id"): True})
+
+
+@pytest.mark.asyncio
+async def test_build_model_indexes_failed(monkeypatch: pytest.MonkeyPatch) -> None:
+    model_service = ModelService()
+
+    async def get_paths_methods_pg() -> list[tuple[str, str]]:
+        raise ConnectionRefusedError()
+
+    monkeypatch.setattr(model_service, "get_paths_methods_pg", get_paths_methods_pg)
+
+    await model_service.build_model_indexes()
+
+    # Models, saved afterwards, aren't kept for a build, which never happens.
+    assert model_service.route_index.pending is None
+    assert model_service.model_filter.pending is None
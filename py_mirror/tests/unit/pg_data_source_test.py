@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from py_mirror.app.storage.pg.data_source import DataSource as PgDataSource
+
+
+async def get_async_engine() -> AsyncEngine:
+    return PgDataSource().async_engine
+
+
+def test_async_engine_per_event_loop() -> None:
+    data_source = PgDataSource()
+    first_loop, second_loop = asyncio.new_event_loop(), asyncio.new_event_loop()
+
+    try:
+        first_engine = first_loop.run_until_complete(get_async_engine())
+        second_engine = second_loop.run_until_complete(get_async_engine())
+
+        assert first_engine is not second_engine
+        assert first_loop.run_until_complete(get_async_engine()) is first_engine
+        # Pooled in any environment, including TEST.
+        assert isinstance(first_engine.pool, AsyncAdaptedQueuePool)
+    finally:
+        first_loop.close()
+
+    # Engines of the closed event loops are discarded, once another one is created.
+    third_loop = asyncio.new_event_loop()
+
+    try:
+        third_loop.run_until_complete(get_async_engine())
+        assert first_loop not in data_source._async_engines
+        assert second_loop in data_source._async_engines
+    finally:
+        second_loop.run_until_complete(data_source.dispose())
+        second_loop.close()
+        third_loop.run_until_complete(data_source.dispose())
+        third_loop.close()
+
+    assert second_loop not in data_source._async_engines
+    assert third_loop not in data_source._async_engines
+
+
+@pytest.mark.asyncio
+async def test_async_session_bound_to_running_event_loop_engine() -> None:
+    data_source = PgDataSource()
+
+    async with data_source.async_session() as async_session:
+        assert async_session.bind is data_source.async_engine
+
+
+@pytest.mark.parametrize(
+    "max_overflow, budget, expected_pool_size, expected_max_overflow",
+    [
+        # The share of each worker is 25 connections.
+        ("10", "100", 10, 10),
+        ("0", "100", 10, 0),
+        ("10", "60", 10, 5),
+        ("10", "20", 5, 0),
+    ],
+)
+def test_async_engine_connection_budget(
+    monkeypatch: pytest.MonkeyPatch,
+    max_overflow: str,
+    budget: str,
+    expected_pool_size: int,
+    expected_max_overflow: int,
+) -> None:
+    data_source = PgDataSource()
+    monkeypatch.setattr(
+        data_source,
+        "_env_vars",
+        {
+            **data_source._env_vars,
+            "SQLALCHEMY_POOL_SIZE": "10",
+            "SQLALCHEMY_MAX_OVERFLOW": max_overflow,
+            "POSTGRES_CONNECTION_BUDGET": budget,
+            "HTTP_WORKERS": "4",
+        },
+    )
+    async_engine = data_source._get_async_engine()
+
+    try:
+        pool: AsyncAdaptedQueuePool = async_engine.pool  # type: ignore
+        assert pool.size() == expected_pool_size
+        # Never raised beyond SQLALCHEMY_MAX_OVERFLOW.
+        assert pool._max_overflow == expected_max_overflow
+    finally:
+        async_engine.sync_engine.dispose(close=False)
@@ -0,0 +1,131 @@
+from typing import Any
+
+from py_mirror.app.types import ModelDto, RequestDto, AbnormalityType
+from py_mirror.app.service.request_service import RequestService
+
+
+def test_validate_request_not_abnormal(
+    valid_model_dto_payload: dict[str, Any], valid_request_dto_payload: dict[str, Any]
+) -> None:
+    model_dto = ModelDto(**valid_model_dto_payload)
+    request_dto = RequestDto(**valid_request_dto_payload)
+
+    response = RequestService().validate_request(request_dto, model_dto)
+
+    assert response.is_abnormal is False
+    assert response.abnormal_fields == {}
+
+
+def test_validate_request_abnormal(
+    valid_model_dto_payload: dict[str, Any], valid_request_dto_payload: dict[str, Any]
+) -> None:
+    model_dto = ModelDto(**valid_model_dto_payload)
+    valid_request_dto_payload["headers"] = [
+        {"name": "Authorization", "value": 1},
+        {"name": "X-Unknown", "value": "value"},
+    ]
+    request_dto = RequestDto(**valid_request_dto_payload)
+
+    response = RequestService().validate_request(request_dto, model_dto)
+
+    assert response.is_abnormal is True
+    assert [
+        reason.type for reason in response.abnormal_fields["headers:Authorization"]
+    ] == [AbnormalityType.TYPE_MISSMATCH]
+    assert [
+        reason.type for reason in response.abnormal_fields["headers:X-Unknown"]
+    ] == [AbnormalityType.VALIDATION_TEMPLATE_MISSING]
+    assert [
+        reason.type for reason in response.abnormal_fields["headers:Content-Type"]
+    ] == [AbnormalityType.REQUIRED_FIELD_MISSING]
+
+
+def test_validate_request_does_not_mutate_model(
+    valid_model_dto_payload: dict[str, Any], valid_request_dto_payload: dict[str, Any]
+) -> None:
+    model_dto = ModelDto(**valid_model_dto_payload)
+    service = RequestService()
+
+    service.validate_request(RequestDto(**valid_request_dto_payload), model_dto)
+    valid_request_dto_payload["headers"] = []
+    response = service.validate_request(
+        RequestDto(**valid_request_dto_payload), model_dto
+    )
+
+    assert set(response.abnormal_fields) == {
+        "headers:Authorization",
+        "headers:Content-Type",
+    }
+
+
+def test_validate_request_missing_required_fields_across_groups(
+    valid_model_dto_payload: dict[str, Any], valid_request_dto_payload: dict[str, Any]
+) -> None:
+    valid_model_dto_payload["query_params"] = [
+        {"name": "id", "required": True, "types": ["Int"]},
+        {"name": "page", "required": False, "types": ["Int"]},
+    ]
+    valid_model_dto_payload["body"] = [
+        {"name": "email", "required": True, "types": ["Email"]},
+    ]
+    model_dto = ModelDto(**valid_model_dto_payload)
+    valid_request_dto_payload["query_params"] = [{"name": "page", "value": 1}]
+    request_dto = RequestDto(**valid_request_dto_payload)
+
+    response = RequestService().validate_request(request_dto, model_dto)
+
+    assert set(response.abnormal_fields) == {"query_params:id", "body:email"}
+    assert all(
+        reasons[0].type == AbnormalityType.REQUIRED_FIELD_MISSING
+        for reasons in response.abnormal_fields.values()
+    )
+
+
+def test_validate_requests_same_as_validate_request(
+    valid_model_dto_payload: dict[str, Any], valid_request_dto_payload: dict[str, Any]
+) -> None:
+    valid_model_dto_payload["query_params"] = [
+        {"name": "id", "required": False, "types": ["Int", "UUID"]},
+        {"name": "since", "required": False, "types": ["Date"]},
+    ]
+    model_dto = ModelDto(**valid_model_dto_payload)
+    query_params = [
+        [{"name": "id", "value": 1}, {"name": "since", "value": "29-02-2024"}],
+        [{"name": "id", "value": "{12345678-1234-5678-1234-567812345678}"}],
+        [{"name": "id", "value": "1"}, {"name": "since", "value": "29-02-2023"}],
+        [{"name": "id", "value": None}, {"name": "id", "value": [1]}],
+        [{"name": "X-Unknown", "value": "value"}],
+    ]
+    request_dtos = [
+        RequestDto(**{**valid_request_dto_payload, "query_params": params})
+        for params in query_params
+    ]
+    request_dtos.append(RequestDto(**{**valid_request_dto_payload, "headers": []}))
+    service = RequestService()
+
+    validation_results = service.validate_requests(
+        [(request_dto, model_dto) for request_dto in request_dtos]
+    )
+
+    assert validation_results == [
+        service.validate_request(request_dto, model_dto) for request_dto in request_dtos
+    ]
+    assert [
+        validation_result.is_abnormal for validation_result in validation_results
+    ] == [
+        False,
+        False,
+        True,
+        True,
+        True,
+        True,
+    ]
+
+
+def test_checkers_built_once() -> None:
+    service = RequestService()
+    column_checkers = service.column_checkers
+
+    # Constructed per request, hence shared, as the other services.
+    assert RequestService() is service
+    assert RequestService().column_checkers is column_checkers
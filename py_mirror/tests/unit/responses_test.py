@@ -0,0 +1,57 @@
+import json
+
+from fastapi.encoders import jsonable_encoder
+
+from py_mirror.app.types import (
+    AbnormalityType,
+    ModelVersionDto,
+    ResponseDto,
+    HttpMethod,
+)
+from py_mirror.app.runtime_types import Anomaly, ValidationResult
+from py_mirror.app.api.responses import (
+    NOT_ABNORMAL_BODY,
+    ORJSONResponse,
+    render_response_dto,
+    render_validation_result,
+)
+
+
+def encode_legacy(data: object, error: object) -> object:
+    return jsonable_encoder(ResponseDto(data=data, error=error))
+
+
+def test_render_validation_result_not_abnormal() -> None:
+    validation_result = ValidationResult()
+
+    assert render_validation_result(validation_result) is NOT_ABNORMAL_BODY
+    assert json.loads(NOT_ABNORMAL_BODY) == encode_legacy(
+        validation_result.to_dto(), None
+    )
+
+
+def test_render_validation_result_abnormal() -> None:
+    anomaly = Anomaly(AbnormalityType.TYPE_MISSMATCH, "Expected Int")
+    validation_result = ValidationResult(
+        is_abnormal=True, abnormal_fields={"id": [anomaly, anomaly]}
+    )
+
+    assert json.loads(render_validation_result(validation_result)) == encode_legacy(
+        validation_result.to_dto(), None
+    )
+
+
+def test_render_response_dto_of_dto() -> None:
+    model_version_dto = ModelVersionDto(path="/users", method=HttpMethod.GET, version=3)
+
+    assert json.loads(render_response_dto(model_version_dto, None)) == encode_legacy(
+        model_version_dto, None
+    )
+
+
+def test_orjson_response_pre_serialized_body() -> None:
+    response = ORJSONResponse(status_code=500, content=NOT_ABNORMAL_BODY)
+
+    assert response.body == NOT_ABNORMAL_BODY
+    assert response.headers["content-type"] == "application/json"
+    assert response.headers["content-length"] == str(len(NOT_ABNORMAL_BODY))
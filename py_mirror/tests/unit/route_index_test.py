@@ -0,0 +1,63 @@
+from typing import Iterator
+
+import pytest
+from pydantic import ValidationError
+
+from py_mirror.app.types import ModelDto, HttpMethod
+from py_mirror.app.service.route_index import RouteIndex
+
+USER_ID = "0b5f7c4e-4f4e-4a4e-9a4e-4f4e4a4e9a4e"
+
+
+@pytest.fixture(scope="function", autouse=False)
+def route_index() -> Iterator[RouteIndex]:
+    route_index = RouteIndex()
+    route_index.build(
+        [
+            ("/users/me", "GET"),
+            ("/users/{id:int}", "GET"),
+            ("/users/{id:uuid}", "GET"),
+            ("/users/{name}", "GET"),
+            ("/users/{id:int}/orders/{order_id:int}", "GET"),
+            ("/users/me/settings", "GET"),
+            ("/users/{name}/orders", "GET"),
+            ("/users/{id:int}", "DELETE"),
+        ]
+    )
+    yield route_index
+    route_index.build([])
+    route_index.ready = False
+
+
+def test_precedence(route_index: RouteIndex) -> None:
+    assert route_index.match("/users/me", "GET") == "/users/me"
+    assert route_index.match("/users/1", "GET") == "/users/{id:int}"
+    assert route_index.match(f"/users/{USER_ID}", "GET") == "/users/{id:uuid}"
+    assert route_index.match("/users/john", "GET") == "/users/{name}"
+    assert route_index.match("/users/1/orders/2", "GET") == (
+        "/users/{id:int}/orders/{order_id:int}"
+    )
+
+
+def test_backtracking(route_index: RouteIndex) -> None:
+    # Neither "/users/me/orders", nor "/users/{id:int}/orders" exist.
+    assert route_index.match("/users/me/orders", "GET") == "/users/{name}/orders"
+    assert route_index.match("/users/1/orders", "GET") == "/users/{name}/orders"
+
+
+def test_no_match(route_index: RouteIndex) -> None:
+    assert route_index.match("/users", "GET") is None
+    assert route_index.match("/users/", "GET") is None
+    assert route_index.match("/users/john", "DELETE") is None
+    assert route_index.match("/users/1", "POST") is None
+
+
+def test_invalid_path_parameter() -> None:
+    with pytest.raises(ValidationError):
+        ModelDto(
+            path="/users/{id:float}",
+            method=HttpMethod.GET,
+            query_params=[],
+            headers=[],
+            body=[],
+        )
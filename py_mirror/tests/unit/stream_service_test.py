@@ -0,0 +1,33 @@
+from typing import AsyncGenerator
+
+import pytest
+
+from py_mirror.app.service.stream_service import StreamService
+
+
+async def iterate(chunks: list[bytes]) -> AsyncGenerator[bytes, None]:
+    for chunk in chunks:
+        yield chunk
+
+
+@pytest.mark.asyncio
+async def test_split_lines() -> None:
+    # Lines within a chunk, spanning several chunks, empty, and unterminated.
+    chunks = [b"a\nb", b"c", b"d\n\ne", b"f\n", b"g"]
+
+    lines = [line async for line in StreamService().split_lines(iterate(chunks))]
+
+    assert lines == [b"a", b"bcd", b"", b"ef", b"g"]
+
+
+@pytest.mark.asyncio
+async def test_split_lines_too_long() -> None:
+    chunks = iterate([b"a\n", b"bc", b"de"])
+    lines = StreamService().split_lines(chunks, max_line_size=3)
+
+    assert await lines.__anext__() == b"a"
+
+    with pytest.raises(ValueError, match="Line exceeds 3 bytes"):
+        await lines.__anext__()
+
+    await chunks.aclose()
@@ -0,0 +1,111 @@
+import asyncio
+from typing import Any, Iterator
+
+import pytest
+
+from py_mirror.app.types import ModelDto, RequestDto
+from py_mirror.app.runtime_types import ValidationResult
+from py_mirror.app.service.validation_result_service import (
+    ValidationRecord,
+    ValidationResultService,
+)
+
+
+@pytest.fixture(scope="function", autouse=False)
+def validation_result_service(
+    monkeypatch: pytest.MonkeyPatch,
+) -> Iterator[ValidationResultService]:
+    service = ValidationResultService()
+    written: list[list[ValidationRecord]] = []
+
+    async def write_results_pg(records: list[ValidationRecord]) -> None:
+        written.append(records)
+
+    monkeypatch.setattr(service, "write_results_pg", write_results_pg)
+    monkeypatch.setattr(service, "queue_size", 2)
+    monkeypatch.setattr(service, "batch_size", 2)
+    monkeypatch.setattr(service, "flush_interval", 0.01)
+    service.written = written  # type: ignore
+    yield service
+    service._queue, service._batch = None, []
+
+
+async def start(service: ValidationResultService) -> "asyncio.Task[None]":
+    task = asyncio.create_task(service.run())
+    # The queue is created by the task itself.
+    await asyncio.sleep(0)
+    return task
+
+
+async def stop(service: ValidationResultService, task: "asyncio.Task[None]") -> None:
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    await service.flush()
+
+
+@pytest.mark.asyncio
+async def test_validation_results_not_recorded_unless_running(
+    validation_result_service: ValidationResultService,
+    valid_model_dto_payload: dict[str, Any],
+    valid_request_dto_payload: dict[str, Any],
+) -> None:
+    await validation_result_service.record(
+        RequestDto(**valid_request_dto_payload),
+        ModelDto(**valid_model_dto_payload),
+        ValidationResult(),
+    )
+
+    assert validation_result_service.queue_length() == 0
+    await validation_result_service.flush()
+    assert validation_result_service.written == []  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_validation_results_written_in_batches(
+    validation_result_service: ValidationResultService,
+    valid_model_dto_payload: dict[str, Any],
+    valid_request_dto_payload: dict[str, Any],
+) -> None:
+    request_dto = RequestDto(**valid_request_dto_payload)
+    model_dto = ModelDto(**valid_model_dto_payload)
+    task = await start(validation_result_service)
+
+    for _ in range(3):
+        await validation_result_service.record(
+            request_dto, model_dto, ValidationResult()
+        )
+        await asyncio.sleep(0)
+
+    await asyncio.sleep(0.05)
+    await stop(validation_result_service, task)
+
+    written = validation_result_service.written  # type: ignore
+    assert [len(records) for records in written] == [2, 1]
+    record = written[0][0]
+    assert record.path == request_dto.path
+    assert record.model_path == model_dto.path
+    assert record.model_version == model_dto.version
+
+
+@pytest.mark.asyncio
+async def test_validation_results_dropped_once_queue_is_full(
+    validation_result_service: ValidationResultService,
+    valid_model_dto_payload: dict[str, Any],
+    valid_request_dto_payload: dict[str, Any],
+) -> None:
+    request_dto = RequestDto(**valid_request_dto_payload)
+    model_dto = ModelDto(**valid_model_dto_payload)
+    task = await start(validation_result_service)
+
+    # The writer doesn't get to run meanwhile, so the queue fills up.
+    for _ in range(5):
+        await validation_result_service.record(
+            request_dto, model_dto, ValidationResult()
+        )
+
+    assert validation_result_service.queue_length() == 2
+    await stop(validation_result_service, task)
+
+    written = validation_result_service.written  # type: ignore
+    assert sum(len(records) for records in written) == 2
+    assert validation_result_service.queue_length() == 0